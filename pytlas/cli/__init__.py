@@ -4,17 +4,39 @@
 # pylint: disable=missing-function-docstring,unused-argument,unnecessary-pass
 
 import os
+import json
+import time
 import logging
 import click
 from pytlas import Agent, __version__
+from pytlas.cli.bench import iter_utterances, load_utterances, run_bench, format_report
+from pytlas.cli.evaluate import run_evaluation, format_evaluation
 from pytlas.cli.prompt import Prompt
+from pytlas.cli.train import run_training, format_training
+from pytlas.handling import HandlersStore
 from pytlas.cli.utils import install_logs
 from pytlas.handling.importers import import_skills
 from pytlas.settings import CONFIG, write_to_store
 from pytlas.supporting import SkillsManager
+from pytlas.understanding import Interpreter
+from pytlas.understanding.parsecache import CachedInterpreter
+from pytlas.understanding.pattern import PatternInterpreter
+from pytlas.understanding.pool import create_snips_interpreter
+from pytlas.understanding.sharded import ShardedInterpreter
+from pytlas.understanding.cache import EngineCache, DEFAULT_MAX_ENTRIES, format_size, \
+    parse_size
+from pytlas.understanding.training import generate_examples
 
 SKILLS_DIR = 'skills_dir'
 CACHE_DIR = 'cache_dir'
+CACHE_MAX_ENTRIES = 'cache_max_entries'
+CACHE_MAX_SIZE = 'cache_max_size'
+INTERPRETER = 'interpreter'
+FAST_PATH = 'fast_path'
+CONTEXT_ENGINES = 'context_engines'
+COMPACT_ENGINES = 'compact_engines'
+PARSE_CACHE_SIZE = 'parse_cache_size'
+PARSE_CACHE_TTL = 'parse_cache_ttl'
 REPO_URL = 'repo_url'
 GRAPH_FILE = 'graph_file'
 WATCH = 'watch'
@@ -28,22 +50,55 @@ def instantiate_and_fit_interpreter(training_file=None):  # pragma: no cover
         import_skills(CONFIG.getpath(SKILLS_DIR), CONFIG.getbool(WATCH))
 
     try:
-        from pytlas.understanding.snips import SnipsInterpreter # pylint: disable=import-outside-toplevel
+        if CONFIG.get(INTERPRETER) == 'pattern':
+            interpreter = PatternInterpreter(CONFIG.get(LANGUAGE), CONFIG.getpath(CACHE_DIR))
+        elif CONFIG.get(INTERPRETER) == 'sharded':
+            interpreter = ShardedInterpreter(CONFIG.get(LANGUAGE), CONFIG.getpath(CACHE_DIR),
+                                             workers=os.cpu_count())
+        else:
+            from pytlas.understanding.snips import SnipsInterpreter # pylint: disable=import-outside-toplevel
 
-        interpreter = SnipsInterpreter(
-            CONFIG.get(LANGUAGE), CONFIG.getpath(CACHE_DIR))
+            interpreter = SnipsInterpreter(
+                CONFIG.get(LANGUAGE), CONFIG.getpath(CACHE_DIR),
+                cache_max_entries=get_cache_max_entries(), cache_max_size=get_cache_max_size(),
+                fast_path=CONFIG.getbool(FAST_PATH),
+                context_engines=CONFIG.getbool(CONTEXT_ENGINES),
+                compact=CONFIG.getbool(COMPACT_ENGINES))
 
         if training_file:
             interpreter.fit_from_file(training_file)
         else:
             interpreter.fit_from_skill_data()
 
+        if CONFIG.getint(PARSE_CACHE_SIZE):
+            interpreter = CachedInterpreter(interpreter, CONFIG.getint(PARSE_CACHE_SIZE),
+                                            CONFIG.getfloat(PARSE_CACHE_TTL))
+
         return interpreter
     except ImportError:
         logging.critical(
             'Could not import the "snips" interpreter, is "snips-nlu" installed?')
 
 
+def get_cache_max_entries():  # pragma: no cover
+    return CONFIG.getint(CACHE_MAX_ENTRIES, DEFAULT_MAX_ENTRIES)
+
+
+def get_cache_max_size():  # pragma: no cover
+    max_size = CONFIG.get(CACHE_MAX_SIZE)
+
+    return parse_size(max_size) if max_size else None
+
+
+def instantiate_engine_cache():  # pragma: no cover
+    cache_dir = CONFIG.getpath(CACHE_DIR)
+
+    if not cache_dir:
+        raise click.UsageError(f'No cache directory configured, use {make_argname(CACHE_DIR)}')
+
+    return EngineCache(cache_dir, get_cache_max_entries(), get_cache_max_size())
+
+
 def instantiate_agent_prompt(sentence=None):  # pragma: no cover
     interpreter = instantiate_and_fit_interpreter()
 
@@ -81,6 +136,18 @@ def make_argname(name):
     help='Specifies the directory containing pytlas skills')
 @click.option(make_argname(CACHE_DIR), type=click.Path(), \
     help='Path to the directory where engine cache will be outputted')
+@click.option('-i', make_argname(INTERPRETER), type=click.Choice(['snips', 'pattern', 'sharded']), \
+    help='Interpreter to use (default to snips, sharded fits a snips engine per skill)')
+@click.option(make_argname(FAST_PATH), is_flag=True, \
+    help='Answers training utterances from an index before running the snips engine')
+@click.option(make_argname(CONTEXT_ENGINES), is_flag=True, \
+    help='Fits a dedicated snips engine for each context')
+@click.option(make_argname(COMPACT_ENGINES), is_flag=True, \
+    help='Persists snips engines in the cache as a single archive')
+@click.option(make_argname(PARSE_CACHE_SIZE), type=int, \
+    help='Number of parse results to keep in memory (default to 0, disabled)')
+@click.option(make_argname(PARSE_CACHE_TTL), type=float, \
+    help='Seconds to keep parse results with time relative slots (default to 0, never)')
 @click.option('-g', make_argname(GRAPH_FILE), type=click.Path(), \
     help='Output the transitions graph to the given path')
 @click.option(make_argname(REPO_URL), \
@@ -112,19 +179,166 @@ def repl(**kwargs):  # pragma: no cover
 
 
 @main.command('parse')
-@click.argument('sentence', required=True)
-def parse(sentence):  # pragma: no cover
+@click.argument('sentence', required=False)
+@click.option('-b', '--batch', 'batch_file', type=click.Path(exists=True), \
+    help='Parse every utterances of a corpus file (text or JSONL) and output JSONL results')
+@click.option('-w', '--workers', default=1, show_default=True, \
+    help='Number of processes used to parse a batch')
+def parse(sentence, batch_file, workers):  # pragma: no cover
     """Parse the given message immediately and exits when the skill is done.
     """
-    instantiate_agent_prompt(sentence)
+    if not batch_file:
+        if not sentence:
+            raise click.UsageError('Give a sentence to parse or a corpus with --batch')
+
+        instantiate_agent_prompt(sentence)
+        return
+
+    interpreter = instantiate_and_fit_interpreter()
+
+    if not interpreter:
+        return
+
+    for (text, intents) in interpreter.parse_batch(iter_utterances(batch_file), workers=workers):
+        click.echo(json.dumps({'text': text, 'intents': [i.to_dict() for i in intents]}))
 
 
 @main.command('train')
 @click.argument('training_file', type=click.Path(), nargs=1, required=False)
-def train(training_file):  # pragma: no cover
+@click.option('--languages', \
+    help='Comma separated languages to fit, each one in its own process and cache sub directory')
+@click.option('-j', '--jobs', type=int, \
+    help='Number of processes used to fit languages (default to one per language up to CPU cores)')
+@click.option('--json', 'as_json', is_flag=True, help='Output the report as JSON')
+def train(training_file, languages, jobs, as_json):  # pragma: no cover
     """Dry run, will not load the interactive prompt but only the fit part.
+
+    When given languages, fit them in parallel and report the fit time and peak memory
+    of each language.
+    """
+    if not languages:
+        instantiate_and_fit_interpreter(training_file)
+        return
+
+    import_skills(CONFIG.getpath(SKILLS_DIR))
+
+    datasets = {lang: Interpreter('snips', lang).get_skill_data()
+                for lang in languages.split(',') if lang}
+
+    results = run_training(datasets, CONFIG.getpath(CACHE_DIR), jobs,
+                           PatternInterpreter if CONFIG.get(INTERPRETER) == 'pattern' \
+                               else create_snips_interpreter)
+
+    click.echo(json.dumps(results, indent=2) if as_json else format_training(results))
+
+
+@main.command('bench')
+@click.argument('corpus', type=click.Path(exists=True), required=False)
+@click.option('-a', '--agents', default=1, show_default=True, help='Number of concurrent agents')
+@click.option('-r', '--repeat', default=1, show_default=True, \
+    help='Number of times the corpus should be replayed')
+@click.option('--skip-handlers', is_flag=True, \
+    help='Do not call skill handlers to only measure the understanding part')
+@click.option('--json', 'as_json', is_flag=True, help='Output the report as JSON')
+def bench(corpus, agents, repeat, skip_handlers, as_json):  # pragma: no cover
+    """Replay a corpus of utterances (text file with one utterance per line or JSONL file)
+    against concurrent agents and report latencies and throughput. If no corpus is
+    given, utterances will be generated from the skills training data.
+    """
+    interpreter = instantiate_and_fit_interpreter()
+
+    if not interpreter:
+        return
+
+    utterances = load_utterances(corpus) if corpus else \
+        [text for (text, _) in generate_examples(interpreter.get_skill_data())]
+
+    if not utterances:
+        click.echo('No utterances to replay')
+        return
+
+    report = run_bench(interpreter, utterances * repeat, agents,
+                       HandlersStore() if skip_handlers else None)
+
+    click.echo(json.dumps(report, indent=2) if as_json else format_report(report))
+
+
+@main.command('evaluate')
+@click.option('-k', '--folds', default=5, show_default=True, help='Number of folds')
+@click.option('-w', '--workers', type=int, \
+    help='Number of processes used to fit folds (default to one per fold up to CPU cores)')
+@click.option('--json', 'as_json', is_flag=True, help='Output the report as JSON')
+def evaluate(folds, workers, as_json):  # pragma: no cover
+    """Evaluate how the interpreter performs on the skills training data with a
+    k-fold cross validation and report intent accuracy, slots precision, recall and
+    f1 score, confusions between intents, parse latencies and fit time.
+    """
+    import_skills(CONFIG.getpath(SKILLS_DIR))
+
+    data = Interpreter('snips', CONFIG.get(LANGUAGE)).get_skill_data()
+
+    if not data.get('intents'):
+        click.echo('No training data to evaluate')
+        return
+
+    report = run_evaluation(data, CONFIG.get(LANGUAGE), folds, workers,
+                            PatternInterpreter if CONFIG.get(INTERPRETER) == 'pattern' \
+                                else create_snips_interpreter)
+
+    click.echo(json.dumps(report, indent=2) if as_json else format_evaluation(report))
+
+
+@main.group()
+def cache():  # pragma: no cover
+    """Manage trained engines kept in the cache directory.
+
+    One engine is kept per training dataset so switching between skill sets loads
+    a previously trained engine instead of fitting a new one.
+    """
+    pass
+
+
+@cache.command('list')
+def list_cache():  # pragma: no cover
+    """List cached engines, most recently used first.
+    """
+    entries = instantiate_engine_cache().entries()
+
+    for entry in entries:
+        last_used = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry.last_used))
+        click.echo(f'{entry.checksum[:12]}  {format_size(entry.size):>10}  {last_used}')
+
+    click.echo(f'{len(entries)} engine(s), {format_size(sum(e.size for e in entries))}')
+
+
+@cache.command('prune')
+@click.option('--max-entries', type=int, help='Maximum number of engines to keep')
+@click.option('--max-size', help='Maximum total size of engines to keep (ie. 500M, 2G)')
+@click.option('--all', 'prune_all', is_flag=True, help='Remove every cached engines')
+def prune_cache(max_entries, max_size, prune_all):  # pragma: no cover
+    """Evict least recently used engines until the cache respects its limits.
     """
-    instantiate_and_fit_interpreter(training_file)
+    engine_cache = instantiate_engine_cache()
+
+    if prune_all:
+        evicted = engine_cache.clear()
+    else:
+        evicted = engine_cache.prune(max_entries, parse_size(max_size) if max_size else None)
+
+    click.echo(f'Removed {len(evicted)} engine(s), '\
+        f'freed {format_size(sum(e.size for e in evicted))}')
+
+
+@cache.command('warm')
+@click.argument('training_file', type=click.Path(), nargs=1, required=False)
+def warm_cache(training_file):  # pragma: no cover
+    """Fit the engine for the current skills (or the given training file) so it's
+    readily available in the cache.
+    """
+    instantiate_engine_cache()
+
+    if instantiate_and_fit_interpreter(training_file):
+        click.echo('Engine is in the cache')
 
 
 @main.group()
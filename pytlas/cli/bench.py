@@ -0,0 +1,196 @@
+# pylint: disable=missing-module-docstring
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Tuple
+from pytlas.conversing import Agent
+from pytlas.conversing.agent import STATE_FALLBACK
+from pytlas.conversing.tracing import Tracer, Span, StatsTracer, STAGE_TRANSITION, summarize
+from pytlas.handling import HandlersStore
+from pytlas.understanding import Interpreter
+
+try:
+    import resource
+except ImportError: # pragma: no cover
+    resource = None # pylint: disable=invalid-name
+
+
+def iter_utterances(path: str) -> Iterator[str]:
+    """Read utterances from a corpus file one at a time.
+
+    JSONL files (with a `.jsonl` extension) should contain either a string or an object
+    with a `text` key on each line. Other files are read as plain text with one
+    utterance per line, empty lines and lines starting with `#` being ignored.
+
+    Args:
+      path (str): Path to the corpus file
+
+    Returns:
+      iterator of str: Utterances
+
+    """
+    is_jsonl = path.endswith('.jsonl')
+
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+
+            if is_jsonl:
+                if line:
+                    utterance = json.loads(line)
+                    yield utterance['text'] if isinstance(utterance, dict) else utterance
+            elif line and not line.startswith('#'):
+                yield line
+
+
+def load_utterances(path: str) -> List[str]:
+    """Load utterances from a corpus file, see `iter_utterances` for supported formats.
+
+    Args:
+      path (str): Path to the corpus file
+
+    Returns:
+      list of str: Utterances
+
+    """
+    return list(iter_utterances(path))
+
+
+def get_peak_rss() -> int:
+    """Retrieve the peak resident set size of the current process.
+
+    Returns:
+      int: Peak resident set size in kilobytes or None if it could not be determined
+
+    """
+    if not resource: # pragma: no cover
+        return None
+
+    # On Linux, ru_maxrss is already expressed in kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class TurnTracer(Tracer):
+    """Forwards spans to another tracer and keeps the first intent processed in a turn.
+    """
+
+    def __init__(self, tracer: Tracer) -> None:
+        self._tracer = tracer
+        self.intent: str = None
+
+    def record(self, span: Span) -> None:
+        self._tracer.record(span)
+
+        if self.intent is None and span.name == STAGE_TRANSITION:
+            self.intent = span.intent
+
+
+def run_bench(interpreter: Interpreter,
+              utterances: List[str],
+              agents_count: int = 1,
+              handlers_store: HandlersStore = None) -> dict:
+    """Replay utterances against concurrent agents and measure how they perform.
+
+    Utterances are distributed in a round robin fashion between agents, each agent
+    running in its own thread and parsing its utterances one after the other.
+
+    Args:
+      interpreter (Interpreter): Interpreter used by agents
+      utterances (list of str): Utterances to parse
+      agents_count (int): Number of concurrent agents
+      handlers_store (HandlersStore): Optional handlers store given to agents, use an
+        empty one to measure only the understanding part
+
+    Returns:
+      dict: Report with the `throughput` in turns per second, `latency` and per
+      `intents` latencies percentiles (in seconds), the `fallback_rate`, the
+      `peak_rss_kb`, percentiles of each turn `stages` and the `fast_path_hit_rate`
+      when the interpreter has a fast path
+
+    """
+    stats = StatsTracer(max_samples=max(len(utterances), 1))
+    agents = [Agent(interpreter, handlers_store=handlers_store, tracer=TurnTracer(stats))
+              for _ in range(agents_count)]
+    turns: List[List[Tuple[str, float]]] = [[] for _ in agents]
+
+    def replay(index: int) -> None:
+        agent = agents[index]
+
+        for text in utterances[index::agents_count]:
+            agent.tracer.intent = None
+            start = time.perf_counter()
+            agent.parse(text)
+            turns[index].append((agent.tracer.intent, time.perf_counter() - start))
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=agents_count) as executor:
+        list(executor.map(replay, range(agents_count)))
+
+    duration = time.perf_counter() - start
+    all_turns = [t for agent_turns in turns for t in agent_turns]
+    intents = {}
+
+    for (intent, turn_duration) in all_turns:
+        if intent:
+            intents.setdefault(intent, []).append(turn_duration)
+
+    report = {
+        'agents': agents_count,
+        'turns': len(all_turns),
+        'duration': duration,
+        'throughput': len(all_turns) / duration if duration else 0,
+        'latency': summarize([d for (_, d) in all_turns]),
+        'intents': {k: summarize(v) for (k, v) in intents.items()},
+        'fallback_rate': len(intents.get(STATE_FALLBACK, [])) / len(all_turns) \
+            if all_turns else 0,
+        'peak_rss_kb': get_peak_rss(),
+        'stages': stats.report(),
+    }
+
+    if getattr(interpreter, 'fast_path', None) is not None:
+        report['fast_path_hit_rate'] = interpreter.fast_path_hit_rate
+
+    return report
+
+
+def _format_latencies(name: str, stats: dict) -> str:
+    return '  %-30s %8d %10.2f %10.2f %10.2f' % (
+        name, stats['count'], stats['p50'] * 1000, stats['p95'] * 1000, stats['p99'] * 1000)
+
+
+def format_report(report: dict) -> str:
+    """Format a report returned by `run_bench` to be displayed, durations are shown
+    in milliseconds.
+
+    Args:
+      report (dict): Report to format
+
+    Returns:
+      str: Human readable report
+
+    """
+    header = '  %-30s %8s %10s %10s %10s' % ('', 'count', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)')
+    lines = [
+        'Replayed %d turns with %d agent(s) in %.2fs' % (
+            report['turns'], report['agents'], report['duration']),
+        'Throughput: %.1f turns/s' % report['throughput'],
+        'Fallback rate: %.1f%%' % (report['fallback_rate'] * 100),
+        'Peak RSS: %s kB' % report['peak_rss_kb'],
+    ]
+
+    if 'fast_path_hit_rate' in report:
+        lines.append('Fast path hit rate: %.1f%%' % (report['fast_path_hit_rate'] * 100))
+
+    lines.extend(['', 'Turns', header])
+
+    if report['turns']:
+        lines.append(_format_latencies('all', report['latency']))
+
+    lines.extend(['', 'Intents', header])
+    lines.extend(_format_latencies(k, v) for (k, v) in sorted(report['intents'].items()))
+    lines.extend(['', 'Stages', header])
+    lines.extend(_format_latencies(k, v) for (k, v) in sorted(report['stages'].items()))
+
+    return '\n'.join(lines)
@@ -0,0 +1,241 @@
+# pylint: disable=missing-module-docstring
+
+import os
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Tuple
+from pytlas.conversing.tracing import summarize
+from pytlas.understanding.pool import InterpreterFactory, create_snips_interpreter
+from pytlas.understanding.training import generate_annotated_examples
+
+NO_INTENT = '<none>'
+
+Prediction = namedtuple('Prediction', ['text', 'expected', 'predicted', 'expected_slots',
+                                       'predicted_slots', 'duration'])
+
+
+def split_folds(data: dict, folds: int) -> List[Tuple[dict, list]]:
+    """Split a chatl dataset in folds used for a cross validation.
+
+    Training sentences of each intent are distributed between folds in a round robin
+    fashion so every fold contains sentences of every intent (if it has enough of them).
+
+    Args:
+      data (dict): Chatl dataset
+      folds (int): Number of folds
+
+    Returns:
+      list of (dict, list): For each fold, the chatl dataset to train on and annotated
+      examples (see `generate_annotated_examples`) to evaluate
+
+    """
+    if folds < 2:
+        raise ValueError('At least 2 folds are needed, got %d' % folds)
+
+    splits = []
+
+    for fold in range(folds):
+        train = dict(data, intents={})
+        test = dict(data, intents={})
+
+        for (name, intent) in data.get('intents', {}).items():
+            # Sentences parsed by pychatl are list subclasses which could not be pickled
+            sentences = [list(s) for s in intent.get('data', [])]
+            train_sentences = [s for (i, s) in enumerate(sentences) if i % folds != fold]
+            test_sentences = [s for (i, s) in enumerate(sentences) if i % folds == fold]
+
+            if train_sentences:
+                train['intents'][name] = dict(intent, data=train_sentences)
+
+            if test_sentences:
+                test['intents'][name] = dict(intent, data=test_sentences)
+
+        splits.append((train, generate_annotated_examples(test)))
+
+    return splits
+
+
+def evaluate_fold(factory: InterpreterFactory,
+                  lang: str,
+                  train_data: dict,
+                  examples: list) -> Tuple[float, List[Prediction]]:
+    """Fit a new interpreter and parse each example with it.
+
+    Args:
+      factory (callable): Function used to create the interpreter
+      lang (str): Language of the interpreter
+      train_data (dict): Chatl dataset to fit the interpreter with
+      examples (list): Annotated examples to parse
+
+    Returns:
+      (float, list of Prediction): Time taken to fit the interpreter in seconds and
+      predictions for each example
+
+    """
+    interpreter = factory(lang, None)
+
+    start = time.perf_counter()
+    interpreter.fit(interpreter.convert_training_data(train_data))
+    fit_time = time.perf_counter() - start
+
+    predictions = []
+
+    for (text, expected, expected_slots) in examples:
+        start = time.perf_counter()
+        intents = interpreter.parse(text)
+        duration = time.perf_counter() - start
+
+        intent = intents[0] if intents else None
+        predicted_slots = [(name, str(v.meta.get('rawValue', v.value)))
+                           for (name, values) in intent.slots.items()
+                           for v in values] if intent else []
+
+        predictions.append(Prediction(text, expected, intent.name if intent else NO_INTENT,
+                                      expected_slots, predicted_slots, duration))
+
+    return (fit_time, predictions)
+
+
+def _scores(true_positives: int, false_positives: int, false_negatives: int) -> Dict[str, float]:
+    predicted = true_positives + false_positives
+    expected = true_positives + false_negatives
+    precision = true_positives / predicted if predicted else 0.0
+    recall = true_positives / expected if expected else 0.0
+
+    return {
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'support': expected,
+    }
+
+
+def compute_report(fit_times: List[float], predictions: List[Prediction]) -> dict:
+    """Compute evaluation metrics from predictions.
+
+    Slot values are compared on their raw text, whatever the predicted intent is.
+
+    Args:
+      fit_times (list of float): Fit time of each fold in seconds
+      predictions (list of Prediction): Predictions of every folds
+
+    Returns:
+      dict: Report with the `intent_accuracy`, the `confusion` matrix (expected intent
+      as first key and predicted one as the second key), `slots` precision, recall and
+      f1 score, percentiles of parse `latency` per expected intent and the `fit_time`
+
+    """
+    confusion = {}
+    slots = {}
+    durations = {}
+
+    for prediction in predictions:
+        row = confusion.setdefault(prediction.expected, {})
+        row[prediction.predicted] = row.get(prediction.predicted, 0) + 1
+        durations.setdefault(prediction.expected, []).append(prediction.duration)
+
+        expected = Counter(prediction.expected_slots)
+        predicted = Counter(prediction.predicted_slots)
+
+        for (slot, value) in set(expected) | set(predicted):
+            counts = slots.setdefault(slot, [0, 0, 0])
+            matched = min(expected[(slot, value)], predicted[(slot, value)])
+            counts[0] += matched
+            counts[1] += predicted[(slot, value)] - matched
+            counts[2] += expected[(slot, value)] - matched
+
+    correct = sum(1 for p in predictions if p.expected == p.predicted)
+
+    return {
+        'folds': len(fit_times),
+        'utterances': len(predictions),
+        'intent_accuracy': correct / len(predictions) if predictions else 0.0,
+        'confusion': confusion,
+        'slots': {k: _scores(*v) for (k, v) in slots.items()},
+        'latency': {k: summarize(v) for (k, v) in durations.items()},
+        'fit_time': {
+            'mean': sum(fit_times) / len(fit_times) if fit_times else 0.0,
+            'max': max(fit_times, default=0.0),
+        },
+    }
+
+
+def run_evaluation(data: dict,
+                   lang: str,
+                   folds: int = 5,
+                   workers: int = None,
+                   factory: InterpreterFactory = create_snips_interpreter) -> dict:
+    """Run a k-fold cross validation of an interpreter on a chatl dataset, each fold
+    being fitted and evaluated in its own process.
+
+    Args:
+      data (dict): Chatl dataset, such as the one returned by `Interpreter.get_skill_data`
+      lang (str): Language of the dataset
+      folds (int): Number of folds
+      workers (int): Number of processes, default to one per fold up to the number of
+        CPU cores, 1 to evaluate folds in the current process
+      factory (callable): Function called with the language and a cache directory
+        (always None) to create interpreters, default to a `SnipsInterpreter`
+
+    Returns:
+      dict: Report as returned by `compute_report`
+
+    """
+    (trains, examples) = zip(*split_folds(data, folds))
+    workers = workers or min(folds, os.cpu_count() or 1)
+
+    if workers == 1:
+        results = list(map(evaluate_fold, repeat(factory), repeat(lang), trains, examples))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(evaluate_fold, repeat(factory), repeat(lang),
+                                        trains, examples))
+
+    return compute_report([r[0] for r in results], [p for r in results for p in r[1]])
+
+
+def format_evaluation(report: dict) -> str:
+    """Format a report returned by `run_evaluation` to be displayed, durations are
+    shown in milliseconds.
+
+    Args:
+      report (dict): Report to format
+
+    Returns:
+      str: Human readable report
+
+    """
+    lines = [
+        'Evaluated %d utterances with %d folds' % (report['utterances'], report['folds']),
+        'Intent accuracy: %.1f%%' % (report['intent_accuracy'] * 100),
+        'Fit time: %.2fs mean, %.2fs max' % (report['fit_time']['mean'],
+                                             report['fit_time']['max']),
+        '',
+        'Slots',
+        '  %-30s %8s %10s %10s %10s' % ('', 'support', 'precision', 'recall', 'f1'),
+    ]
+    lines.extend('  %-30s %8d %10.2f %10.2f %10.2f' % (
+        k, v['support'], v['precision'], v['recall'], v['f1'])
+                 for (k, v) in sorted(report['slots'].items()))
+
+    lines.extend(['', 'Latency per intent',
+                  '  %-30s %8s %10s %10s %10s' % ('', 'count', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)')])
+    lines.extend('  %-30s %8d %10.2f %10.2f %10.2f' % (
+        k, v['count'], v['p50'] * 1000, v['p95'] * 1000, v['p99'] * 1000)
+                 for (k, v) in sorted(report['latency'].items()))
+
+    errors = sorted(((count, expected, predicted)
+                     for (expected, row) in report['confusion'].items()
+                     for (predicted, count) in row.items() if predicted != expected),
+                    reverse=True)
+
+    lines.extend(['', 'Confusions'])
+    lines.extend('  %-30s -> %-30s %6d' % (expected, predicted, count)
+                 for (count, expected, predicted) in errors)
+
+    if not errors:
+        lines.append('  None')
+
+    return '\n'.join(lines)
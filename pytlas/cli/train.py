@@ -0,0 +1,108 @@
+# pylint: disable=missing-module-docstring
+
+import json
+import multiprocessing
+import os
+import time
+from typing import Dict, List
+from pytlas.cli.bench import get_peak_rss
+from pytlas.understanding.pool import InterpreterFactory, create_snips_interpreter
+
+
+def get_language_directory(cache_directory: str, lang: str) -> str:
+    """Retrieve the cache directory of a language, a sub directory named after it like
+    the one used by the `RouterInterpreter`.
+
+    Args:
+      cache_directory (str): Root cache directory, may be None
+      lang (str): Language
+
+    Returns:
+      str: Cache directory of the language or None if no root directory is given
+
+    """
+    return os.path.join(cache_directory, lang) if cache_directory else None
+
+
+def train_language(factory: InterpreterFactory, lang: str, data: dict,
+                   cache_directory: str) -> dict:
+    """Fit an interpreter for a language, it persists its engine in its cache directory.
+
+    Args:
+      factory (callable): Function used to create the interpreter
+      lang (str): Language of the interpreter
+      data (dict): Chatl dataset to fit the interpreter with
+      cache_directory (str): Cache directory of the interpreter
+
+    Returns:
+      dict: Result with the `language`, number of `intents`, `fit_time` in seconds
+      and `peak_rss_kb` of the process
+
+    """
+    interpreter = factory(lang, cache_directory)
+
+    start = time.perf_counter()
+    interpreter.fit(interpreter.convert_training_data(data))
+    fit_time = time.perf_counter() - start
+
+    return {
+        'language': lang,
+        'intents': len(interpreter.intents),
+        'fit_time': fit_time,
+        'peak_rss_kb': get_peak_rss(),
+    }
+
+
+def run_training(datasets: Dict[str, dict],
+                 cache_directory: str = None,
+                 jobs: int = None,
+                 factory: InterpreterFactory = create_snips_interpreter) -> List[dict]:
+    """Fit an interpreter for each language, each one in its own process, and persist
+    them in a sub directory of the cache directory named after their language.
+
+    Args:
+      datasets (dict): Chatl dataset of each language
+      cache_directory (str): Root cache directory
+      jobs (int): Number of processes, default to one per language up to the number of
+        CPU cores, 1 to fit languages in the current process
+      factory (callable): Function called with the language and its cache directory to
+        create interpreters, default to a `SnipsInterpreter`
+
+    Returns:
+      list of dict: Result of each language as returned by `train_language`
+
+    """
+    # Round trip to plain python objects since pychatl ones could not be pickled
+    args = [(factory, lang, json.loads(json.dumps(data)),
+             get_language_directory(cache_directory, lang))
+            for (lang, data) in datasets.items()]
+    jobs = jobs or min(len(args), os.cpu_count() or 1)
+
+    if jobs <= 1 or len(args) < 2:
+        return [train_language(*a) for a in args]
+
+    # A fresh process for each language so its peak memory is not the one of another
+    with multiprocessing.Pool(jobs, maxtasksperchild=1) as pool:
+        return pool.starmap(train_language, args, chunksize=1)
+
+
+def format_training(results: List[dict]) -> str:
+    """Format results returned by `run_training` to be displayed.
+
+    Args:
+      results (list of dict): Results to format
+
+    Returns:
+      str: Human readable results
+
+    """
+    lines = ['  %-10s %8s %12s %14s' % ('', 'intents', 'fit time (s)', 'peak RSS (kB)')]
+    lines.extend('  %-10s %8d %12.2f %14s' % (
+        r['language'], r['intents'], r['fit_time'], r['peak_rss_kb'])
+                 for r in results)
+
+    if results:
+        lines.append('Trained %d languages in %.2fs (slowest)' % (
+            len(results), max(r['fit_time'] for r in results)))
+
+    return '\n'.join(lines)
@@ -6,4 +6,7 @@ to an intent by triggering registered skills.
 """
 
 from pytlas.conversing.agent import Agent
+from pytlas.conversing.async_agent import AsyncAgent
 from pytlas.conversing.request import Request
+from pytlas.conversing.session import SessionPool, SessionBackend, MemoryBackend, SqliteBackend
+from pytlas.conversing.tracing import Tracer, StatsTracer, Span
@@ -1,78 +1,273 @@
 # pylint: disable=missing-module-docstring,too-many-arguments
 
+import json
 import logging
+import re
+import threading
 import uuid
-from typing import List, Callable, Dict, Union
+from collections import namedtuple
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import List, Callable, Dict, Tuple, Union
 from transitions import Machine, MachineError
 from pytlas.conversing.request import Request
+from pytlas.conversing.tracing import Tracer, SpanTimer, NULL_SPAN, STAGE_PARSE, \
+    STAGE_PARSE_SLOT, STAGE_FIND_MATCH, STAGE_TRANSITION, STAGE_HANDLER, STAGE_STRIP_FORMAT
 from pytlas.handling.card import Card
 from pytlas.handling.localization import GLOBAL_TRANSLATIONS, TranslationsStore
 from pytlas.handling.skill import GLOBAL_HANDLERS, HandlersStore
 from pytlas.handling.hooks import GLOBAL_HOOKS, ON_AGENT_CREATED, ON_AGENT_DESTROYED, HooksStore
-from pytlas.understanding import Intent, Interpreter
-from pytlas.settings import CONFIG, SettingsStore
+from pytlas.understanding import Intent, Interpreter, SlotValue
+from pytlas.understanding.slot import encode_value, decode_value
+from pytlas.understanding.scopes import STATE_PREFIX, STATE_SUFFIX, STATE_ASLEEP, \
+    STATE_CANCEL, STATE_FALLBACK, STATE_ASK, CONTEXT_SEPARATOR, is_builtin, \
+    build_scopes # pylint: disable=unused-import
+from pytlas.settings import CONFIG, DEFAULT_SECTION, SETTING_HANDLER_TIMEOUT, SettingsStore
 from pytlas.pkgutils import get_package_name_from_module
 from pytlas.datautils import keep_one, strip_format, find_match
 
 # Silent the transitions logger
 logging.getLogger('transitions').setLevel(logging.WARNING)
 
-STATE_PREFIX = '__'
-STATE_SUFFIX = '__'
-STATE_ASLEEP = STATE_PREFIX + 'asleep' + STATE_SUFFIX
-STATE_CANCEL = STATE_PREFIX + 'cancel' + STATE_SUFFIX
-STATE_FALLBACK = STATE_PREFIX + 'fallback' + STATE_SUFFIX
-STATE_ASK = STATE_PREFIX + 'ask' + STATE_SUFFIX
-CONTEXT_SEPARATOR = '/'
+# Meta used to give the language of messages to interpreters serving several languages
+META_LANG = 'lang'
 
+# Version of the format used by Agent.snapshot
+SNAPSHOT_VERSION = 1
 
-def is_builtin(state: str) -> bool:
-    """Checks if the given state is a builtin one.
+# Maximum number of compiled state machines kept around to be shared by agents
+SHARED_MACHINES_CACHE_SIZE = 16
+
+IS_IN_CONTEXT_RE = re.compile('^is_in_(.+)_context$')
+
+
+class NullLock:
+    """Lock which does nothing, used by agents which do not need to serialize state
+    changes (contextlib.nullcontext is not available on Python 3.6).
+    """
+
+    def __enter__(self) -> 'NullLock':
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+NULL_LOCK = NullLock()
+
+
+def compile_machine(intents: Tuple[str, ...],
+                    machine_klass: type = Machine,
+                    **kwargs) -> Tuple[Machine, Dict[str, List[str]]]:
+    """Compile the conversation state machine for the given interpreter intents.
+
+    The returned machine is not bound to any model. Every callback and condition is
+    given by name so they will be resolved on the model given when triggering an event,
+    that's why a single machine can be used by many agents at once.
 
     Args:
-      state (str): State to check
+      intents (tuple): Intents as exposed by the interpreter
+      machine_klass (type): Machine class to instantiate
+      kwargs (dict): Additional arguments given to the machine constructor
 
     Returns:
-      bool: True if it's a builtin state, false otherwise
+      tuple: The compiled machine and the available scopes for each context
+
+    """
+    interpreter_intents = intents
+    intents = [i for i in interpreter_intents if not is_builtin(i)]
+    states = [STATE_ASLEEP, STATE_ASK, STATE_FALLBACK, STATE_CANCEL] + intents
+    scopes = build_scopes(intents, STATE_CANCEL in interpreter_intents)
+
+    kwargs.setdefault('model', None)
+
+    machine = machine_klass(
+        states=states,
+        send_event=True,
+        auto_transitions=False,
+        before_state_change='_log_transition',
+        initial=STATE_ASLEEP,
+        **kwargs)
+
+    # Go to the asleep state from anywhere except the ask state
+    machine.add_transition(
+        STATE_ASLEEP,  # trigger
+        [STATE_FALLBACK, STATE_CANCEL] + intents,  # source
+        STATE_ASLEEP,  # destination
+        after='end_conversation')
+
+    # Go to the cancel state from anywhere if a request exists
+    machine.add_transition(
+        STATE_CANCEL,
+        [STATE_ASLEEP, STATE_ASK, STATE_FALLBACK] + intents,
+        STATE_CANCEL,
+        conditions=['_has_current_request_or_context'],
+        after='_on_cancel')
+
+    # Go to the ask state from every intents
+    # For now, you can't ask something from the cancel state...
+    machine.add_transition(
+        STATE_ASK,
+        [STATE_FALLBACK] + intents,
+        STATE_ASK,
+        after='_on_asked')
+
+    # Fallback is treated as a common intent
+    machine.add_transition(
+        STATE_FALLBACK,
+        [STATE_ASLEEP, STATE_ASK],
+        STATE_FALLBACK,
+        after='_on_intent')
+
+    for (ctx, ctx_intents) in scopes.items():
+        # If we need a specific context, the agent will check if we are in the right
+        # one as a condition
+        conditions = ['is_in_%s_context' % ctx] if ctx else None
+
+        for intent in ctx_intents:
+            if intent != STATE_CANCEL:
+                machine.add_transition(
+                    intent,
+                    [STATE_ASLEEP, STATE_ASK],
+                    intent,
+                    after='_on_intent',
+                    conditions=conditions)
+
+    return machine, scopes
+
+
+TableTransition = namedtuple('TableTransition', ['source', 'dest', 'context', 'condition', 'after'])
+TableEvent = namedtuple('TableEvent', ['transition', 'kwargs'])
+
+
+class TableMachine:
+    """Table driven implementation of the conversation state machine.
+
+    Transitions are stored in lookup tables indexed by trigger and source state so
+    moving an agent to another state is only a matter of a few dict lookups instead
+    of going through the whole transitions machinery.
+
+    It behaves exactly like the machine returned by `compile_machine`: callbacks and
+    conditions are resolved by name on the given model.
 
     """
-    return state.startswith(STATE_PREFIX) and state.endswith(STATE_SUFFIX) if state else False
 
+    def __init__(self, intents: Tuple[str, ...]) -> None:
+        """Precompute lookup tables for the given interpreter intents.
+
+        Args:
+          intents (tuple): Intents as exposed by the interpreter
+
+        """
+        intents_states = [i for i in intents if not is_builtin(i)]
+
+        self.states = (STATE_ASLEEP, STATE_ASK, STATE_FALLBACK, STATE_CANCEL) + \
+            tuple(intents_states)
+        self.scopes = build_scopes(intents_states, STATE_CANCEL in intents)
+        self.transitions: Dict[str, Dict[str, TableTransition]] = {}
+
+        self._add(STATE_ASLEEP, [STATE_FALLBACK, STATE_CANCEL] + intents_states,
+                  after='end_conversation')
+        self._add(STATE_CANCEL, [STATE_ASLEEP, STATE_ASK, STATE_FALLBACK] + intents_states,
+                  condition='_has_current_request_or_context', after='_on_cancel')
+        self._add(STATE_ASK, [STATE_FALLBACK] + intents_states, after='_on_asked')
+        self._add(STATE_FALLBACK, [STATE_ASLEEP, STATE_ASK], after='_on_intent')
+
+        for (ctx, ctx_intents) in self.scopes.items():
+            for intent in ctx_intents:
+                if intent != STATE_CANCEL:
+                    self._add(intent, [STATE_ASLEEP, STATE_ASK], context=ctx, after='_on_intent')
+
+    def _add(self, dest: str, sources: List[str], after: str,
+             context: str = None, condition: str = None) -> None:
+        self.transitions[dest] = {
+            source: TableTransition(source, dest, context, condition, after) for source in sources
+        }
+
+    def set_state(self, state: str, model: object) -> None:
+        """Sets the state of the given model.
+
+        Args:
+          state (str): State to set
+          model (object): Model to update
+
+        """
+        if state not in self.states:
+            raise ValueError('State "%s" is not a registered state.' % state)
+
+        model.state = state
+
+    def trigger(self, model: object, trigger: str, **kwargs) -> bool:
+        """Try to trigger the given event for a model.
+
+        Args:
+          model (object): Model for which the event should be triggered
+          trigger (str): Event to trigger, which is also the destination state
+          kwargs (dict): Arguments given to callbacks
+
+        Returns:
+          bool: True if the transition has been executed, False if a condition has failed
+
+        """
+        sources = self.transitions.get(trigger)
+
+        if sources is None:
+            raise AttributeError('Do not know event named "%s"' % trigger)
 
-def build_scopes(intents: List[str], include_cancel_state=True) -> Dict[str, List[str]]:
-    """Build all scopes given an intents list. It will create a dict which contains
-    association between a context and available scopes.
+        transition = sources.get(model.state)
 
-    Scopes are intents which could be triggered from a particular context. They will be given
-    to the interpreter to restrict the list of intents to be parsed. That's why STATE_CANCEL is
-    always added to every scopes if include_cancel_state is set to True.
+        if not transition:
+            raise MachineError('Can\'t trigger event %s from state %s!' % (trigger, model.state))
+
+        if transition.context and model.current_context != transition.context:
+            return False
+
+        if transition.condition and not getattr(model, transition.condition)():
+            return False
+
+        model._log_state_change(trigger, transition, kwargs) # pylint: disable=protected-access
+        model.state = transition.dest
+        getattr(model, transition.after)(TableEvent(transition, kwargs))
+
+        return True
+
+
+def compile_table_machine(intents: Tuple[str, ...]) -> Tuple[TableMachine, Dict[str, List[str]]]:
+    """Compile the table driven conversation state machine for the given interpreter intents.
 
     Args:
-      intents (list): List of intents
-      include_cancel_state (bool): Should builtin state cancel be always added?
+      intents (tuple): Intents as exposed by the interpreter
 
     Returns:
-      dict: Dictionary mapping each context to a list of available scopes
+      tuple: The compiled machine and the available scopes for each context
 
     """
-    scopes = {
-        # represents the root scopes, ie. when not in a specific context
-        None: [STATE_CANCEL] if include_cancel_state else [],
-    }
+    machine = TableMachine(intents)
 
-    for intent in intents:
-        try:
-            last_idx = intent.rindex(CONTEXT_SEPARATOR)
-            root = intent[:last_idx]
+    return machine, machine.scopes
 
-            if root not in scopes:
-                scopes[root] = [STATE_CANCEL] if include_cancel_state else []
 
-            scopes[root].append(intent)
-        except ValueError:
-            scopes[None].append(intent)
+@lru_cache(maxsize=SHARED_MACHINES_CACHE_SIZE)
+def get_shared_machine(intents: Tuple[str, ...],
+                       table_driven=False) -> Tuple[Union[Machine, TableMachine],
+                                                    Dict[str, List[str]]]:
+    """Retrieve a compiled state machine for the given intents, compiling it only once.
 
-    return scopes
+    Since compiled machines does not hold any conversation state, they are shared by
+    every agent using an interpreter exposing the same intents.
+
+    Args:
+      intents (tuple): Intents as exposed by the interpreter
+      table_driven (bool): Retrieve a TableMachine instead of a transitions one
+
+    Returns:
+      tuple: The shared machine and the available scopes for each context
+
+    """
+    if table_driven:
+        return compile_table_machine(intents)
+
+    return compile_machine(intents)
 
 
 class Agent: # pylint: disable=too-many-instance-attributes
@@ -91,6 +286,10 @@ class Agent: # pylint: disable=too-many-instance-attributes
                  transitions_graph_path: str = None,
                  hooks_store: HooksStore = None,
                  translations_store: TranslationsStore = None,
+                 share_machine: bool = True,
+                 fast_dispatch: bool = False,
+                 tracer: Tracer = None,
+                 handlers_executor: Executor = None,
                  **meta) -> None:
         """Initialize an agent.
 
@@ -111,12 +310,30 @@ class Agent: # pylint: disable=too-many-instance-attributes
             transitions graph
           hooks_store (HooksStore): Optional hooks store to use for dispatching lifecycle events
           transations_store (TranslationsStore): Optional translations store to use for translations
+          share_machine (bool): Use the state machine shared by agents with the same
+            interpreter intents instead of compiling a dedicated one
+          fast_dispatch (bool): Use a table driven state machine instead of the transitions
+            one to reduce the overhead of each turn
+          tracer (Tracer): Optional tracer which will receive timed spans for each stage
+            of a turn
+          handlers_executor (Executor): Optional executor, such as a bounded thread pool,
+            used to run skill handlers without blocking the caller
           meta (dict): Every other properties will be made available through the self.meta property
 
         """
         self._logger = logging.getLogger(self.__class__.__name__.lower())
         self._interpreter = interpreter
         self._transitions_graph_path = transitions_graph_path
+        self._share_machine = share_machine
+        self._fast_dispatch = fast_dispatch
+        self._transition_span: SpanTimer = None
+        self._handlers_executor = handlers_executor
+        self._handler_timer: threading.Timer = None
+        # When handlers run in an executor, they may reply while a message is being
+        # parsed so state changes must be serialized, else a no-op lock is enough
+        self._lock = threading.RLock() if handlers_executor else NULL_LOCK
+
+        self.tracer = tracer
 
         self._on_ask: Callable = None
         self._on_answer: Callable = None
@@ -126,10 +343,8 @@ class Agent: # pylint: disable=too-many-instance-attributes
 
         # Extract stores data
         self._handlers = handlers_store or GLOBAL_HANDLERS
-        # Maybe we should evaluate it everytime when creating the request instead
-        # of caching translations here :/
-        self._translations = (
-            translations_store or GLOBAL_TRANSLATIONS).all(self.lang)
+        # Translations are evaluated and cached by the store when a request needs them
+        self._translations = translations_store or GLOBAL_TRANSLATIONS
         self._hooks = hooks_store or GLOBAL_HOOKS
 
         self._intents_queue: List[Intent] = []
@@ -138,6 +353,8 @@ class Agent: # pylint: disable=too-many-instance-attributes
         self._choices: List[str] = None
         self._available_scopes: Dict[str, List[str]] = {}
         self._current_scopes: List[str] = None
+        # Language of the last parsed message when the interpreter routes messages
+        self._lang: str = None
 
         self.id = uuid.uuid4().hex # pylint: disable=invalid-name
         self._model: object = None
@@ -154,8 +371,10 @@ class Agent: # pylint: disable=too-many-instance-attributes
         self.settings._data = self.meta
 
         self.current_context: str = None
+        self.state: str = STATE_ASLEEP
 
-        self._machine = None
+        self._machine: Union[Machine, TableMachine] = None
+        self._interpreter_version: int = None
         self.build()
         self.context(None)
 
@@ -165,8 +384,17 @@ class Agent: # pylint: disable=too-many-instance-attributes
         # Maybe we should use a finalizer instead
         self._hooks.trigger(ON_AGENT_DESTROYED, self)
 
-    def _build_is_in_context_lambda(self, ctx: str) -> Callable:
-        return lambda _: self.current_context == ctx
+    def __getattr__(self, name: str) -> object:
+        # Context conditions are resolved by name on the model, so instead of defining
+        # one attribute per context on each agent, they are computed when needed.
+        match = IS_IN_CONTEXT_RE.match(name)
+
+        if match:
+            ctx = match.group(1)
+            return lambda _: self.current_context == ctx
+
+        raise AttributeError("'%s' object has no attribute '%s'" % (
+            self.__class__.__name__, name))
 
     def _has_current_request_or_context(self, _=None) -> bool:
         return (self._request is not None) or (self.current_context is not None)
@@ -182,101 +410,58 @@ class Agent: # pylint: disable=too-many-instance-attributes
         if self._machine:
             self.end_conversation()
 
-        intents = [i for i in self._interpreter.intents if not is_builtin(i)]
-        states = [STATE_ASLEEP, STATE_ASK,
-                  STATE_FALLBACK, STATE_CANCEL] + intents
+        self._build()
+
+    def _build(self) -> None:
+        # Also called without ending the conversation, when the interpreter engine has
+        # been replaced (see `SnipsInterpreter.fit_in_background`) and the agent parses
+        # its next message while being asleep
+        self._interpreter_version = self._interpreter.version
+        intents = tuple(self._interpreter.intents)
 
-        self._available_scopes = build_scopes(
-            intents, STATE_CANCEL in self._interpreter.intents)
+        if self._share_machine:
+            self._machine, self._available_scopes = get_shared_machine(
+                intents, self._fast_dispatch)
+        elif self._fast_dispatch:
+            self._machine, self._available_scopes = compile_table_machine(intents)
+        else:
+            self._machine, self._available_scopes = compile_machine(intents)
 
-        MachineKlass = Machine
-        kwargs = {}  # Additional arguments to give to the machine
+        self._machine.set_state(STATE_ASLEEP, self)
+        # Scopes of the current context may have changed too
+        self._current_scopes = self._available_scopes.get(
+            self.current_context, self._available_scopes.get(None))
+
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info('Instantiated agent with "%d" states: %s',
+                              len(self._machine.states),
+                              ', '.join('"%s"' % s for s in self._machine.states))
 
         if self._transitions_graph_path:  # pragma: no cover
             try:
                 import pygraphviz # pylint: disable=import-outside-toplevel,unused-import
                 from transitions.extensions import GraphMachine # pylint: disable=import-outside-toplevel
 
-                MachineKlass = GraphMachine
-                kwargs['show_conditions'] = True
+                # The graph machine is only used to output the graph so it acts as its own model
+                graph_machine, _ = compile_machine(
+                    intents, GraphMachine, model='self', show_conditions=True)
+
+                self._logger.info('Writing graph to "%s"', self._transitions_graph_path)
+                graph_machine.get_graph().draw(self._transitions_graph_path, prog='dot')
             except (ImportError, ModuleNotFoundError):
                 self._logger.error(
                     'Could not use a GraphMachine, is "pygraphviz" installed?')
 
-        self._machine = MachineKlass(
-            model=self,
-            states=states,
-            send_event=True,
-            before_state_change=self._log_transition,
-            initial=STATE_ASLEEP,
-            **kwargs)
-
-        self._logger.info('Instantiated agent with "%d" states: %s',
-                          len(states), ', '.join('"%s"' % s for s in states))
-
-        # Go to the asleep state from anywhere except the ask state
-        self._machine.add_transition(
-            STATE_ASLEEP,  # trigger
-            [STATE_FALLBACK, STATE_CANCEL] + intents,  # source
-            STATE_ASLEEP,  # destination
-            after=self.end_conversation)
-
-        # Go to the cancel state from anywhere if a request exists
-        self._machine.add_transition(
-            STATE_CANCEL,
-            [STATE_ASLEEP, STATE_ASK, STATE_FALLBACK] + intents,
-            STATE_CANCEL,
-            conditions=[self._has_current_request_or_context],
-            after=self._on_cancel)
-
-        # Go to the ask state from every intents
-        # For now, you can't ask something from the cancel state...
-        self._machine.add_transition(
-            STATE_ASK,
-            [STATE_FALLBACK] + intents,
-            STATE_ASK,
-            after=self._on_asked)
-
-        # Fallback is treated as a common intent
-        self._machine.add_transition(
-            STATE_FALLBACK,
-            [STATE_ASLEEP, STATE_ASK],
-            STATE_FALLBACK,
-            after=self._on_intent)
-
-        for (ctx, ctx_intents) in self._available_scopes.items():
-            conditions = None
-
-            # If we need a specific context, create an attribute which will check
-            # if we are in the right context as a condition
-            if ctx:
-                attr_name = 'is_in_%s_context' % ctx
-                setattr(self, attr_name, self._build_is_in_context_lambda(ctx))
-                conditions = [attr_name]
-
-            for intent in ctx_intents:
-                if intent != STATE_CANCEL:
-                    self._machine.add_transition(
-                        intent,
-                        [STATE_ASLEEP, STATE_ASK],
-                        intent,
-                        after=self._on_intent,
-                        conditions=conditions)
-
-        if self._transitions_graph_path \
-            and getattr(self._machine, 'get_graph', None):  # pragma: no cover
-            self._logger.info('Writing graph to "%s"', self._transitions_graph_path)
-            self._machine.get_graph().draw(self._transitions_graph_path, prog='dot')
-
     @property
     def lang(self) -> str:
-        """Retrieve the language understood by this agent.
+        """Retrieve the language understood by this agent. When the interpreter serves
+        several languages, it's the one of the last parsed message.
 
         Returns:
           str: Current language
 
         """
-        return self._interpreter.lang
+        return self._lang or self._interpreter.lang
 
     @property
     def model(self) -> object:
@@ -313,14 +498,47 @@ class Agent: # pylint: disable=too-many-instance-attributes
             self._on_context = getattr(self._model, 'on_context', None)
 
     def _log_transition(self, evt) -> None:
-        dest = evt.transition.dest
-        msg = '⚡ "%s": %s -> %s' % (evt.event.name, evt.transition.source, dest)
+        self._log_state_change(evt.event.name, evt.transition, evt.kwargs)
+
+    def _log_state_change(self, trigger: str, transition: object, kwargs: dict) -> None:
+        # Called right before the state changes, so the transition span ends here to
+        # exclude the callbacks ran once the state has changed
+        if self._transition_span:
+            self._transition_span.stop()
+            self._transition_span = None
+
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+
+        dest = transition.dest
+        msg = '⚡ "%s": %s -> %s' % (trigger, transition.source, dest)
 
         if dest == STATE_ASK:
-            msg += ' (slot: {slot}, choices: {choices})'.format(**evt.kwargs)
+            msg += ' (slot: {slot}, choices: {choices})'.format(**kwargs)
 
         self._logger.info(msg)
 
+    def _span(self, name: str, intent: Intent = None, handler: Callable = None) -> SpanTimer:
+        # When no tracer is attached, a shared no-op context manager is returned so
+        # instrumented stages cost almost nothing
+        if not self.tracer:
+            return NULL_SPAN
+
+        request = self._request
+
+        if intent is None and request:
+            intent = request.intent
+
+        if handler is None and intent:
+            handler = self._get_handler(intent)
+
+        return SpanTimer(
+            self.tracer,
+            name,
+            request.id if request and request.intent is intent else None,
+            intent.name if intent else None,
+            get_package_name_from_module(handler.__module__) if handler else None)
+
     def _is_current_request(self, request: Request) -> bool:
         return self._request and self._request.id == request.id
 
@@ -346,7 +564,7 @@ class Agent: # pylint: disable=too-many-instance-attributes
 
         self._intents_queue.append(intent)
 
-        if self.state == STATE_ASLEEP:  # pylint: disable=no-member
+        if self.state == STATE_ASLEEP:
             self._process_next_intent()
 
     def parse(self, msg: str, **meta) -> None:
@@ -365,8 +583,57 @@ class Agent: # pylint: disable=too-many-instance-attributes
         """
         self._logger.info('Parsing sentence "%s"', msg)
 
-        intents = self._interpreter.parse(msg, self._current_scopes) or [
-            Intent(STATE_FALLBACK, text=msg)]
+        interpreter = self._route(msg, meta)
+
+        # Rebuilt before parsing so the message is parsed with scopes of the new intents
+        with self._lock:
+            self._rebuild_if_interpreter_changed()
+
+        with self._span(STAGE_PARSE):
+            intents = interpreter.parse(msg, self._current_scopes)
+
+        with self._lock:
+            cancel_intent = self._queue_parsed_intents(msg, intents, meta)
+
+            # If the user wants to cancel the current action, immediately go to the cancel state
+            if cancel_intent:
+                self.go(STATE_CANCEL, intent=cancel_intent)
+            elif self.state == STATE_ASK:
+                text = self._match_asked_slot_text(msg)
+
+                if text:
+                    with self._span(STAGE_PARSE_SLOT):
+                        values = interpreter.parse_slot(
+                            self._request.intent.name, self._asked_slot, text)
+
+                    self._update_asked_slot(values, meta)
+
+                self.go(self._request.intent.name, intent=self._request.intent)
+            elif self.state == STATE_ASLEEP:
+                self._process_next_intent()
+
+    def _route(self, msg: str, meta: dict) -> Interpreter:
+        # Answers to a question are expected in the language it was asked in, unless
+        # told otherwise
+        lang = meta.get(META_LANG) or self.meta.get(META_LANG) or \
+            (self._lang if self.state == STATE_ASK else None)
+        interpreter = self._interpreter.route(msg, lang)
+
+        if interpreter is not self._interpreter:
+            self._lang = interpreter.lang
+
+        return interpreter
+
+    def _rebuild_if_interpreter_changed(self) -> None:
+        # The interpreter engine has been replaced, it's only safe to rebuild the state
+        # machine when no conversation is in progress
+        if self._interpreter_version != self._interpreter.version and \
+                self.state == STATE_ASLEEP:
+            self._logger.info('Interpreter has changed, rebuilding the state machine')
+            self._build()
+
+    def _queue_parsed_intents(self, msg: str, intents: List[Intent], meta: dict) -> Intent:
+        intents = intents or [Intent(STATE_FALLBACK, text=msg)]
 
         # Add meta to each parsed intents
         for intent in intents:
@@ -375,45 +642,37 @@ class Agent: # pylint: disable=too-many-instance-attributes
         cancel_intent = next(
             (i for i in intents if i.name == STATE_CANCEL), None)
 
-        self._logger.info('"%d" intent(s) found: %s',
-                          len(intents), ', '.join([str(i) for i in intents]))
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info('"%d" intent(s) found: %s',
+                              len(intents), ', '.join([str(i) for i in intents]))
 
         # Either way, extend the intent queue with new intents
-        if self.state != STATE_ASK:  # pylint: disable=no-member
+        if self.state != STATE_ASK:
             intents = [i for i in intents if i.name != STATE_CANCEL]
             self._intents_queue.extend(intents)
 
-        # If the user wants to cancel the current action, immediately go to the cancel state
-        if cancel_intent:
-            self.go(STATE_CANCEL, intent=cancel_intent)
-        else:
-            if self.state == STATE_ASK: # pylint: disable=no-member
-
-                # If choices are limited, try to extract a match
-                if self._choices:
-                    msg = find_match(self._choices, msg)
+        return cancel_intent
 
-                # Here msg will be None if choices could not be matched, so nothing
-                # should be done anymore
-                if msg:
-                    values = self._interpreter.parse_slot(
-                        self._request.intent.name, self._asked_slot, msg)
+    def _match_asked_slot_text(self, msg: str) -> str:
+        # If choices are limited, try to extract a match. Here the returned value will be
+        # None if choices could not be matched, so nothing should be done anymore
+        if self._choices:
+            with self._span(STAGE_FIND_MATCH):
+                return find_match(self._choices, msg)
 
-                    # Update slots and meta
-                    self._request.intent.update_slots(
-                        **{self._asked_slot: values})
-                    self._request.intent.meta.update(meta)
+        return msg
 
-                    self._logger.info('Updated slot "%s" with values %s',
-                                      self._asked_slot, ['"%s"' % v for v in values])
+    def _update_asked_slot(self, values: List[SlotValue], meta: dict) -> None:
+        # Update slots and meta
+        self._request.intent.update_slots(
+            **{self._asked_slot: values})
+        self._request.intent.meta.update(meta)
 
-                self.go(self._request.intent.name, intent=self._request.intent)
-            elif self.state == STATE_ASLEEP:  # pylint: disable=no-member
-                self._process_next_intent()
-
-    def _process_intent(self, intent: Intent) -> None:
-        self._logger.info('Processing intent %s', intent)
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info('Updated slot "%s" with values %s',
+                              self._asked_slot, ['"%s"' % v for v in values])
 
+    def _get_handler(self, intent: Intent) -> Callable:
         handler = self._handlers.get(intent.name)
 
         # If we are in a context and the intent is a builtin one, check if the skill has a specific
@@ -422,20 +681,27 @@ class Agent: # pylint: disable=too-many-instance-attributes
             handler = self._handlers.get(
                 self.current_context + CONTEXT_SEPARATOR + intent.name) or handler
 
+        return handler
+
+    def _create_request(self, intent: Intent, handler: Callable) -> Request:
+        # Module translations will be retrieved by the request if it needs them
+        return Request(self, intent,
+                       package=get_package_name_from_module(handler.__module__) \
+                           if handler else None,
+                       translations_store=self._translations)
+
+    def _process_intent(self, intent: Intent) -> None:
+        self._logger.info('Processing intent %s', intent)
+
+        handler = self._get_handler(intent)
+
         if not handler:
             self._logger.warning(
                 'No handler found for the intent "%s"', intent.name)
             self.done()
         else:
             if (self._request is None or self._request.intent != intent):
-                # Creates the request and load module translations if any
-                translations = self._translations.get(
-                    get_package_name_from_module(handler.__module__), {})
-
-                self._logger.debug(
-                    'Found "%d" translations matching the request', len(translations))
-
-                self._request = Request(self, intent, translations)
+                self._request = self._create_request(intent, handler)
 
                 self._logger.info('💬 New "%s" conversation started with id "%s"',
                                   intent.name, self._request.id)
@@ -446,11 +712,66 @@ class Agent: # pylint: disable=too-many-instance-attributes
                 if self._on_thinking:
                     self._on_thinking()
 
-                handler(self._request)
+                with self._span(STAGE_HANDLER, intent, handler):
+                    self._call_handler(handler, self._request)
             except Exception as err: # pylint: disable=broad-except
                 self._logger.error(err)
                 self.done()  # Go back to the asleep state
 
+    def _call_handler(self, handler: Callable, request: Request) -> None:
+        if not self._handlers_executor:
+            handler(request)
+            return
+
+        self._start_handler_timer(handler, request)
+        self._handlers_executor.submit(self._run_handler, handler, request)
+
+    def _run_handler(self, handler: Callable, request: Request) -> None:
+        try:
+            handler(request)
+        except Exception as err: # pylint: disable=broad-except
+            self._logger.error(err)
+            # Use the request proxy so it will be silented if the request is not the
+            # current one anymore
+            request.agent.done()
+
+    def _get_handler_timeout(self, handler: Callable) -> float:
+        # Skills may define their own timeout in their section and fallback to the
+        # global one
+        return self.settings.getfloat(
+            SETTING_HANDLER_TIMEOUT,
+            self.settings.getfloat(SETTING_HANDLER_TIMEOUT, section=DEFAULT_SECTION),
+            section=get_package_name_from_module(handler.__module__))
+
+    def _start_handler_timer(self, handler: Callable, request: Request) -> None:
+        self._cancel_handler_timer()
+
+        timeout = self._get_handler_timeout(handler)
+
+        if timeout > 0:
+            self._handler_timer = threading.Timer(
+                timeout, self._on_handler_timeout, (request, timeout))
+            self._handler_timer.daemon = True
+            self._handler_timer.start()
+
+    def _cancel_handler_timer(self) -> None:
+        if self._handler_timer:
+            self._handler_timer.cancel()
+            self._handler_timer = None
+
+    def _on_handler_timeout(self, request: Request, timeout: float) -> None:
+        with self._lock:
+            # Nothing to do if the handler has already ended or asked something
+            if not self._is_current_request(request) or self.state in [STATE_ASLEEP, STATE_ASK]:
+                return
+
+            self._logger.warning('Handler of "%s" did not complete within %ss, ending the '\
+                'conversation "%s"', request.intent.name, timeout, request.id)
+
+            # Once ended, the request will not be the current one anymore so late replies
+            # of the handler will be silented by its agent proxy
+            self.done()
+
     def _on_intent(self, event) -> None:
         if not self._is_valid(event.kwargs, ['intent']):
             self.done()
@@ -462,6 +783,8 @@ class Agent: # pylint: disable=too-many-instance-attributes
         self._on_intent(event)
 
     def _on_asked(self, event) -> None:
+        self._cancel_handler_timer()
+
         if not self._is_valid(event.kwargs, ['slot', 'text']):
             self.done()
         else:
@@ -473,8 +796,10 @@ class Agent: # pylint: disable=too-many-instance-attributes
             self._choices = choices
 
             if self._on_ask:
-                self._on_ask(slot, text, choices, raw_text=strip_format(
-                    text), **event.kwargs.get('meta'))
+                with self._span(STAGE_STRIP_FORMAT):
+                    raw_text = strip_format(text)
+
+                self._on_ask(slot, text, choices, raw_text=raw_text, **event.kwargs.get('meta'))
 
     def _process_next_intent(self) -> None:
         if self._intents_queue:
@@ -490,10 +815,23 @@ class Agent: # pylint: disable=too-many-instance-attributes
           kwargs (dict): Arguments
 
         """
-        try:
-            self.trigger(state, **kwargs)  # pylint: disable=no-member
-        except (MachineError, AttributeError) as err:
-            self._logger.error('Could not trigger "%s": %s', state, err)
+        if self.tracer:
+            self._transition_span = self._span(
+                STAGE_TRANSITION, kwargs.get('intent')).start()
+
+        with self._lock:
+            try:
+                if self._fast_dispatch:
+                    self._machine.trigger(self, state, **kwargs)
+                else:
+                    event = self._machine.events.get(state)
+
+                    if not event:
+                        raise AttributeError('Do not know event named "%s"' % state)
+
+                    event.trigger(self, **kwargs)
+            except (MachineError, AttributeError) as err:
+                self._logger.error('Could not trigger "%s": %s', state, err)
 
     def ask(self,
             slot: str,
@@ -528,7 +866,11 @@ class Agent: # pylint: disable=too-many-instance-attributes
 
         if self._on_answer:
             txt = keep_one(text)
-            self._on_answer(txt, cards, raw_text=strip_format(txt), **meta)
+
+            with self._span(STAGE_STRIP_FORMAT):
+                raw_text = strip_format(txt)
+
+            self._on_answer(txt, cards, raw_text=raw_text, **meta)
 
     def done(self, require_input=False) -> None:
         """Done should be called by skills when they are done with their stuff. It enables
@@ -554,19 +896,137 @@ class Agent: # pylint: disable=too-many-instance-attributes
         self._current_scopes = self._available_scopes.get(
             self.current_context, self._available_scopes.get(None))
 
-        self._logger.info('Switched to the context "%s" with now "%d" understandable '\
-            'intents: %s', self.current_context, len(self._current_scopes), \
-                ', '.join('"%s"' % s for s in self._current_scopes))
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info('Switched to the context "%s" with now "%d" understandable '\
+                'intents: %s', self.current_context, len(self._current_scopes), \
+                    ', '.join('"%s"' % s for s in self._current_scopes))
 
         if self._on_context:
             self._on_context(self.current_context)
 
+    def get_conversation_state(self) -> dict:
+        """Retrieve the conversation state of this agent so it can be restored later,
+        possibly on another agent instance, with `set_conversation_state`.
+
+        Returns:
+          dict: Conversation state
+
+        """
+        return {
+            'state': self.state,
+            'context': self.current_context,
+            'intent': self._request.intent if self._request else None,
+            'request_id': self._request.id if self._request else None,
+            'asked_slot': self._asked_slot,
+            'choices': self._choices,
+            'intents_queue': list(self._intents_queue),
+            'meta': dict(self.meta),
+            'lang': self._lang,
+        }
+
+    def set_conversation_state(self, state: dict) -> None:
+        """Restore a conversation state as returned by `get_conversation_state`.
+
+        Nothing will be sent to the model since the conversation is only resumed.
+
+        Args:
+          state (dict): Conversation state to restore
+
+        """
+        self._machine.set_state(state.get('state') or STATE_ASLEEP, self)
+
+        self.current_context = state.get('context')
+        self._current_scopes = self._available_scopes.get(
+            self.current_context, self._available_scopes.get(None))
+
+        # Restored before the request so it gets the conversation language
+        self._lang = state.get('lang')
+
+        intent = state.get('intent')
+        self._request = self._create_request(intent, self._get_handler(intent)) \
+            if intent else None
+
+        if self._request and state.get('request_id'):
+            self._request.id = state['request_id']
+
+        self._asked_slot = state.get('asked_slot')
+        self._choices = state.get('choices')
+        self._intents_queue = list(state.get('intents_queue') or [])
+
+        # Keep the same dict since settings are tied to it
+        self.meta.clear()
+        self.meta.update(state.get('meta') or {})
+
+        self._logger.info('Restored conversation in state "%s"', self.state)
+
+    def snapshot(self) -> bytes:
+        """Serialize the conversation state of this agent in a compact representation.
+
+        It can be given to `restore`, possibly on another agent in another process, to
+        resume the conversation where it was.
+
+        Returns:
+          bytes: Serialized conversation state
+
+        """
+        state = self.get_conversation_state()
+        intent = state['intent']
+        data = {
+            'v': SNAPSHOT_VERSION,
+            'state': state['state'],
+        }
+
+        # Only keep what's needed to make it as small as possible
+        optionals = {
+            'context': state['context'],
+            'intent': intent.to_dict() if intent else None,
+            'request_id': state['request_id'],
+            'asked_slot': state['asked_slot'],
+            'choices': state['choices'],
+            'intents_queue': [i.to_dict() for i in state['intents_queue']],
+            'meta': encode_value(state['meta']),
+            'lang': state['lang'],
+        }
+
+        data.update({k: v for (k, v) in optionals.items() if v})
+
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+    def restore(self, snapshot: bytes) -> None:
+        """Restore a conversation state serialized with `snapshot`.
+
+        Args:
+          snapshot (bytes): Serialized conversation state
+
+        """
+        data = json.loads(snapshot)
+        version = data.get('v')
+
+        if version != SNAPSHOT_VERSION:
+            raise ValueError('Unsupported snapshot version "%s"' % version)
+
+        intent = data.get('intent')
+
+        self.set_conversation_state({
+            'state': data['state'],
+            'context': data.get('context'),
+            'intent': Intent.from_dict(intent) if intent else None,
+            'request_id': data.get('request_id'),
+            'asked_slot': data.get('asked_slot'),
+            'choices': data.get('choices'),
+            'intents_queue': [Intent.from_dict(i) for i in data.get('intents_queue', [])],
+            'meta': decode_value(data.get('meta', {})),
+            'lang': data.get('lang'),
+        })
+
     def end_conversation(self, event=None) -> None:
         """Ends a conversation, means nothing would come from the skill anymore and
         it does not require user inputs. This is especially useful when you are showing
         an activity indicator.
 
         """
+        self._cancel_handler_timer()
+
         if self._request:
             self._logger.info('Conversation "%s" has ended', self._request.id)
 
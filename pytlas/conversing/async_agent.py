@@ -0,0 +1,147 @@
+# pylint: disable=missing-module-docstring
+
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from functools import partial, wraps
+from typing import Awaitable, Callable, List
+from pytlas.conversing.agent import Agent, STATE_ASK, STATE_ASLEEP, STATE_CANCEL
+from pytlas.conversing.request import Request
+from pytlas.conversing.tracing import STAGE_PARSE, STAGE_PARSE_SLOT
+from pytlas.understanding import Interpreter
+
+MODEL_CALLBACKS = ['_on_ask', '_on_answer', '_on_done', '_on_thinking', '_on_context']
+
+
+class AsyncAgent(Agent):
+    """Agent targeted at asyncio applications.
+
+    Its `parse` method is a coroutine and the interpreter inference is offloaded to an
+    executor so the event loop is never blocked by the NLU. Skill handlers and model
+    callbacks can be plain functions or coroutine functions, in which case they will be
+    scheduled on the event loop and awaited before `parse` returns.
+
+    """
+
+    def __init__(self,
+                 interpreter: Interpreter,
+                 model: object = None,
+                 executor: Executor = None,
+                 loop: asyncio.AbstractEventLoop = None,
+                 **kwargs) -> None:
+        """Initialize an async agent.
+
+        Args:
+          interpreter (Interpreter): Interpreter used to convert human language to
+            intents and extract slots
+          model (object): Model which will receive events raised by this agent instance,
+            its callbacks may be coroutine functions
+          executor (Executor): Executor used to run the interpreter, defaults to the event
+            loop default one which has a bounded number of threads
+          loop (AbstractEventLoop): Event loop to use, defaults to the current one
+          kwargs (dict): Every other arguments are given to the Agent constructor
+
+        """
+        self._loop = loop or asyncio.get_event_loop()
+        self._executor = executor
+        self._pending: List[asyncio.Future] = []
+        self._turn_lock: asyncio.Lock = None
+
+        super().__init__(interpreter, model, **kwargs)
+
+    @Agent.model.setter
+    def model(self, model: object) -> None:
+        Agent.model.fset(self, model) # pylint: disable=no-member
+
+        # Coroutine callbacks are wrapped to be scheduled on the event loop since the agent
+        # calls them synchronously
+        for attr in MODEL_CALLBACKS:
+            callback = getattr(self, attr)
+
+            if asyncio.iscoroutinefunction(callback):
+                setattr(self, attr, self._wrap_coroutine_function(callback))
+
+    def _wrap_coroutine_function(self, func: Callable) -> Callable:
+        @wraps(func)
+        def scheduler(*args, **kwargs) -> None:
+            self._schedule(func(*args, **kwargs))
+
+        return scheduler
+
+    def _schedule(self, awaitable: Awaitable) -> None:
+        self._pending.append(asyncio.ensure_future(awaitable, loop=self._loop))
+
+    async def _await_handler(self, awaitable: Awaitable) -> None:
+        try:
+            await awaitable
+        except Exception as err: # pylint: disable=broad-except
+            self._logger.error(err)
+            self.done()  # Go back to the asleep state
+
+    def _call_handler(self, handler: Callable, request: Request) -> None:
+        result = handler(request)
+
+        if inspect.isawaitable(result):
+            self._schedule(self._await_handler(result))
+
+    async def _run_in_executor(self, func: Callable, *args) -> object:
+        return await self._loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def wait_pending(self) -> None:
+        """Wait for every scheduled handlers and model callbacks to complete, including
+        the ones scheduled while waiting.
+        """
+        while self._pending:
+            pending, self._pending = self._pending, []
+            await asyncio.gather(*pending)
+
+    async def parse(self, msg: str, **meta) -> None: # pylint: disable=invalid-overridden-method
+        """Parse a raw message.
+
+        It behaves like `Agent.parse` but the interpreter is ran in the agent executor and
+        it returns when every handlers and model callbacks triggered by this message are
+        done. Turns of a same agent are processed one at a time.
+
+        Args:
+          msg (str): Raw message to parse
+          meta (dict): Optional metadata to add to the request object
+
+        """
+        # Created here so it will be bound to the running loop
+        if not self._turn_lock:
+            self._turn_lock = asyncio.Lock()
+
+        async with self._turn_lock:
+            self._logger.info('Parsing sentence "%s"', msg)
+
+            # Routing may load the interpreter of a language so it's ran in the executor too
+            interpreter = await self._run_in_executor(self._route, msg, meta)
+
+            # Rebuilt before parsing so the message is parsed with scopes of the new intents
+            self._rebuild_if_interpreter_changed()
+
+            with self._span(STAGE_PARSE):
+                intents = await self._run_in_executor(
+                    interpreter.parse, msg, self._current_scopes)
+
+            cancel_intent = self._queue_parsed_intents(msg, intents, meta)
+
+            # If the user wants to cancel the current action, immediately go to the cancel state
+            if cancel_intent:
+                self.go(STATE_CANCEL, intent=cancel_intent)
+            elif self.state == STATE_ASK:
+                text = self._match_asked_slot_text(msg)
+
+                if text:
+                    with self._span(STAGE_PARSE_SLOT):
+                        values = await self._run_in_executor(
+                            interpreter.parse_slot,
+                            self._request.intent.name, self._asked_slot, text)
+
+                    self._update_asked_slot(values, meta)
+
+                self.go(self._request.intent.name, intent=self._request.intent)
+            elif self.state == STATE_ASLEEP:
+                self._process_next_intent()
+
+            await self.wait_pending()
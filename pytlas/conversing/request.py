@@ -3,8 +3,9 @@
 import uuid
 import logging
 from datetime import datetime
-from typing import Dict
+from typing import Mapping
 from babel.dates import format_date, format_datetime, format_time
+from pytlas.handling.localization import TranslationsStore
 from pytlas.understanding.intent import Intent
 
 AGENT_SILENTED_METHODS = ['ask', 'answer', 'done', 'context']
@@ -52,7 +53,9 @@ class Request: # pylint: disable=too-few-public-methods
     def __init__(self,
                  agent: 'Agent',
                  intent: Intent,
-                 module_translations: Dict[str, str] = None) -> None:
+                 module_translations: Mapping[str, str] = None,
+                 package: str = None,
+                 translations_store: TranslationsStore = None) -> None:
         self.intent = intent
         """Intent associated with the request"""
         self.id = uuid.uuid4().hex # pylint: disable=invalid-name
@@ -62,7 +65,11 @@ class Request: # pylint: disable=too-few-public-methods
         self.lang = agent.lang
         """Request language as extracted from the agent"""
 
-        self._module_translations = module_translations or {}
+        # When no translations are given, they will be retrieved from the store only
+        # when needed
+        self._module_translations = module_translations
+        self._package = package
+        self._translations_store = translations_store
 
     def _d(self, date: datetime, date_only=False, time_only=False, **options) -> str:
         """Helper to localize given date using the agent current language.
@@ -91,4 +98,8 @@ class Request: # pylint: disable=too-few-public-methods
           str: Translated text or source text if no translation has been found
 
         """
+        if self._module_translations is None:
+            self._module_translations = self._translations_store.get(self._package, self.lang) \
+                if self._translations_store and self._package else {}
+
         return self._module_translations.get(text, text)
@@ -0,0 +1,287 @@
+# pylint: disable=missing-module-docstring
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+from pytlas.conversing.agent import Agent, STATE_ASLEEP, STATE_ASK
+
+# States in which an agent is not running a skill handler and can be safely evicted
+IDLE_STATES = [STATE_ASLEEP, STATE_ASK]
+
+
+class SessionBackend:
+    """Base class for backends used to store conversation states of evicted agents.
+    """
+
+    def save(self, session_id: str, data: bytes) -> None:
+        """Save the serialized conversation state of a session.
+
+        Args:
+          session_id (str): Id of the session
+          data (bytes): Serialized conversation state
+
+        """
+        raise NotImplementedError()
+
+    def load(self, session_id: str) -> bytes:
+        """Load the serialized conversation state of a session.
+
+        Args:
+          session_id (str): Id of the session
+
+        Returns:
+          bytes: Serialized conversation state or None if not found
+
+        """
+        raise NotImplementedError()
+
+    def delete(self, session_id: str) -> None:
+        """Delete the conversation state of a session if any.
+
+        Args:
+          session_id (str): Id of the session
+
+        """
+        raise NotImplementedError()
+
+
+class MemoryBackend(SessionBackend):
+    """Keeps conversation states in memory.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[str, bytes] = {}
+
+    def save(self, session_id: str, data: bytes) -> None:
+        self._data[session_id] = data
+
+    def load(self, session_id: str) -> bytes:
+        return self._data.get(session_id)
+
+    def delete(self, session_id: str) -> None:
+        self._data.pop(session_id, None)
+
+
+class SqliteBackend(SessionBackend):
+    """Keeps conversation states in a sqlite database, so they will survive a restart.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Instantiates a new sqlite backend.
+
+        Args:
+          path (str): Path to the database file
+
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data BLOB NOT NULL)')
+        self._connection.commit()
+
+    def save(self, session_id: str, data: bytes) -> None:
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO sessions (id, data) VALUES (?, ?)', (session_id, data))
+            self._connection.commit()
+
+    def load(self, session_id: str) -> bytes:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT data FROM sessions WHERE id = ?', (session_id,)).fetchone()
+
+        return row[0] if row else None
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM sessions WHERE id = ?', (session_id,))
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection.
+        """
+        self._connection.close()
+
+
+class SessionPool:
+    """Hosts many conversations while keeping a bounded number of agents in memory.
+
+    When the pool is full, the least recently used idle agent is evicted and its
+    conversation state is saved in the backend. It will be restored transparently
+    the next time its session is retrieved.
+
+    Agents leased with `lease` (or `get_or_create(..., lease=True)` until `release`
+    is called) are never evicted so a caller using one could not end up with an agent
+    no longer in the pool.
+
+    """
+
+    def __init__(self,
+                 factory: Callable[[str], Agent],
+                 backend: SessionBackend = None,
+                 max_agents: int = 1000,
+                 idle_timeout: float = None) -> None:
+        """Instantiates a new pool.
+
+        Args:
+          factory (callable): Function called with a session id to create a new agent
+          backend (SessionBackend): Backend used to store evicted conversations, defaults
+            to an in memory one
+          max_agents (int): Maximum number of agents kept in memory
+          idle_timeout (float): Optional number of seconds after which an agent not used
+            anymore will be evicted by `evict_idle`
+
+        """
+        self._logger = logging.getLogger('sessions')
+        self._factory = factory
+        self._backend = backend or MemoryBackend()
+        self._lock = threading.RLock()
+        self._agents: Dict[str, Agent] = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._leases: Dict[str, int] = {}
+
+        self.max_agents = max_agents
+        self.idle_timeout = idle_timeout
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._agents
+
+    def get_or_create(self, session_id: str, lease: bool = False) -> Agent:
+        """Retrieve the agent of a session, creating or restoring it if needed.
+
+        Args:
+          session_id (str): Id of the session
+          lease (bool): Prevents the agent from being evicted until `release` is called
+
+        Returns:
+          Agent: Agent managing the session conversation
+
+        """
+        with self._lock:
+            if lease:
+                self._leases[session_id] = self._leases.get(session_id, 0) + 1
+
+            agent = self._agents.get(session_id)
+
+            if agent:
+                self._agents.move_to_end(session_id)
+            else:
+                agent = self._factory(session_id)
+                data = self._backend.load(session_id)
+
+                if data:
+                    self._logger.info('Restoring session "%s"', session_id)
+                    agent.restore(data)
+                    self._backend.delete(session_id)
+
+                self._agents[session_id] = agent
+                self._evict_exceeding()
+
+            self._last_used[session_id] = time.monotonic()
+
+            return agent
+
+    def release(self, session_id: str) -> None:
+        """Release an agent leased with `get_or_create`, it could be evicted again once
+        every leases have been released.
+
+        Args:
+          session_id (str): Id of the session
+
+        """
+        with self._lock:
+            count = self._leases.get(session_id, 0) - 1
+
+            if count > 0:
+                self._leases[session_id] = count
+            else:
+                self._leases.pop(session_id, None)
+
+    @contextmanager
+    def lease(self, session_id: str) -> Iterator[Agent]:
+        """Retrieve the agent of a session, like `get_or_create`, and make sure it will
+        not be evicted until the context exits.
+
+        Args:
+          session_id (str): Id of the session
+
+        Returns:
+          context manager: Yields the agent managing the session conversation
+
+        """
+        agent = self.get_or_create(session_id, lease=True)
+
+        try:
+            yield agent
+        finally:
+            self.release(session_id)
+
+    def remove(self, session_id: str) -> None:
+        """Remove a session from the pool and its backend, its conversation will be lost.
+
+        Args:
+          session_id (str): Id of the session
+
+        """
+        with self._lock:
+            self._agents.pop(session_id, None)
+            self._last_used.pop(session_id, None)
+            self._backend.delete(session_id)
+
+    def evict(self, session_id: str) -> bool:
+        """Evict the agent of a session if it is idle and not leased, saving its
+        conversation state in the backend.
+
+        Args:
+          session_id (str): Id of the session
+
+        Returns:
+          bool: True if the agent has been evicted
+
+        """
+        with self._lock:
+            agent = self._agents.get(session_id)
+
+            if not agent or agent.state not in IDLE_STATES or self._leases.get(session_id):
+                return False
+
+            self._backend.save(session_id, agent.snapshot())
+
+            del self._agents[session_id]
+            del self._last_used[session_id]
+
+            self._logger.info('Evicted session "%s"', session_id)
+
+            return True
+
+    def evict_idle(self) -> List[str]:
+        """Evict agents which have not been used since `idle_timeout` seconds.
+
+        Returns:
+          list of str: Evicted session ids
+
+        """
+        if self.idle_timeout is None:
+            return []
+
+        with self._lock:
+            limit = time.monotonic() - self.idle_timeout
+            candidates = [sid for (sid, last_used) in self._last_used.items() if last_used < limit]
+
+            return [sid for sid in candidates if self.evict(sid)]
+
+    def _evict_exceeding(self) -> None:
+        # Least recently used agents are at the beginning and the last one is the one
+        # which has just been retrieved so it should never be evicted
+        for session_id in list(self._agents.keys())[:-1]:
+            if len(self._agents) <= self.max_agents:
+                break
+
+            self.evict(session_id)
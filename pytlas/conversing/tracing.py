@@ -0,0 +1,184 @@
+# pylint: disable=missing-module-docstring
+
+import math
+import threading
+import time
+from collections import deque, namedtuple
+from typing import Dict, List
+
+# Stages of a turn for which spans are emitted by agents
+STAGE_PARSE = 'parse'
+STAGE_PARSE_SLOT = 'parse_slot'
+STAGE_FIND_MATCH = 'find_match'
+STAGE_TRANSITION = 'transition'
+STAGE_HANDLER = 'handler'
+STAGE_STRIP_FORMAT = 'strip_format'
+
+Span = namedtuple('Span', ['name', 'duration', 'request_id', 'intent', 'skill'])
+Span.__doc__ = """Represents a timed stage of a turn, its duration is expressed in seconds."""
+
+
+class Tracer:
+    """Base class for tracers which receive spans emitted by an agent.
+    """
+
+    def record(self, span: Span) -> None:
+        """Record a span.
+
+        Args:
+          span (Span): Span to record
+
+        """
+        raise NotImplementedError()
+
+
+class NullSpan:
+    """Context manager which does nothing, used when no tracer is attached.
+    """
+
+    def __enter__(self) -> 'NullSpan':
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+# Returned instead of a span timer when no tracer is attached
+NULL_SPAN = NullSpan()
+
+
+class SpanTimer:
+    """Measures the duration of a stage and records it in a tracer when stopped.
+
+    It can be used as a context manager.
+
+    """
+
+    __slots__ = ['_tracer', '_name', '_request_id', '_intent', '_skill', '_started_at']
+
+    def __init__(self, tracer: Tracer, name: str, request_id: str = None,
+                 intent: str = None, skill: str = None) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._request_id = request_id
+        self._intent = intent
+        self._skill = skill
+        self._started_at: float = None
+
+    def start(self) -> 'SpanTimer':
+        """Start the timer.
+
+        Returns:
+          SpanTimer: The timer itself
+
+        """
+        self._started_at = time.perf_counter()
+        return self
+
+    def stop(self) -> None:
+        """Stop the timer and record the span.
+        """
+        self._tracer.record(Span(self._name, time.perf_counter() - self._started_at,
+                                 self._request_id, self._intent, self._skill))
+
+    def __enter__(self) -> 'SpanTimer':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Compute a percentile using the nearest rank method.
+
+    Args:
+      sorted_values (list of float): Values sorted in ascending order
+      percent (float): Percentile to compute, between 0 and 100
+
+    Returns:
+      float: Value at the given percentile or None if there is no value
+
+    Examples:
+      >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 50)
+      5
+      >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 95)
+      10
+      >>> percentile([], 50) is None
+      True
+
+    """
+    if not sorted_values:
+        return None
+
+    rank = math.ceil(len(sorted_values) * percent / 100)
+
+    return sorted_values[max(rank, 1) - 1]
+
+
+def summarize(values: List[float]) -> dict:
+    """Compute the number of values and their p50, p95 and p99 percentiles.
+
+    Args:
+      values (list of float): Values to summarize
+
+    Returns:
+      dict: Dictionary with `count`, `p50`, `p95` and `p99` keys
+
+    Examples:
+      >>> summarize([3, 1, 2])
+      {'count': 3, 'p50': 2, 'p95': 3, 'p99': 3}
+
+    """
+    sorted_values = sorted(values)
+
+    return {
+        'count': len(sorted_values),
+        'p50': percentile(sorted_values, 50),
+        'p95': percentile(sorted_values, 95),
+        'p99': percentile(sorted_values, 99),
+    }
+
+
+class StatsTracer(Tracer):
+    """In process tracer which keeps the last durations of each stage to report their
+    percentiles.
+    """
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        """Instantiates a new stats tracer.
+
+        Args:
+          max_samples (int): Maximum number of durations kept per stage
+
+        """
+        self._lock = threading.Lock()
+        self._max_samples = max_samples
+        self._durations: Dict[str, deque] = {}
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            durations = self._durations.get(span.name)
+
+            if durations is None:
+                durations = self._durations[span.name] = deque(maxlen=self._max_samples)
+
+            durations.append(span.duration)
+
+    def reset(self) -> None:
+        """Forget every recorded durations.
+        """
+        with self._lock:
+            self._durations.clear()
+
+    def report(self) -> Dict[str, dict]:
+        """Computes statistics for each recorded stage.
+
+        Returns:
+          dict: Stage names as keys and a dict with the `count` of samples and the `p50`,
+          `p95` and `p99` durations in seconds
+
+        """
+        with self._lock:
+            samples = {k: list(v) for (k, v) in self._durations.items()}
+
+        return {k: summarize(v) for (k, v) in samples.items()}
@@ -6,6 +6,7 @@ import logging
 import sys
 import threading
 from types import ModuleType
+from pytlas.handling.localization import GLOBAL_TRANSLATIONS
 
 
 def _reload(module: ModuleType) -> None:
@@ -37,6 +38,9 @@ def import_or_reload(module_name: str) -> None:
     if module:
         logging.info('Reloading module "%s"', module_name)
 
+        # Cached translations of the package may have changed
+        GLOBAL_TRANSLATIONS.invalidate(module_name)
+
         try:
             _reload(module)
         except Exception as err: # pylint: disable=W0703
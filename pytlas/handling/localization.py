@@ -1,6 +1,8 @@
 # pylint: disable=missing-module-docstring
 
-from typing import Dict, Callable
+import threading
+from types import MappingProxyType
+from typing import Dict, Callable, Mapping, Tuple
 from pytlas.pkgutils import get_caller_package_name
 from pytlas.datautils import should_load_resources
 from pytlas.store import Store
@@ -8,6 +10,10 @@ from pytlas.store import Store
 
 class TranslationsStore(Store):
     """Translations store which holds all translations used by skills.
+
+    Translation functions are evaluated only once per package and language, the
+    resulting dictionaries are cached and shared read-only by every consumer.
+
     """
 
     def __init__(self, data: dict = None) -> None:
@@ -17,9 +23,30 @@ class TranslationsStore(Store):
           data (dict): Optional initial data to use
 
         """
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str], Mapping[str, str]] = {}
         super().__init__('trans', data)
 
-    def all(self, lang: str) -> Dict[str, Dict[str, str]]:
+    def reset(self) -> None:
+        super().reset()
+        self.invalidate()
+
+    def invalidate(self, package: str = None) -> None:
+        """Invalidate cached translations so they will be evaluated again on next access.
+
+        Args:
+          package (str): Optional package to invalidate, if not given, the whole cache
+            will be cleared
+
+        """
+        with self._lock:
+            if package is None:
+                self._cache.clear()
+            else:
+                for key in [k for k in self._cache if k[0] == package]:
+                    del self._cache[key]
+
+    def all(self, lang: str) -> Dict[str, Mapping[str, str]]:
         """Retrieve all translations for all packages in the given language.
 
         Args:
@@ -29,9 +56,9 @@ class TranslationsStore(Store):
           dict: Dictionary of package => translations dict in the given language
 
         """
-        return {k: v.get(lang, lambda: {})() for k, v in self._data.items()}
+        return {k: self.get(k, lang) for k in list(self._data.keys())}
 
-    def get(self, package: str, lang: str) -> Dict[str, str]:
+    def get(self, package: str, lang: str) -> Mapping[str, str]:
         """Retrieve all translations for a particular package.
 
         Args:
@@ -39,10 +66,19 @@ class TranslationsStore(Store):
           lang (str): Language to retrieve
 
         Returns:
-          dict: Translations dictionary
+          dict: Read-only translations dictionary
 
         """
-        return self._data.get(package, {}).get(lang, lambda: {})()
+        key = (package, lang)
+
+        with self._lock:
+            translations = self._cache.get(key)
+
+            if translations is None:
+                translations = self._cache[key] = MappingProxyType(
+                    self._data.get(package, {}).get(lang, lambda: {})())
+
+        return translations
 
     def register(self, lang: str, func: Callable, package: str = None) -> None:
         """Register translations into the store.
@@ -61,6 +97,10 @@ class TranslationsStore(Store):
                                package, lang)
         else:
             self._set(func, package, lang)
+
+            with self._lock:
+                self._cache.pop((package, lang), None)
+
             self._logger.info('Registered "%s.%s" translations for the lang "%s"',
                               package, func.__name__, lang)
 
@@ -3,9 +3,21 @@
 
 import os
 import stat
-from typing import Callable
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
 from shutil import rmtree as shrmtree
 
+try:
+    import fcntl
+except ImportError: # pragma: no cover
+    fcntl = None # pylint: disable=invalid-name
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None # pylint: disable=invalid-name
+
 
 def read_file(path: str, ignore_errors=False, relative_to: str = None) -> str:
     """Read the file content as utf-8 at the specified path.
@@ -60,3 +72,35 @@ def rmtree(path: str, ignore_errors=False) -> None:
 
     """
     shrmtree(path, ignore_errors=ignore_errors, onerror=_onerror)
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Holds an exclusive lock on a file, shared by every processes of the host, until
+    the context exits. The file is created if needed and waiting processes are blocked
+    until the lock is released.
+
+    Args:
+      path (str): Path of the lock file
+
+    """
+    with open(path, 'a+') as file:
+        if fcntl:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt: # pragma: no cover
+            while True:
+                try:
+                    file.seek(0)
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt: # pragma: no cover
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
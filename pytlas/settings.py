@@ -13,6 +13,7 @@ DEFAULT_SECTION = 'pytlas'
 
 # Here are builtin settings used by the library
 SETTING_ALLOWED_LANGUAGES = 'allowed_languages'
+SETTING_HANDLER_TIMEOUT = 'handler_timeout'
 
 ENV_SANITIZER_RE = re.compile('[^0-9a-zA-Z]+')
 
@@ -0,0 +1,309 @@
+# pylint: disable=missing-module-docstring
+
+import os
+import logging
+from collections import namedtuple
+from typing import Callable, ContextManager, List
+from pytlas.ioutils import file_lock, read_file, rmtree
+
+CHECKSUM_FILENAME = 'trained.checksum'
+DEFAULT_MAX_ENTRIES = 5
+
+CacheEntry = namedtuple('CacheEntry', ['checksum', 'path', 'size', 'last_used'])
+
+
+def get_directory_size(path: str) -> int:
+    """Computes the size of every files contained in a directory.
+
+    Args:
+      path (str): Directory path
+
+    Returns:
+      int: Size in bytes
+
+    """
+    size = 0
+
+    for (root, _, files) in os.walk(path):
+        for file in files:
+            try:
+                size += os.path.getsize(os.path.join(root, file))
+            except OSError: # pragma: no cover
+                pass
+
+    return size
+
+
+class EngineCache:
+    """Content addressed cache of trained engines.
+
+    Each engine lives in its own sub directory named after the checksum of the dataset
+    used to train it, so several engines can be kept side by side. When the cache
+    grows above its limits, least recently used engines are evicted first.
+
+    """
+
+    def __init__(self,
+                 directory: str,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_size: int = None) -> None:
+        """Instantiates a new engine cache.
+
+        Args:
+          directory (str): Root directory of the cache
+          max_entries (int): Maximum number of engines to keep, None for no limit
+          max_size (int): Maximum total size in bytes of cached engines, None for no limit
+
+        """
+        self._logger = logging.getLogger('cache')
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_size = max_size
+
+    def path(self, checksum: str) -> str:
+        """Retrieve the path of the engine trained with the given checksum.
+
+        Args:
+          checksum (str): Dataset checksum
+
+        Returns:
+          str: Path of the engine directory
+
+        """
+        return os.path.join(self.directory, checksum)
+
+    def has(self, checksum: str) -> bool:
+        """Checks if an engine trained with the given checksum is available.
+
+        Args:
+          checksum (str): Dataset checksum
+
+        Returns:
+          bool: True if it's in the cache
+
+        """
+        stored = read_file(os.path.join(self.path(checksum), CHECKSUM_FILENAME),
+                           ignore_errors=True)
+
+        return stored == checksum
+
+    def touch(self, checksum: str) -> None:
+        """Marks the given engine as recently used.
+
+        Args:
+          checksum (str): Dataset checksum
+
+        """
+        try:
+            os.utime(os.path.join(self.path(checksum), CHECKSUM_FILENAME))
+        except OSError: # pragma: no cover
+            self._logger.warning('Could not update last usage of "%s"', checksum)
+
+    def lock(self, checksum: str) -> ContextManager[None]:
+        """Retrieve an exclusive lock on the given engine, shared by every processes
+        using this cache directory, so only one of them trains it while others wait.
+
+        Args:
+          checksum (str): Dataset checksum
+
+        Returns:
+          context manager: Holds the lock until the context exits
+
+        Examples:
+          >>> import tempfile
+          >>> with tempfile.TemporaryDirectory() as directory:
+          ...   with EngineCache(directory).lock('abc'):
+          ...     os.listdir(directory)
+          ['.abc.lock']
+
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        return file_lock(os.path.join(self.directory, '.%s.lock' % checksum))
+
+    def entries(self) -> List[CacheEntry]:
+        """Retrieve every engines in the cache, most recently used first.
+
+        Returns:
+          list of CacheEntry: Cached engines
+
+        """
+        if not os.path.isdir(self.directory):
+            return []
+
+        entries = []
+
+        for name in os.listdir(self.directory):
+            path = self.path(name)
+            checksum_path = os.path.join(path, CHECKSUM_FILENAME)
+
+            if name.startswith('.') or read_file(checksum_path, ignore_errors=True) != name:
+                continue
+
+            entries.append(CacheEntry(name, path, get_directory_size(path),
+                                      os.path.getmtime(checksum_path)))
+
+        return sorted(entries, key=lambda e: e.last_used, reverse=True)
+
+    def store(self, checksum: str, persist: Callable[[str], None]) -> str:
+        """Stores an engine in the cache and evicts old ones if needed.
+
+        The engine is first persisted in a temporary directory and then moved in place
+        so a partially written engine could never be loaded.
+
+        Args:
+          checksum (str): Dataset checksum
+          persist (callable): Function which persist the engine in the given directory
+            path, the directory must not exist beforehand
+
+        Returns:
+          str: Path of the engine directory
+
+        """
+        path = self.path(checksum)
+        tmp_path = os.path.join(self.directory, '.%s.%d' % (checksum, os.getpid()))
+
+        self._logger.info('Persisting trained engine to "%s"', path)
+
+        os.makedirs(self.directory, exist_ok=True)
+        rmtree(tmp_path, ignore_errors=True)
+
+        persist(tmp_path)
+
+        with open(os.path.join(tmp_path, CHECKSUM_FILENAME), mode='w') as file:
+            file.write(checksum)
+            file.flush()
+            os.fsync(file.fileno())
+
+        # A previous engine is moved aside, not removed in place, so the path always
+        # holds a complete engine or nothing. In between, `has` is briefly False, which
+        # is why `SnipsInterpreter.fit` checks the cache again once it holds the lock of
+        # the checksum, the one held by the process storing it
+        old_path = None
+
+        if os.path.isdir(path):
+            old_path = '%s.old' % tmp_path
+            os.rename(path, old_path)
+
+        os.rename(tmp_path, path)
+
+        if old_path:
+            rmtree(old_path, ignore_errors=True)
+
+        self.prune(keep=checksum)
+
+        return path
+
+    def remove(self, checksum: str) -> None:
+        """Removes an engine from the cache.
+
+        Args:
+          checksum (str): Dataset checksum
+
+        """
+        self._logger.info('Removing cached engine "%s"', checksum)
+
+        # Its empty lock file is kept since removing it while another process waits on it
+        # would let the next one lock a new file and train the same engine concurrently
+        rmtree(self.path(checksum), ignore_errors=True)
+
+    def prune(self,
+              max_entries: int = None,
+              max_size: int = None,
+              keep: str = None) -> List[CacheEntry]:
+        """Evicts least recently used engines until the cache respects its limits.
+
+        Args:
+          max_entries (int): Maximum number of engines, default to the cache one
+          max_size (int): Maximum total size in bytes, default to the cache one
+          keep (str): Optional checksum of an engine which should never be evicted
+
+        Returns:
+          list of CacheEntry: Evicted engines
+
+        """
+        max_entries = self.max_entries if max_entries is None else max_entries
+        max_size = self.max_size if max_size is None else max_size
+
+        entries = self.entries()
+        kept = [e for e in entries if e.checksum == keep]
+        candidates = [e for e in entries if e.checksum != keep]
+        total_size = sum(e.size for e in entries)
+        evicted = []
+
+        while candidates and (
+                (max_entries is not None and len(kept) + len(candidates) > max_entries) or
+                (max_size is not None and total_size > max_size)):
+            entry = candidates.pop()
+            total_size -= entry.size
+            self.remove(entry.checksum)
+            evicted.append(entry)
+
+        return evicted
+
+    def clear(self) -> List[CacheEntry]:
+        """Removes every engines from the cache.
+
+        Returns:
+          list of CacheEntry: Removed engines
+
+        """
+        return self.prune(max_entries=0, max_size=0)
+
+
+def format_size(size: int) -> str:
+    """Formats a size in bytes with an appropriate unit.
+
+    Args:
+      size (int): Size in bytes
+
+    Returns:
+      str: Formatted size
+
+    Examples:
+      >>> format_size(512)
+      '512 B'
+      >>> format_size(2048)
+      '2.0 kB'
+      >>> format_size(5 * 1024 * 1024)
+      '5.0 MB'
+
+    """
+    if size < 1024:
+        return '%d B' % size
+
+    for unit in ('kB', 'MB', 'GB'):
+        size /= 1024.0
+
+        if size < 1024 or unit == 'GB':
+            break
+
+    return '%.1f %s' % (size, unit) # pylint: disable=undefined-loop-variable
+
+
+def parse_size(value: str) -> int:
+    """Parses a human readable size to a number of bytes.
+
+    Args:
+      value (str): Size such as 500, 200k, 1.5M or 2G
+
+    Returns:
+      int: Size in bytes
+
+    Examples:
+      >>> parse_size('500')
+      500
+      >>> parse_size('200k')
+      204800
+      >>> parse_size('1.5MB')
+      1572864
+
+    """
+    value = value.strip().upper().rstrip('B')
+    factors = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+    if value and value[-1] in factors:
+        return int(float(value[:-1]) * factors[value[-1]])
+
+    return int(float(value))
+
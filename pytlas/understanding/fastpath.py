@@ -0,0 +1,217 @@
+# pylint: disable=missing-module-docstring
+
+import json
+import os
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+from pytlas.understanding.intent import Intent
+from pytlas.understanding.pattern import tokenize
+from pytlas.understanding.slot import SlotValue
+
+FAST_PATH_FILENAME = 'fast_path.json'
+
+# Utterances with more closed values combinations than this are left to the engine
+MAX_EXPANSIONS = 1000
+
+# Slot matched by an indexed utterance: slot name, entity, resolved value and the
+# range of its words in the utterance
+IndexedSlot = Tuple[str, str, str, int, int]
+
+
+def normalize(text: str) -> str:
+    """Normalize a message to be used as an index key: lowercased words separated by a
+    single space, punctuation is dropped.
+
+    Args:
+      text (str): Text to normalize
+
+    Returns:
+      str: Normalized text
+
+    Examples:
+      >>> normalize("  I'm   done! ")
+      'i m done'
+
+    """
+    return ' '.join(t[0] for t in tokenize(text))
+
+
+def _closed_values(entity: dict) -> Optional[List[Tuple[str, str]]]:
+    # Retrieve the text and resolved value of each value of a closed custom entity,
+    # None for builtin and extensible ones
+    if not entity or entity.get('automatically_extensible', True):
+        return None
+
+    values = []
+
+    for value in entity.get('data', []):
+        values.append((value['value'], value['value']))
+        values.extend((s, value['value']) for s in value.get('synonyms', []))
+
+    return values
+
+
+def _expand(utterance: dict, entities: dict) -> List[Tuple[str, List[IndexedSlot]]]:
+    # Generates every texts an utterance could take with its slots
+    choices = []
+
+    for part in utterance.get('data', []):
+        if 'entity' not in part:
+            choices.append([(part['text'], None)])
+            continue
+
+        values = _closed_values(entities.get(part['entity']))
+
+        if not values:
+            return []
+
+        choices.append([(text, (part['slot_name'], part['entity'], value))
+                        for (text, value) in values])
+
+    count = 1
+
+    for part_choices in choices:
+        count *= len(part_choices)
+
+    if count > MAX_EXPANSIONS:
+        return []
+
+    results = []
+
+    for combination in product(*choices):
+        text = ''
+        spans = []
+
+        for (part_text, slot) in combination:
+            if slot:
+                spans.append((slot, len(text), len(text) + len(part_text)))
+
+            text += part_text
+
+        tokens = tokenize(text)
+        slots = []
+
+        for ((slot, entity, value), start, end) in spans:
+            indices = [i for (i, t) in enumerate(tokens) if t[1] >= start and t[2] <= end]
+
+            if not indices:
+                break
+
+            slots.append((slot, entity, value, indices[0], indices[-1] + 1))
+        else:
+            if tokens:
+                results.append((' '.join(t[0] for t in tokens), slots))
+
+    return results
+
+
+class ExactMatchIndex:
+    """Hash index of normalized training utterances used to answer messages which are
+    literally one of them without running the NLU engine.
+
+    Utterances without slots are indexed as is and utterances whose slots all use
+    closed custom entities are indexed once for each combination of values.
+
+    """
+
+    def __init__(self, entries: Dict[str, List[Tuple[str, List[IndexedSlot]]]] = None) -> None:
+        """Instantiates a new index.
+
+        Args:
+          entries (dict): Normalized utterances and the intents with their slots they match
+
+        """
+        self.entries = entries or {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def from_dataset(cls, data: dict) -> 'ExactMatchIndex':
+        """Build an index from a snips dataset.
+
+        Args:
+          data (dict): Snips dataset, as returned by the pychatl snips adapter
+
+        Returns:
+          ExactMatchIndex: Index of the dataset utterances
+
+        """
+        entries = {}
+        entities = data.get('entities', {})
+
+        for (intent, intent_data) in data.get('intents', {}).items():
+            for utterance in intent_data.get('utterances', []):
+                for (key, slots) in _expand(utterance, entities):
+                    candidates = entries.setdefault(key, [])
+
+                    if (intent, slots) not in candidates:
+                        candidates.append((intent, slots))
+
+        return cls(entries)
+
+    @classmethod
+    def load(cls, directory: str) -> 'ExactMatchIndex':
+        """Loads an index saved in the given directory.
+
+        Args:
+          directory (str): Directory containing the index
+
+        Returns:
+          ExactMatchIndex: Loaded index, empty if none has been saved here
+
+        """
+        path = os.path.join(directory, FAST_PATH_FILENAME)
+
+        if not os.path.isfile(path):
+            return cls()
+
+        with open(path, encoding='utf-8') as file:
+            return cls({k: [(i, [tuple(s) for s in slots]) for (i, slots) in v]
+                        for (k, v) in json.load(file).items()})
+
+    def save(self, directory: str) -> None:
+        """Saves the index in the given directory.
+
+        Args:
+          directory (str): Directory where the index should be saved
+
+        """
+        with open(os.path.join(directory, FAST_PATH_FILENAME), 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file)
+
+    def lookup(self, msg: str, scopes: List[str] = None) -> Optional[List[Intent]]:
+        """Look for an utterance matching the given message.
+
+        Args:
+          msg (str): Message to look for
+          scopes (list of str): Optional list of scopes used to restrict matched intents
+
+        Returns:
+          list of Intent: Matched intent or None if the message is not indexed or is
+          ambiguous under the given scopes
+
+        """
+        tokens = tokenize(msg)
+        candidates = self.entries.get(' '.join(t[0] for t in tokens))
+
+        if not candidates:
+            return None
+
+        if scopes is not None:
+            candidates = [c for c in candidates if c[0] in scopes]
+
+        if len(candidates) != 1:
+            return None
+
+        (intent, indexed_slots) = candidates[0]
+        slots = {}
+
+        for (slot, entity, value, start, end) in indexed_slots:
+            (raw_start, raw_end) = (tokens[start][1], tokens[end - 1][2])
+            slots.setdefault(slot, []).append(SlotValue(
+                value, range={'start': raw_start, 'end': raw_end},
+                rawValue=msg[raw_start:raw_end], value={'kind': 'Custom', 'value': value},
+                entity=entity, slotName=slot))
+
+        return [Intent(intent, **slots)]
@@ -1,6 +1,6 @@
 # pylint: disable=missing-module-docstring
 
-from pytlas.understanding.slot import SlotValues
+from pytlas.understanding.slot import SlotValue, SlotValues, encode_value, decode_value
 
 
 class Intent:
@@ -33,6 +33,55 @@ class Intent:
         """
         self.slots.update({k: SlotValues(v) for (k, v) in kwargs.items()})
 
+    def copy(self) -> 'Intent':
+        """Copy this intent so its slots and meta could be updated without altering it.
+        Slot values themselves are shared and should be considered read-only.
+
+        Returns:
+          Intent: New intent
+
+        """
+        intent = Intent(self.name, **self.slots)
+        intent.meta = dict(self.meta)
+
+        return intent
+
+    def to_dict(self) -> dict:
+        """Gets a JSON compatible representation of this intent, its slots and meta.
+
+        Returns:
+          dict: Representation which can be given to `from_dict`
+
+        """
+        data = {'name': self.name}
+
+        if self.slots:
+            data['slots'] = {k: [v.to_dict() for v in values]
+                             for (k, values) in self.slots.items()}
+
+        if self.meta:
+            data['meta'] = encode_value(self.meta)
+
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Intent':
+        """Instantiate an intent from a representation returned by `to_dict`.
+
+        Args:
+          data (dict): Intent representation
+
+        Returns:
+          Intent: Intent instance
+
+        """
+        intent = cls(data['name'], **{
+            k: [SlotValue.from_dict(v) for v in values]
+            for (k, values) in data.get('slots', {}).items()})
+        intent.meta = decode_value(data.get('meta', {}))
+
+        return intent
+
     def __str__(self):
         return '"%s" (%s)' % (self.name, \
           ', '.join(['"%s"=%s' % (k, ['"%s"' % vv for vv in v]) for k, v in self.slots.items()]))
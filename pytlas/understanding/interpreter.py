@@ -3,7 +3,9 @@
 import logging
 import hashlib
 import json
-from typing import List
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple
 import pychatl.adapters as adapters
 from pychatl import parse, merge
 from pytlas.understanding.training import TrainingsStore
@@ -31,6 +33,59 @@ def compute_checksum(data: object) -> str:
     return hashlib.sha256(data.encode('utf-8')).hexdigest()
 
 
+BATCH_CHUNK_SIZE = 1000
+BATCH_DEDUPE_SIZE = 10000
+
+
+def iter_parse_batch(messages: Iterable[str],
+                     parse_many: Callable[[List[str]], List[List[Intent]]],
+                     chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[Tuple[str, List[Intent]]]:
+    """Parse messages chunk by chunk, each distinct message being parsed only once.
+
+    Results of the most recent distinct messages are remembered so identical messages
+    are parsed only once, even if they appear in different chunks.
+
+    Args:
+      messages (iterable of str): Messages to parse, it could be a lazy iterable
+      parse_many (callable): Function which parse a list of distinct messages and
+        returns parsed intents of each message, in the same order
+      chunk_size (int): Number of messages read at once
+
+    Returns:
+      iterator of (str, list of Intent): Messages and their parsed intents, in the
+      order they were given
+
+    """
+    messages = iter(messages)
+    parsed = OrderedDict()
+
+    while True:
+        chunk = list(islice(messages, chunk_size))
+
+        if not chunk:
+            return
+
+        results = {}
+
+        for msg in chunk:
+            if msg in parsed:
+                parsed.move_to_end(msg)
+                results[msg] = parsed[msg]
+
+        missing = [m for m in dict.fromkeys(chunk) if m not in results]
+
+        if missing:
+            results.update(zip(missing, parse_many(missing)))
+
+        for msg in chunk:
+            yield (msg, results[msg])
+
+        parsed.update(results)
+
+        while len(parsed) > BATCH_DEDUPE_SIZE:
+            parsed.popitem(last=False)
+
+
 class Interpreter:
     """Base class for pytlas interpreters. They should convert human language to
     a more code friendly result: Intent and SlotValue.
@@ -58,6 +113,9 @@ class Interpreter:
         self.name = name
         self.intents: List[str] = []
         self.cache_directory = cache_directory
+        # Incremented each time the underlying engine is replaced so agents know when
+        # they should rebuild their state machine
+        self.version = 0
 
     def load_from_cache(self) -> None:
         """Loads the interpreter from the cache directory.
@@ -73,12 +131,16 @@ class Interpreter:
         """
         self._logger.debug(data)
 
-    def fit_from_skill_data(self, skills: List[str] = None) -> None: # pylint: disable=inconsistent-return-statements
-        """Fit the interpreter with every training data registered in the inner TrainingsStore.
+    def get_skill_data(self, skills: List[str] = None) -> dict:
+        """Merge every training data registered in the inner TrainingsStore in a single
+        chatl dataset.
 
         Args:
           skills (list of str): Optional list of skill names from which we should retrieve
-            training data. Used to handle context understanding.
+            training data.
+
+        Returns:
+          dict: Merged chatl dataset
 
         """
         filtered_module_trainings = self._trainings.all(self.lang)
@@ -104,13 +166,51 @@ class Interpreter:
             else:
                 self._logger.warning('No training data found for "%s"', module)
 
+        return data
+
+    def get_training_data(self, skills: List[str] = None) -> dict:
+        """Retrieve the dataset used to fit this interpreter from the training data
+        registered in the inner TrainingsStore.
+
+        Args:
+          skills (list of str): Optional list of skill names from which we should retrieve
+            training data.
+
+        Returns:
+          dict: Dataset converted for this interpreter or None if it could not be converted
+
+        """
+        return self.convert_training_data(self.get_skill_data(skills))
+
+    def convert_training_data(self, data: dict) -> dict:
+        """Convert a chatl dataset to the format expected by the `fit` method.
+
+        Args:
+          data (dict): Chatl dataset
+
+        Returns:
+          dict: Dataset converted for this interpreter or None if it could not be converted
+
+        """
         try:
-            data = getattr(adapters, self.name)(data, language=self.lang)
+            return getattr(adapters, self.name)(data, language=self.lang)
         except AttributeError:
-            return self._logger.critical(
+            self._logger.critical(
                 'No post-processors found on pychatl for this interpreter!')
+            return None
+
+    def fit_from_skill_data(self, skills: List[str] = None) -> None:
+        """Fit the interpreter with every training data registered in the inner TrainingsStore.
+
+        Args:
+          skills (list of str): Optional list of skill names from which we should retrieve
+            training data. Used to handle context understanding.
+
+        """
+        data = self.get_training_data(skills)
 
-        self.fit(data)
+        if data is not None:
+            self.fit(data)
 
     def fit_from_file(self, path: str) -> None:
         """Fit the interpreter from a training file path.
@@ -124,6 +224,21 @@ class Interpreter:
         with open(path, encoding='utf-8') as file:
             self.fit(json.load(file))
 
+    def route(self, msg: str, lang: str = None) -> 'Interpreter': # pylint: disable=unused-argument
+        """Retrieve the interpreter which should handle the given message. Interpreters
+        serving several languages returns the one of the message language, others
+        returns themselves.
+
+        Args:
+          msg (str): Message to handle
+          lang (str): Language of the message if known
+
+        Returns:
+          Interpreter: Interpreter to use to parse the message
+
+        """
+        return self
+
     def parse_slot(self, intent: str, slot: str, msg: str) -> List[SlotValue]: # pylint: disable=unused-argument,no-self-use
         """Parses the given raw message to extract a slot matching given criterias.
 
@@ -151,3 +266,24 @@ class Interpreter:
 
         """
         return []
+
+    def parse_batch(self, messages: Iterable[str], scopes: List[str] = None,
+                    workers: int = None) -> Iterator[Tuple[str, List[Intent]]]: # pylint: disable=unused-argument
+        """Parses a lot of messages, such as a corpus of logged utterances, and streams
+        results as they come. Identical messages are only parsed once so their intents
+        are the same instances.
+
+        By default, messages are parsed one after the other in the current process.
+
+        Args:
+          messages (iterable of str): Messages to parse
+          scopes (list of str): Optional list of scopes used to restrict parsed intents
+          workers (int): Number of workers used to parse messages in parallel by
+            interpreters supporting it
+
+        Returns:
+          iterator of (str, list of Intent): Messages and their parsed intents, in the
+          order they were given
+
+        """
+        return iter_parse_batch(messages, lambda chunk: [self.parse(m, scopes) for m in chunk])
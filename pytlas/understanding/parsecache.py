@@ -0,0 +1,267 @@
+# pylint: disable=missing-module-docstring
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, FrozenSet, List, Optional, Tuple
+from pytlas.understanding.intent import Intent
+from pytlas.understanding.interpreter import Interpreter
+from pytlas.understanding.slot import SlotValue
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TIME_RELATIVE_TTL = 0.0
+
+CacheKey = Tuple[str, str, Optional[FrozenSet[str]]]
+
+
+def normalize_message(msg: str) -> str:
+    """Normalize a message to be used as a parse cache key.
+
+    Args:
+      msg (str): Message to normalize
+
+    Returns:
+      str: Lowercased message with consecutive whitespaces collapsed
+
+    Examples:
+      >>> normalize_message('  Turn the   lights OFF ')
+      'turn the lights off'
+
+    """
+    return ' '.join(msg.split()).lower()
+
+
+def is_time_relative(value: object) -> bool:
+    """Checks if a slot value has been resolved against the current time, such as
+    datetimes and time intervals. Durations do not depend on it.
+
+    Args:
+      value (object): Slot value to check
+
+    Returns:
+      bool: True if the value may not be valid later
+
+    Examples:
+      >>> is_time_relative(datetime(2019, 4, 2))
+      True
+      >>> is_time_relative((datetime(2019, 4, 2), datetime(2019, 4, 3)))
+      True
+      >>> is_time_relative('kitchen')
+      False
+      >>> from dateutil.relativedelta import relativedelta
+      >>> is_time_relative(relativedelta(hours=2))
+      False
+
+    """
+    if isinstance(value, tuple):
+        return any(is_time_relative(v) for v in value)
+
+    return isinstance(value, datetime)
+
+
+class _Results: # pylint: disable=too-few-public-methods
+    # Cached results and statistics, shared by a cached interpreter and the views it
+    # returns when routing messages to another interpreter
+
+    def __init__(self) -> None:
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+class CachedInterpreter(Interpreter): # pylint: disable=too-many-instance-attributes
+    """Wraps an interpreter to remember the results of the most recently parsed
+    messages, keyed by the normalized message and the scopes used.
+
+    Intents returned are copies of the cached ones so agents could update their meta.
+    Results containing time relative slot values (which have been resolved against
+    the current time) are only kept for `time_relative_ttl` seconds, and results are
+    invalidated whenever the interpreter which parsed them changes (its version is
+    incremented when fitted or loaded).
+
+    When the wrapped interpreter routes messages to other ones (such as the
+    `RouterInterpreter`), `route` returns a cached interpreter wrapping the routed one
+    and sharing the same results.
+
+    Since messages are normalized, raw values and ranges of slots are the ones of the
+    first message parsed.
+
+    """
+
+    def __init__(self,
+                 interpreter: Interpreter,
+                 max_size: int = DEFAULT_MAX_SIZE,
+                 time_relative_ttl: float = DEFAULT_TIME_RELATIVE_TTL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Instantiates a new cached interpreter.
+
+        Args:
+          interpreter (Interpreter): Interpreter to wrap
+          max_size (int): Maximum number of results kept, least recently used ones are
+            evicted first
+          time_relative_ttl (float): Number of seconds results with time relative slot
+            values are kept, 0 to never cache them
+          clock (callable): Function returning the current time in seconds
+
+        """
+        self.interpreter = interpreter
+
+        super(CachedInterpreter, self).__init__(
+            interpreter.name, interpreter.lang, interpreter.cache_directory,
+            getattr(interpreter, '_trainings', None))
+
+        self._logger = logging.getLogger('parse_cache')
+        self.max_size = max_size
+        self.time_relative_ttl = time_relative_ttl
+        self._clock = clock
+        self._results = _Results()
+
+    def __getattr__(self, name: str) -> object:
+        # Anything else, such as interpreter specific methods, comes from the wrapped one
+        if name == 'interpreter':
+            raise AttributeError(name)
+
+        return getattr(self.interpreter, name)
+
+    @property
+    def intents(self) -> List[str]:
+        """Intents of the wrapped interpreter.
+        """
+        return self.interpreter.intents
+
+    @intents.setter
+    def intents(self, value: List[str]) -> None:
+        # Only set by the base initializer, intents are the ones of the wrapped interpreter
+        pass
+
+    @property
+    def version(self) -> int:
+        """Version of the wrapped interpreter.
+        """
+        return self.interpreter.version
+
+    @version.setter
+    def version(self, value: int) -> None:
+        # Only set by the base initializer, the version is the one of the wrapped interpreter
+        pass
+
+    @property
+    def hits(self) -> int:
+        """Number of parse calls answered from the cache.
+        """
+        return self._results.hits
+
+    @property
+    def misses(self) -> int:
+        """Number of parse calls forwarded to the wrapped interpreter.
+        """
+        return self._results.misses
+
+    @property
+    def size(self) -> int:
+        """Number of cached results.
+        """
+        return len(self._results.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the ratio of parse calls answered from the cache.
+
+        Returns:
+          float: Hit rate between 0 and 1
+
+        """
+        total = self.hits + self.misses
+
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        """Removes every cached results.
+        """
+        with self._results.lock:
+            self._results.entries.clear()
+
+    def load_from_cache(self, *args, **kwargs) -> None:
+        self.interpreter.load_from_cache(*args, **kwargs)
+
+    def fit(self, data: dict) -> None:
+        self.interpreter.fit(data)
+
+    def get_skill_data(self, skills: List[str] = None) -> dict:
+        return self.interpreter.get_skill_data(skills)
+
+    def convert_training_data(self, data: dict) -> dict:
+        return self.interpreter.convert_training_data(data)
+
+    def route(self, msg: str, lang: str = None) -> Interpreter:
+        routed = self.interpreter.route(msg, lang)
+
+        if routed is self.interpreter:
+            return self
+
+        view = CachedInterpreter(routed, self.max_size, self.time_relative_ttl, self._clock)
+        view._results = self._results # pylint: disable=protected-access
+
+        return view
+
+    def parse_slot(self, intent: str, slot: str, msg: str) -> List[SlotValue]:
+        return self.interpreter.parse_slot(intent, slot, msg)
+
+    def _get(self, key: CacheKey, version: int) -> Optional[List[Intent]]:
+        results = self._results
+
+        with results.lock:
+            entry = results.entries.get(key)
+
+            # Parsed by an older version of the interpreter or expired
+            if entry and (entry[2] != version or \
+                    (entry[1] is not None and entry[1] <= self._clock())):
+                del results.entries[key]
+                entry = None
+
+            if entry:
+                results.entries.move_to_end(key)
+                results.hits += 1
+            else:
+                results.misses += 1
+
+        return entry[0] if entry else None
+
+    def _set(self, key: CacheKey, version: int, intents: List[Intent]) -> None:
+        expires_at = None
+
+        if any(is_time_relative(v.value) for i in intents for values in i.slots.values()
+               for v in values):
+            if self.time_relative_ttl <= 0:
+                return
+
+            expires_at = self._clock() + self.time_relative_ttl
+
+        results = self._results
+
+        with results.lock:
+            # The interpreter has changed while parsing, this result is outdated
+            if self.interpreter.version != version:
+                return
+
+            results.entries[key] = ([i.copy() for i in intents], expires_at, version)
+
+            while len(results.entries) > self.max_size:
+                results.entries.popitem(last=False)
+
+    def parse(self, msg: str, scopes: List[str] = None) -> List[Intent]:
+        key = (self.interpreter.lang, normalize_message(msg),
+               frozenset(scopes) if scopes is not None else None)
+        version = self.interpreter.version
+        intents = self._get(key, version)
+
+        if intents is None:
+            intents = self.interpreter.parse(msg, scopes)
+            self._set(key, version, intents)
+
+            return intents
+
+        return [i.copy() for i in intents]
@@ -0,0 +1,299 @@
+# pylint: disable=missing-module-docstring
+
+import json
+import os
+import re
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from pychatl.augment import Augment
+from pytlas.understanding.intent import Intent
+from pytlas.understanding.training import TrainingsStore
+from pytlas.understanding.slot import SlotValue
+from pytlas.understanding.interpreter import Interpreter
+
+DATA_FILENAME = 'pattern.json'
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Tokens, with their start and end offsets in the original message
+Tokens = List[Tuple[str, int, int]]
+
+
+def tokenize(text: str) -> Tokens:
+    """Splits a text in lowercased words, punctuation is dropped.
+
+    Args:
+      text (str): Text to tokenize
+
+    Returns:
+      list of (str, int, int): Words with their start and end offsets in the text
+
+    Examples:
+      >>> tokenize("Turn the Kitchen's lights on!")
+      [('turn', 0, 4), ('the', 5, 8), ('kitchen', 9, 16), ('s', 17, 18), ('lights', 19, 25), ('on', 26, 28)]
+
+    """
+    return [(m.group().lower(), m.start(), m.end()) for m in TOKEN_RE.finditer(text)]
+
+
+def _words(text: str) -> Tuple[str, ...]:
+    return tuple(t[0] for t in tokenize(text))
+
+
+class _Entity:
+    # Values an entity slot could take. Closed values are matched by their words,
+    # extensible and builtin entities also accept any span of words
+
+    def __init__(self, name: str, extensible: bool) -> None:
+        self.name = name
+        self.extensible = extensible
+        self.values: Dict[Tuple[str, ...], str] = {}
+        self.max_length = 0
+
+    def add(self, text: str, value: str) -> None:
+        words = _words(text)
+
+        if words:
+            self.values.setdefault(words, value)
+            self.max_length = max(self.max_length, len(words))
+
+    def candidates(self, tokens: Tokens, position: int) -> Iterator[Tuple[int, Optional[str]]]:
+        # Yields the end position of each possible match and its resolved value, None
+        # when the words are not a known value
+        for length in range(min(self.max_length, len(tokens) - position), 0, -1):
+            value = self.values.get(tuple(t[0] for t in tokens[position:position + length]))
+
+            if value is not None:
+                yield (position + length, value)
+
+        if self.extensible:
+            for end in range(position + 1, len(tokens) + 1):
+                yield (end, None)
+
+
+class _Node:
+    # Node of the templates trie, edges are words or entity slots
+
+    __slots__ = ('words', 'slots', 'intents', 'reachable')
+
+    def __init__(self) -> None:
+        self.words: Dict[str, '_Node'] = {}
+        self.slots: Dict[str, '_Node'] = {}
+        self.intents: List[str] = []
+        self.reachable: Set[str] = set()
+
+
+# Compiled training data, replaced at once when fitting so parsing could go on
+_Model = namedtuple('_Model', ['root', 'entities', 'slots'])
+
+
+class PatternInterpreter(Interpreter):
+    """Lightweight interpreter which compiles chatl training sentences to a trie of
+    word templates with entity slots and matches messages against it.
+
+    It does not need any machine learning dependency and fitting it takes a few
+    milliseconds, but only messages which follow a training sentence, once lowercased
+    and without punctuation, are understood. Extensible and builtin entities (such as
+    `snips/datetime`) accept any words, known values being preferred, and values of
+    builtin entities are not resolved.
+
+    """
+
+    def __init__(self,
+                 lang: str,
+                 cache_directory: str = None,
+                 trainings_store: TrainingsStore = None) -> None:
+        """Instantiates a new pattern interpreter.
+
+        Args:
+          lang (str): Language used for this interpreter (ie. en, fr, ...)
+          cache_directory (str): Path where the training data is kept to be loaded later
+          trainings_store (TrainingsStore): Optional trainings store used when fitting
+
+        """
+        super(PatternInterpreter, self).__init__(
+            'pattern', lang, cache_directory, trainings_store)
+
+        self._model = _Model(_Node(), {}, {})
+
+    def convert_training_data(self, data: dict) -> dict:
+        # The chatl dataset is used as is, it's compiled by `fit`
+        return data
+
+    def load_from_cache(self) -> None:
+        path = os.path.join(self.cache_directory, DATA_FILENAME)
+        self._logger.info('Loading training data from "%s"', path)
+
+        with open(path, encoding='utf-8') as file:
+            self._compile(json.load(file))
+
+    def fit(self, data: dict) -> None:
+        super().fit(data)
+
+        if self.cache_directory:
+            os.makedirs(self.cache_directory, exist_ok=True)
+
+            with open(os.path.join(self.cache_directory, DATA_FILENAME), 'w',
+                      encoding='utf-8') as file:
+                json.dump(data, file)
+
+        self._compile(data)
+
+    def _compile(self, data: dict) -> None:
+        augment = Augment(data)
+        entities = {}
+
+        for (name, entity) in augment.entities.items():
+            props = entity.get('props', {})
+            ent_type = props.get('type') or props.get('snips:type')
+
+            # Types which are not defined in the dataset are builtin entities, their
+            # values are only examples
+            if ent_type and ent_type not in augment.entities:
+                (source, compiled) = (name, _Entity(ent_type, True))
+            else:
+                source = ent_type or name
+                compiled = _Entity(source, augment.entities[source].get('props', {}).get(
+                    'extensible', 'true') == 'true')
+
+            for value in augment.get_entity(source).all():
+                compiled.add(value, value)
+
+                for synonym in augment.get_synonyms(value):
+                    compiled.add(synonym, value)
+
+            entities[name] = compiled
+
+        root = _Node()
+        slots = {}
+
+        for (intent, intent_data) in augment.get_intents().items():
+            slots[intent] = set()
+
+            for sentence in intent_data.get('data', []):
+                node = root
+                node.reachable.add(intent)
+
+                for part in sentence:
+                    if part['type'] == 'entity':
+                        # Slots are named after their entity
+                        if part['value'] not in entities:
+                            self._logger.warning('Unknown entity "%s" in "%s" training data',
+                                                 part['value'], intent)
+                            break
+
+                        slots[intent].add(part['value'])
+                        node = node.slots.setdefault(part['value'], _Node())
+                        node.reachable.add(intent)
+                    else:
+                        for word in _words(part['value']):
+                            node = node.words.setdefault(word, _Node())
+                            node.reachable.add(intent)
+                else:
+                    if node is not root and intent not in node.intents:
+                        node.intents.append(intent)
+
+        self._model = _Model(root, entities, slots)
+        self.intents = list(slots.keys())
+        self.version += 1
+
+    def _match(self, entities: Dict[str, _Entity], node: _Node, tokens: Tokens, position: int,
+               allowed: Set[str], score: int, slots: list, best: list) -> None:
+        # Depth first search of the best template, the score being the number of words
+        # matched by a template word or a known entity value. Templates made only of
+        # extensible slots would match anything so at least one word should match
+        if allowed is not None and not node.reachable & allowed:
+            return
+
+        # Even if every remaining words match, it would not beat the best one
+        if best[0] is not None and score + len(tokens) - position <= best[0][0]:
+            return
+
+        if position == len(tokens):
+            if not score:
+                return
+
+            for intent in node.intents:
+                if allowed is None or intent in allowed:
+                    best[0] = (score, intent, list(slots))
+                    return
+
+            return
+
+        child = node.words.get(tokens[position][0])
+
+        if child:
+            self._match(entities, child, tokens, position + 1, allowed, score + 1, slots, best)
+
+        for (slot, child) in node.slots.items():
+            entity = entities[slot]
+
+            for (end, value) in entity.candidates(tokens, position):
+                slots.append((slot, entity, position, end, value))
+                self._match(entities, child, tokens, end, allowed,
+                            score + (end - position if value is not None else 0), slots, best)
+                slots.pop()
+
+    @staticmethod
+    def _slot_value(msg: str, tokens: Tokens, slot: str, entity: _Entity, start: int,
+                    end: int, value: Optional[str]) -> SlotValue:
+        raw_start = tokens[start][1]
+        raw_end = tokens[end - 1][2]
+        raw = msg[raw_start:raw_end]
+
+        return SlotValue(raw if value is None else value,
+                         value={'kind': 'Custom', 'value': raw if value is None else value},
+                         rawValue=raw, entity=entity.name, slotName=slot,
+                         range={'start': raw_start, 'end': raw_end})
+
+    def parse(self, msg: str, scopes: List[str] = None) -> List[Intent]:
+        tokens = tokenize(msg)
+
+        if not tokens:
+            return []
+
+        model = self._model
+        best = [None]
+        self._match(model.entities, model.root, tokens, 0,
+                    set(scopes) if scopes is not None else None, 0, [], best)
+
+        if not best[0]:
+            return []
+
+        (_, intent, matched) = best[0]
+        slots = {}
+
+        for (slot, entity, start, end, value) in matched:
+            slots.setdefault(slot, []).append(
+                self._slot_value(msg, tokens, slot, entity, start, end, value))
+
+        return [Intent(intent, **slots)]
+
+    def parse_slot(self, intent: str, slot: str, msg: str) -> List[SlotValue]:
+        model = self._model
+
+        # Unknown slot, just returns the given value
+        if slot not in model.slots.get(intent, ()):
+            return [SlotValue(msg)]
+
+        entity = model.entities[slot]
+        tokens = tokenize(msg)
+        result = []
+        position = 0
+
+        # Look for known values, longest first
+        while position < len(tokens):
+            (end, value) = next((c for c in entity.candidates(tokens, position)
+                                 if c[1] is not None), (None, None))
+
+            if end is None:
+                position += 1
+                continue
+
+            result.append(self._slot_value(msg, tokens, slot, entity, position, end, value))
+            position = end
+
+        if not result and entity.extensible:
+            return [SlotValue(msg)]
+
+        return result
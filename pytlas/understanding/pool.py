@@ -0,0 +1,337 @@
+# pylint: disable=missing-module-docstring
+
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from pytlas.understanding.intent import Intent
+from pytlas.understanding.interpreter import Interpreter, iter_parse_batch
+from pytlas.understanding.slot import SlotValue
+
+MSG_OK = 'ok'
+MSG_ERROR = 'error'
+
+InterpreterFactory = Callable[[str, str], Interpreter]
+
+
+def create_snips_interpreter(lang: str, cache_directory: str) -> Interpreter:
+    """Default factory used by `PoolInterpreter` workers.
+
+    Args:
+      lang (str): Language of the interpreter
+      cache_directory (str): Cache directory of the interpreter
+
+    Returns:
+      Interpreter: Snips interpreter
+
+    """
+    from pytlas.understanding.snips import SnipsInterpreter # pylint: disable=import-outside-toplevel
+
+    return SnipsInterpreter(lang, cache_directory)
+
+
+def _serve(conn: Connection, factory: InterpreterFactory, lang: str, cache_directory: str,
+           setup: Tuple[str, tuple]) -> None: # pragma: no cover
+    # Worker process main loop, each request is a tuple with a method name and its
+    # arguments and each response a tuple with a status and a JSON compatible payload
+    try:
+        interpreter = factory(lang, cache_directory)
+        getattr(interpreter, setup[0])(*setup[1])
+        conn.send((MSG_OK, interpreter.intents))
+    except Exception as err: # pylint: disable=broad-except
+        conn.send((MSG_ERROR, str(err)))
+        return
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+
+        if request is None:
+            return
+
+        (method, args) = request
+
+        try:
+            if method == 'parse':
+                result = [i.to_dict() for i in interpreter.parse(*args)]
+            else:
+                result = [v.to_dict() for v in interpreter.parse_slot(*args)]
+
+            conn.send((MSG_OK, result))
+        except Exception as err: # pylint: disable=broad-except
+            conn.send((MSG_ERROR, str(err)))
+
+
+class WorkerError(Exception):
+    """Raised when a worker could not answer a request.
+    """
+
+
+class _Worker:
+
+    def __init__(self, process: multiprocessing.Process, conn: Connection,
+                 generation: int) -> None:
+        self.process = process
+        self.conn = conn
+        self.generation = generation
+        self.crashed = False
+        self.stopped = False
+
+    def request(self, message: object) -> object:
+        try:
+            self.conn.send(message)
+            (status, payload) = self.conn.recv()
+        except (EOFError, OSError) as err:
+            self.crashed = True
+            raise WorkerError('Worker %d is not responding: %s' % (self.process.pid, err))
+
+        if status == MSG_ERROR:
+            raise WorkerError(payload)
+
+        return payload
+
+    def stop(self) -> None:
+        self.stopped = True
+
+        try:
+            self.conn.send(None)
+        except (EOFError, OSError): # pragma: no cover
+            pass
+
+        self.process.join(1)
+
+        if self.process.is_alive(): # pragma: no cover
+            self.process.terminate()
+
+        self.conn.close()
+
+
+class PoolInterpreter(Interpreter):
+    """Interpreter which forwards parsing to several worker processes, each one holding
+    its own interpreter loaded from the same cache directory, to make use of every
+    CPU cores.
+
+    Requests are given to the first idle worker and crashed workers are restarted.
+    Fitting or loading it again starts a new generation of workers, previous ones
+    keep answering requests until the new ones are ready and are then stopped as soon
+    as they are idle.
+
+    """
+
+    def __init__(self,
+                 lang: str,
+                 cache_directory: str = None,
+                 workers: int = None,
+                 factory: InterpreterFactory = create_snips_interpreter,
+                 name: str = 'snips') -> None:
+        """Instantiates a new pool interpreter, workers are started when loading or
+        fitting it.
+
+        Args:
+          lang (str): Language understood by this interpreter
+          cache_directory (str): Cache directory given to each worker interpreter
+          workers (int): Number of worker processes, default to the number of CPU cores
+          factory (callable): Function called in each worker with the language and
+            cache directory to create its interpreter
+          name (str): Name of the interpreter used by workers, used to convert training data
+
+        """
+        super(PoolInterpreter, self).__init__(name, lang, cache_directory)
+
+        self.workers_count = workers or os.cpu_count() or 1
+        self._factory = factory
+        self._setup: Tuple[str, tuple] = None
+        self._workers: List[_Worker] = []
+        self._idle: queue.Queue = queue.Queue()
+        self._generation = 0
+        # Serializes workers starts while the idle lock guards the current generation
+        # and its workers, only held for short periods so requests are never blocked
+        # by a start
+        self._lock = threading.Lock()
+        self._idle_lock = threading.Lock()
+
+    def _spawn_worker(self) -> Tuple[multiprocessing.Process, Connection]:
+        (parent_conn, child_conn) = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_serve, daemon=True,
+            args=(child_conn, self._factory, self.lang, self.cache_directory, self._setup))
+        process.start()
+        child_conn.close()
+
+        return (process, parent_conn)
+
+    def _wait_worker(self, process: multiprocessing.Process, conn: Connection,
+                     generation: int) -> _Worker:
+        try:
+            (status, payload) = conn.recv()
+        except EOFError:
+            process.join(1)
+            status, payload = MSG_ERROR, 'worker exited with code %s' % process.exitcode
+
+        if status == MSG_ERROR:
+            process.join(1)
+            conn.close()
+            raise WorkerError('Could not start worker: %s' % payload)
+
+        self._logger.info('Worker %d is ready', process.pid)
+        self.intents = payload
+
+        return _Worker(process, conn, generation)
+
+    def _start_worker(self, generation: int) -> _Worker:
+        return self._wait_worker(*self._spawn_worker(), generation)
+
+    def _start(self, setup: Tuple[str, tuple]) -> None:
+        with self._lock:
+            self._setup = setup
+            generation = self._generation + 1
+
+            # The first worker is started alone so it could populate the cache, others
+            # will then only have to load the engine
+            workers = [self._start_worker(generation)]
+            spawned = [self._spawn_worker() for _ in range(self.workers_count - 1)]
+
+            for (process, conn) in spawned:
+                try:
+                    workers.append(self._wait_worker(process, conn, generation))
+                except WorkerError as err:
+                    self._logger.error('%s, running with one less worker', err)
+
+            self._swap(workers, generation)
+
+        self.version += 1
+
+    def _swap(self, workers: List[_Worker], generation: int) -> None:
+        # Should be called with the lock held. Replaces the current generation of workers,
+        # previous ones which are idle are stopped right away and busy ones once released
+        idle: queue.Queue = queue.Queue()
+
+        for worker in workers:
+            idle.put(worker)
+
+        with self._idle_lock:
+            previous_idle = self._idle
+            (self._workers, self._idle, self._generation) = (workers, idle, generation)
+            stopped = []
+
+            while not previous_idle.empty():
+                stopped.append(previous_idle.get())
+
+            # Wakes up callers waiting for a previous worker so they wait on new ones
+            previous_idle.put(None)
+
+        for worker in stopped:
+            if worker is not None:
+                worker.stop()
+
+    def load_from_cache(self) -> None:
+        self._start(('load_from_cache', ()))
+
+    def fit(self, data: dict) -> None:
+        super().fit(data)
+
+        self._start(('fit', (data,)))
+
+    def close(self) -> None:
+        """Stops every workers.
+        """
+        with self._lock:
+            self._swap([], self._generation + 1)
+
+    def _acquire(self) -> Optional[_Worker]:
+        # Waits for an idle worker of the current generation, None if there is none
+        while True:
+            with self._idle_lock:
+                (workers, idle) = (self._workers, self._idle)
+
+            if not workers:
+                return None
+
+            worker = idle.get()
+
+            if worker is not None:
+                return worker
+
+            # This generation has been replaced, wake up the next waiter too and retry
+            idle.put(None)
+
+    def _release(self, worker: _Worker) -> None:
+        # Crashed workers are kept so the next request restarts them
+        with self._idle_lock:
+            if worker.generation == self._generation and not worker.stopped:
+                self._idle.put(worker)
+                return
+
+        if not worker.stopped:
+            worker.stop()
+
+    def _restart(self, worker: _Worker) -> Optional[_Worker]:
+        # Replaces a crashed worker, returns None if its generation has been replaced
+        # in the meantime
+        worker.stop()
+
+        with self._lock:
+            if worker.generation != self._generation:
+                return None
+
+            self._logger.warning('Restarting worker %d', worker.process.pid)
+
+            try:
+                new_worker = self._start_worker(worker.generation)
+            except WorkerError:
+                with self._idle_lock:
+                    self._workers = [w for w in self._workers if w is not worker]
+
+                raise
+
+            with self._idle_lock:
+                self._workers = [new_worker if w is worker else w for w in self._workers]
+
+        return new_worker
+
+    def _request(self, method: str, *args) -> list:
+        worker = self._acquire()
+
+        if worker is None:
+            return []
+
+        try:
+            try:
+                return worker.request((method, args))
+            except WorkerError:
+                if not worker.crashed:
+                    raise
+
+            # The worker crashed, try once again on a fresh one
+            worker = self._restart(worker) or self._acquire()
+
+            return worker.request((method, args)) if worker else []
+        finally:
+            if worker is not None:
+                self._release(worker)
+
+    def parse(self, msg: str, scopes: List[str] = None) -> List[Intent]:
+        try:
+            return [Intent.from_dict(d) for d in self._request('parse', msg, scopes)]
+        except WorkerError as err:
+            self._logger.error('Could not parse "%s": %s', msg, err)
+            return []
+
+    def parse_slot(self, intent: str, slot: str, msg: str) -> List[SlotValue]:
+        try:
+            return [SlotValue.from_dict(d) for d in self._request('parse_slot', intent, slot, msg)]
+        except WorkerError as err:
+            self._logger.error('Could not parse slot "%s" of "%s": %s', slot, intent, err)
+            return []
+
+    def parse_batch(self, messages: Iterable[str], scopes: List[str] = None,
+                    workers: int = None) -> Iterator[Tuple[str, List[Intent]]]:
+        # Workers are already there, so just keep them all busy
+        with ThreadPoolExecutor(max_workers=workers or len(self._workers) or 1) as executor:
+            yield from iter_parse_batch(
+                messages, lambda chunk: list(executor.map(lambda m: self.parse(m, scopes), chunk)))
@@ -0,0 +1,331 @@
+# pylint: disable=missing-module-docstring
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+from pytlas.understanding.cache import get_directory_size
+from pytlas.understanding.intent import Intent
+from pytlas.understanding.interpreter import Interpreter
+from pytlas.understanding.pattern import tokenize
+from pytlas.understanding.pool import InterpreterFactory, create_snips_interpreter
+from pytlas.understanding.slot import SlotValue
+from pytlas.understanding.training import TrainingsStore
+
+Loader = Callable[[Interpreter], None]
+
+
+def load_language(interpreter: Interpreter) -> None:
+    """Default loader used by the `RouterInterpreter`. It fits the interpreter with the
+    training data registered for its language, which only loads the engine when it has
+    already been trained with the same data and cached.
+
+    Args:
+      interpreter (Interpreter): Interpreter to load
+
+    """
+    interpreter.fit_from_skill_data()
+
+
+def estimate_size(interpreter: Interpreter) -> int:
+    """Estimates the memory used by a loaded interpreter from the size of its persisted
+    engine, which is a good approximation for snips engines.
+
+    Args:
+      interpreter (Interpreter): Loaded interpreter
+
+    Returns:
+      int: Estimated size in bytes, 0 when unknown
+
+    """
+    cache = getattr(interpreter, 'cache', None)
+
+    # The engine in use is the most recently used one
+    if cache is not None:
+        entries = cache.entries()
+        return entries[0].size if entries else 0
+
+    if interpreter.cache_directory and os.path.isdir(interpreter.cache_directory):
+        return get_directory_size(interpreter.cache_directory)
+
+    return 0
+
+
+def normalize_language(lang: str) -> str:
+    """Keeps only the language part of a locale.
+
+    Args:
+      lang (str): Language or locale
+
+    Returns:
+      str: Lowercased language
+
+    Examples:
+      >>> normalize_language('fr_FR')
+      'fr'
+      >>> normalize_language('en-US')
+      'en'
+
+    """
+    return lang.replace('-', '_').split('_')[0].lower()
+
+
+def detect_language(msg: str, vocabularies: Dict[str, Set[str]]) -> Optional[str]:
+    """Detects the language of a message by counting its words found in the vocabulary
+    of each language. Words known by every language are not taken into account.
+
+    Args:
+      msg (str): Message to detect the language of
+      vocabularies (dict): Lowercased words known for each language
+
+    Returns:
+      str: Detected language or None if it could not be decided
+
+    Examples:
+      >>> detect_language('what time is it?', {'en': {'what', 'time', 'it'}, 'fr': {'quelle', 'heure', 'il'}})
+      'en'
+      >>> detect_language('paris', {'en': {'paris'}, 'fr': {'paris'}}) is None
+      True
+
+    """
+    scores = dict.fromkeys(vocabularies, 0)
+
+    for (word, _, _) in tokenize(msg):
+        langs = [l for (l, words) in vocabularies.items() if word in words]
+
+        if len(langs) < len(vocabularies):
+            for lang in langs:
+                scores[lang] += 1
+
+    best = sorted(scores.items(), key=lambda s: s[1], reverse=True)
+
+    if not best or not best[0][1] or (len(best) > 1 and best[0][1] == best[1][1]):
+        return None
+
+    return best[0][0]
+
+
+class RouterInterpreter(Interpreter): # pylint: disable=too-many-instance-attributes
+    """Interpreter serving several languages, each one with its own interpreter.
+
+    Language interpreters are created and loaded the first time a message is routed
+    to them. When given a `memory_budget`, least recently used languages are evicted
+    once loaded ones exceed it and will be loaded again when needed.
+
+    Agents ask the router which interpreter should handle each message with `route`,
+    using the `lang` meta when given or detecting it from the message words otherwise.
+    Slot values given to `parse_slot` are parsed in the language of the last message
+    parsed as the requesting intent since they are often too short to be detected.
+
+    """
+
+    def __init__(self, # pylint: disable=too-many-arguments
+                 languages: List[str],
+                 cache_directory: str = None,
+                 trainings_store: TrainingsStore = None,
+                 factory: InterpreterFactory = create_snips_interpreter,
+                 loader: Loader = load_language,
+                 memory_budget: int = None,
+                 sizeof: Callable[[Interpreter], int] = estimate_size) -> None:
+        """Instantiates a new router.
+
+        Args:
+          languages (list of str): Supported languages, the first one is used when the
+            language of a message could not be determined
+          cache_directory (str): Optional directory where each language interpreter
+            gets its own sub directory
+          trainings_store (TrainingsStore): Optional trainings store used to build the
+            vocabulary of each language
+          factory (callable): Creates the interpreter of a language given the language and
+            its cache directory
+          loader (callable): Loads a newly created language interpreter
+          memory_budget (int): Maximum size in bytes of loaded language interpreters
+          sizeof (callable): Estimates the size in bytes of a loaded language interpreter
+
+        """
+        super(RouterInterpreter, self).__init__(
+            'router', languages[0], cache_directory, trainings_store)
+
+        self.languages = languages
+        self.memory_budget = memory_budget
+        self.loads = 0
+        self.evictions = 0
+        self._factory = factory
+        self._loader = loader
+        self._sizeof = sizeof
+        self._interpreters: OrderedDict = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        self._intents_languages: Dict[str, str] = {}
+        self._vocabularies: Dict[str, Set[str]] = None
+        self._lock = threading.Lock()
+        self._load_locks = {l: threading.Lock() for l in languages}
+
+    @property
+    def loaded_languages(self) -> List[str]:
+        """Languages currently loaded, least recently used first.
+        """
+        return list(self._interpreters.keys())
+
+    @property
+    def size(self) -> int:
+        """Estimated size in bytes of loaded language interpreters.
+        """
+        return sum(self._sizes.values())
+
+    def load_from_cache(self) -> None:
+        # Only the default language is loaded ahead, others will be loaded on first use
+        self.get(self.lang)
+
+    def fit(self, data: dict) -> None:
+        lang = data.get('language') or self.lang
+        interpreter = self.get(lang)
+        interpreter.fit(data)
+
+        self._update_intents(lang, interpreter)
+
+    def fit_from_skill_data(self, skills: List[str] = None) -> None:
+        # Languages not loaded yet will be fitted with the new data on first use
+        with self._lock:
+            interpreters = list(self._interpreters.items())
+
+        self._vocabularies = None
+
+        for (lang, interpreter) in interpreters:
+            interpreter.fit_from_skill_data(skills)
+            self._update_intents(lang, interpreter)
+
+    def get(self, lang: str) -> Interpreter:
+        """Retrieve the interpreter of a language, loading it if needed.
+
+        Args:
+          lang (str): Language of the interpreter
+
+        Returns:
+          Interpreter: Loaded interpreter of the given language
+
+        """
+        if lang not in self._load_locks:
+            raise ValueError('Unsupported language "%s"' % lang)
+
+        interpreter = self._use(lang)
+
+        if interpreter:
+            # It may have been fitted again directly
+            self._update_intents(lang, interpreter)
+            return interpreter
+
+        # Languages are loaded one at a time while others keep parsing
+        with self._load_locks[lang]:
+            interpreter = self._use(lang)
+
+            if interpreter:
+                return interpreter
+
+            self._logger.info('Loading interpreter of language "%s"', lang)
+
+            interpreter = self._factory(lang, os.path.join(self.cache_directory, lang) \
+                if self.cache_directory else None)
+            self._loader(interpreter)
+            size = self._sizeof(interpreter)
+
+            with self._lock:
+                self._interpreters[lang] = interpreter
+                self._sizes[lang] = size
+                self._versions.pop(lang, None)
+                self.loads += 1
+                self._evict(keep=lang)
+
+        self._update_intents(lang, interpreter)
+
+        return interpreter
+
+    def _use(self, lang: str) -> Optional[Interpreter]:
+        with self._lock:
+            interpreter = self._interpreters.get(lang)
+
+            if interpreter:
+                self._interpreters.move_to_end(lang)
+
+            return interpreter
+
+    def _evict(self, keep: str) -> None:
+        # Should be called with the lock held. Interpreters still used by a parse call
+        # are freed once the call returns
+        if self.memory_budget is None:
+            return
+
+        while self.size > self.memory_budget and len(self._interpreters) > 1:
+            lang = next(l for l in self._interpreters if l != keep)
+
+            self._logger.info('Evicting interpreter of language "%s" to stay under the '\
+                'memory budget', lang)
+
+            del self._interpreters[lang]
+            del self._sizes[lang]
+            self.evictions += 1
+
+    def _update_intents(self, lang: str, interpreter: Interpreter) -> None:
+        # Intents of evicted languages are kept so the state machine of agents does not
+        # change each time a language is loaded again, but a language interpreter fitted
+        # again bumps the version even with the same intents
+        with self._lock:
+            merged = sorted(set(self.intents) | set(interpreter.intents))
+            previous = self._versions.get(lang, interpreter.version)
+            self._versions[lang] = interpreter.version
+
+            if merged != self.intents or previous != interpreter.version:
+                self.intents = merged
+                self.version += 1
+
+    def _get_vocabularies(self) -> Dict[str, Set[str]]:
+        vocabularies = self._vocabularies
+
+        if vocabularies is None:
+            vocabularies = {l: {t[0] for dsl in self._trainings.all(l).values() if dsl
+                                for t in tokenize(dsl)} for l in self.languages}
+            self._vocabularies = vocabularies
+
+        return vocabularies
+
+    def route(self, msg: str, lang: str = None) -> Interpreter:
+        """Retrieve the interpreter which should handle a message.
+
+        Args:
+          msg (str): Message to handle
+          lang (str): Language of the message if known, such as an agent `lang` meta
+
+        Returns:
+          Interpreter: Interpreter of the given language if supported, else the one of
+          the detected language, else the one of the default language
+
+        """
+        if lang:
+            lang = normalize_language(lang)
+
+        if lang not in self._load_locks:
+            lang = (detect_language(msg, self._get_vocabularies()) \
+                if len(self.languages) > 1 else None) or self.lang
+
+        return self.get(lang)
+
+    def parse(self, msg: str, scopes: List[str] = None) -> List[Intent]:
+        interpreter = self.route(msg)
+        intents = interpreter.parse(msg, scopes)
+
+        for intent in intents:
+            self._intents_languages[intent.name] = interpreter.lang
+
+        return intents
+
+    def parse_slot(self, intent: str, slot: str, msg: str) -> List[SlotValue]:
+        lang = self._intents_languages.get(intent)
+
+        if lang is None:
+            with self._lock:
+                loaded = list(self._interpreters.items())
+
+            # Most recently used language knowing this intent, else the default one
+            lang = next((l for (l, i) in reversed(loaded) if intent in i.intents), self.lang)
+
+        return self.get(lang).parse_slot(intent, slot, msg)
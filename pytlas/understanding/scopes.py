@@ -0,0 +1,62 @@
+"""Builtin states and scopes shared by the understanding and the conversing parts, so
+interpreters can compute the scopes of contexts the same way agents do.
+"""
+
+from typing import Dict, List
+
+STATE_PREFIX = '__'
+STATE_SUFFIX = '__'
+STATE_ASLEEP = STATE_PREFIX + 'asleep' + STATE_SUFFIX
+STATE_CANCEL = STATE_PREFIX + 'cancel' + STATE_SUFFIX
+STATE_FALLBACK = STATE_PREFIX + 'fallback' + STATE_SUFFIX
+STATE_ASK = STATE_PREFIX + 'ask' + STATE_SUFFIX
+CONTEXT_SEPARATOR = '/'
+
+
+def is_builtin(state: str) -> bool:
+    """Checks if the given state is a builtin one.
+
+    Args:
+      state (str): State to check
+
+    Returns:
+      bool: True if it's a builtin state, false otherwise
+
+    """
+    return state.startswith(STATE_PREFIX) and state.endswith(STATE_SUFFIX) if state else False
+
+
+def build_scopes(intents: List[str], include_cancel_state=True) -> Dict[str, List[str]]:
+    """Build all scopes given an intents list. It will create a dict which contains
+    association between a context and available scopes.
+
+    Scopes are intents which could be triggered from a particular context. They will be given
+    to the interpreter to restrict the list of intents to be parsed. That's why STATE_CANCEL is
+    always added to every scopes if include_cancel_state is set to True.
+
+    Args:
+      intents (list): List of intents
+      include_cancel_state (bool): Should builtin state cancel be always added?
+
+    Returns:
+      dict: Dictionary mapping each context to a list of available scopes
+
+    """
+    scopes = {
+        # represents the root scopes, ie. when not in a specific context
+        None: [STATE_CANCEL] if include_cancel_state else [],
+    }
+
+    for intent in intents:
+        try:
+            last_idx = intent.rindex(CONTEXT_SEPARATOR)
+            root = intent[:last_idx]
+
+            if root not in scopes:
+                scopes[root] = [STATE_CANCEL] if include_cancel_state else []
+
+            scopes[root].append(intent)
+        except ValueError:
+            scopes[None].append(intent)
+
+    return scopes
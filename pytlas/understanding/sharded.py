@@ -0,0 +1,291 @@
+# pylint: disable=missing-module-docstring
+
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List
+from pychatl import parse, merge
+from pytlas.understanding.intent import Intent
+from pytlas.understanding.interpreter import Interpreter
+from pytlas.understanding.pool import InterpreterFactory, create_snips_interpreter
+from pytlas.understanding.slot import SlotValue
+from pytlas.understanding.training import TrainingsStore, generate_examples
+
+SHARDS_DIRNAME = 'shards'
+ROUTER_DIRNAME = 'router'
+
+# Number of utterances generated from each training sentence to fit the router
+DEFAULT_ROUTER_VARIATIONS = 3
+
+SHARD_NAME_RE = re.compile(r'[^\w.-]')
+
+# Fitted shards, the intents they own and the router, replaced at once when fitting
+_Model = namedtuple('_Model', ['shards', 'owners', 'router'])
+
+
+def get_shard_directory_name(module: str) -> str:
+    """Retrieve the name of the cache sub directory of a skill shard.
+
+    Args:
+      module (str): Skill package name
+
+    Returns:
+      str: Name usable as a directory name
+
+    Examples:
+      >>> get_shard_directory_name('atlassistant/weather')
+      'atlassistant_weather'
+
+    """
+    return SHARD_NAME_RE.sub('_', module)
+
+
+def build_router_data(data: Dict[str, dict], variations: int = DEFAULT_ROUTER_VARIATIONS) -> dict:
+    """Build the chatl dataset of the router, with an intent for each skill whose
+    sentences are the utterances generated from the skill training data.
+
+    Args:
+      data (dict): Chatl dataset of each skill
+      variations (int): Number of utterances to generate for each training sentence
+
+    Returns:
+      dict: Chatl dataset of the router
+
+    """
+    return {
+        'intents': {
+            module: {'props': {}, 'data': [[{'type': 'text', 'value': text}]
+                                           for (text, _) in generate_examples(chatl, variations)
+                                           if text]}
+            for (module, chatl) in data.items()
+        },
+        'entities': {},
+        'synonyms': {},
+    }
+
+
+def share_definitions(data: Dict[str, dict]) -> Dict[str, dict]:
+    """Complete the chatl dataset of each skill with the entities and synonyms it uses,
+    as defined by all skills, so a skill could use an entity defined by another one and
+    values added to a shared entity by a skill are known by every skill using it.
+
+    Args:
+      data (dict): Chatl dataset of each skill
+
+    Returns:
+      dict: Chatl dataset of each skill with the definitions it uses
+
+    """
+    if not data:
+        return data
+
+    definitions = {'intents': {}, 'entities': {}, 'synonyms': {}}
+
+    for chatl in data.values():
+        definitions = merge(definitions, chatl)
+
+    # Round trip to plain python objects so datasets could be sent to workers
+    definitions = json.loads(json.dumps(definitions))
+
+    def references(sentences: List[List[dict]], kind: str) -> set:
+        return {part['value'] for sentence in sentences for part in sentence
+                if part.get('type') == kind}
+
+    result = {}
+
+    for (module, chatl) in data.items():
+        sentences = [s for intent in chatl['intents'].values() for s in intent['data']]
+        entities = {e: definitions['entities'][e] for e in references(sentences, 'entity')
+                    if e in definitions['entities']}
+        synonyms = references(sentences, 'synonym') | references(
+            [e['data'] for e in entities.values()], 'synonym')
+
+        result[module] = dict(chatl, entities=entities, synonyms={
+            s: definitions['synonyms'][s] for s in synonyms if s in definitions['synonyms']})
+
+    return result
+
+
+def _fit_shard(factory: InterpreterFactory, lang: str, cache_directory: str,
+               data: dict) -> None:
+    # Run in a worker process by `ShardedInterpreter.fit`, the fitted engine is kept in
+    # the cache directory so the main process only has to load it
+    factory(lang, cache_directory).fit(data)
+
+
+class ShardedInterpreter(Interpreter):
+    """Two stages interpreter for large skill catalogs. Each skill gets its own
+    interpreter, fitted with its training data only, and a small router interpreter,
+    whose intents are the skills, picks the one which should parse a message.
+
+    Adding or updating a skill only fits its own interpreter and the router since
+    others are loaded from their cache directory.
+
+    """
+
+    def __init__(self, # pylint: disable=too-many-arguments
+                 lang: str,
+                 cache_directory: str = None,
+                 trainings_store: TrainingsStore = None,
+                 factory: InterpreterFactory = create_snips_interpreter,
+                 workers: int = None,
+                 router_variations: int = DEFAULT_ROUTER_VARIATIONS) -> None:
+        """Instantiates a new sharded interpreter.
+
+        Args:
+          lang (str): Language used for this interpreter (ie. en, fr, ...)
+          cache_directory (str): Optional directory where the router and each skill
+            interpreter get their own sub directory
+          trainings_store (TrainingsStore): Optional trainings store used when fitting
+          factory (callable): Creates the router and skill interpreters given the language
+            and their cache directory
+          workers (int): Number of processes used to fit skill interpreters, only used
+            with a cache directory from which fitted interpreters are loaded
+          router_variations (int): Number of utterances generated from each training
+            sentence to fit the router
+
+        """
+        super(ShardedInterpreter, self).__init__(
+            'sharded', lang, cache_directory, trainings_store)
+
+        self.workers = workers
+        self.router_variations = router_variations
+        self._factory = factory
+        self._model = _Model({}, {}, None)
+
+    @property
+    def shards(self) -> Dict[str, Interpreter]:
+        """Interpreter of each skill.
+        """
+        return self._model.shards
+
+    def _get_directory(self, *parts: str) -> str:
+        return os.path.join(self.cache_directory, *parts) if self.cache_directory else None
+
+    def get_training_data(self, skills: List[str] = None) -> Dict[str, dict]:
+        """Retrieve the chatl dataset of each skill from the training data registered
+        in the inner TrainingsStore.
+
+        Args:
+          skills (list of str): Optional list of skill names from which we should retrieve
+            training data.
+
+        Returns:
+          dict: Dictionary mapping each skill to its chatl dataset
+
+        """
+        data = {}
+
+        # Every skill is parsed, even filtered ones, since they may define entities
+        # used by others
+        for (module, training_dsl) in sorted(self._trainings.all(self.lang).items()):
+            if not training_dsl:
+                self._logger.warning('No training data found for "%s"', module)
+                continue
+
+            try:
+                # Round trip to plain python objects so datasets could be sent to workers
+                data[module] = json.loads(json.dumps(parse(training_dsl)))
+            except Exception as err: # pylint: disable=W0703
+                self._logger.error('Could not parse "%s" training data: "%s"', module, err)
+
+        return {m: d for (m, d) in share_definitions(data).items()
+                if not skills or m in skills}
+
+    def convert_training_data(self, data: dict) -> dict:
+        # Skills datasets are converted by their own interpreter when fitting
+        return data
+
+    def fit(self, data: Dict[str, dict]) -> None:
+        """Fit an interpreter for each skill and the router.
+
+        Args:
+          data (dict): Chatl dataset of each skill, as returned by `get_training_data`
+
+        """
+        super().fit(data)
+
+        shards = {}
+        converted = {}
+
+        for (module, chatl) in data.items():
+            shard = self._factory(self.lang, self._get_directory(
+                SHARDS_DIRNAME, get_shard_directory_name(module)))
+            shard_data = shard.convert_training_data(chatl)
+
+            if shard_data is not None:
+                (shards[module], converted[module]) = (shard, shard_data)
+
+        if self.workers and self.workers > 1 and self.cache_directory and len(shards) > 1:
+            self._logger.info('Fitting "%d" skills with "%d" workers', len(shards), self.workers)
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(_fit_shard, repeat(self._factory), repeat(self.lang),
+                                  [shards[m].cache_directory for m in shards],
+                                  [converted[m] for m in shards]))
+
+        for (module, shard) in shards.items():
+            self._logger.info('Fitting interpreter of skill "%s"', module)
+            shard.fit(converted[module])
+
+        router = None
+
+        # With only one skill, there is nothing to route
+        if len(shards) > 1:
+            self._logger.info('Fitting the router of "%d" skills', len(shards))
+            router = self._factory(self.lang, self._get_directory(ROUTER_DIRNAME))
+            router.fit(router.convert_training_data(build_router_data(
+                {m: data[m] for m in shards}, self.router_variations)))
+
+        owners: Dict[str, str] = {}
+
+        for (module, shard) in sorted(shards.items()):
+            for intent in shard.intents:
+                if intent in owners:
+                    # Only one skill could parse it, training data of the others is unused
+                    self._logger.warning(
+                        'Intent "%s" is defined by "%s" and "%s", only the first one will '\
+                        'parse it', intent, owners[intent], module)
+                    continue
+
+                owners[intent] = module
+
+        self._model = _Model(shards, owners, router)
+        self.intents = sorted(owners.keys())
+        self.version += 1
+
+    def parse(self, msg: str, scopes: List[str] = None) -> List[Intent]:
+        model = self._model
+        modules = sorted(model.shards.keys()) if scopes is None else \
+            sorted({model.owners[i] for i in scopes if i in model.owners})
+
+        if not modules:
+            return []
+
+        module = modules[0]
+
+        if len(modules) > 1:
+            routed = model.router.parse(msg, modules)
+
+            if not routed:
+                return []
+
+            module = routed[0].name
+
+        shard = model.shards[module]
+
+        return shard.parse(msg, [i for i in scopes if model.owners.get(i) == module] \
+            if scopes is not None else None)
+
+    def parse_slot(self, intent: str, slot: str, msg: str) -> List[SlotValue]:
+        model = self._model
+        module = model.owners.get(intent)
+
+        # Unknown intent, just returns the given value
+        if module is None:
+            return [SlotValue(msg)]
+
+        return model.shards[module].parse_slot(intent, slot, msg)
@@ -1,6 +1,137 @@
 """Define class to ease slot handling.
 """
 
+import logging
+from datetime import datetime
+from dateutil.parser import isoparse
+from dateutil.relativedelta import relativedelta, weekday
+
+# Relative fields are kept when not 0 and absolute ones when not None since 0 is a
+# meaningful absolute value (hour=0 is midnight)
+RELATIVEDELTA_RELATIVE_FIELDS = ['years', 'months', 'days', 'leapdays', 'hours', 'minutes',
+                                 'seconds', 'microseconds']
+RELATIVEDELTA_ABSOLUTE_FIELDS = ['year', 'month', 'day', 'hour', 'minute', 'second',
+                                 'microsecond']
+
+# Tags used to identify values which does not have a JSON representation
+DATETIME_TAG = '$datetime'
+RELATIVEDELTA_TAG = '$relativedelta'
+UNIT_TAG = '$unit'
+TUPLE_TAG = '$tuple'
+REPR_TAG = '$repr'
+
+
+def encode_value(value: object) -> object:
+    """Encode a slot value to a JSON compatible representation.
+
+    It handles every kind of value returned by interpreters: strings, numbers, datetimes,
+    tuples of datetimes, relativedeltas and UnitValues, and recursively lists and dicts.
+    Other values are encoded as their `repr` with a warning and will be decoded as this
+    string.
+
+    Args:
+      value (object): Value to encode
+
+    Returns:
+      object: JSON compatible representation of the value
+
+    Examples:
+      >>> encode_value(datetime(2019, 4, 2, 18, 30))
+      {'$datetime': '2019-04-02T18:30:00'}
+      >>> encode_value(relativedelta(hours=2, minutes=30))
+      {'$relativedelta': {'hours': 2, 'minutes': 30}}
+      >>> encode_value(relativedelta(hour=0, minute=0))
+      {'$relativedelta': {'hour': 0, 'minute': 0}}
+      >>> encode_value(UnitValue(20, '$'))
+      {'$unit': [20, '$']}
+
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+
+    if isinstance(value, datetime):
+        return {DATETIME_TAG: value.isoformat()}
+
+    if isinstance(value, relativedelta):
+        fields = {f: getattr(value, f) for f in RELATIVEDELTA_RELATIVE_FIELDS
+                  if getattr(value, f)}
+        fields.update({f: getattr(value, f) for f in RELATIVEDELTA_ABSOLUTE_FIELDS
+                       if getattr(value, f) is not None})
+
+        if value.weekday is not None:
+            fields['weekday'] = [value.weekday.weekday, value.weekday.n]
+
+        return {RELATIVEDELTA_TAG: fields}
+
+    if isinstance(value, UnitValue):
+        return {UNIT_TAG: [value.value, value.unit]}
+
+    if isinstance(value, tuple):
+        return {TUPLE_TAG: [encode_value(v) for v in value]}
+
+    if isinstance(value, list):
+        return [encode_value(v) for v in value]
+
+    if isinstance(value, dict):
+        return {k: encode_value(v) for (k, v) in value.items()}
+
+    logging.getLogger('slot').warning(
+        'Could not encode value of type "%s", its representation will be used instead',
+        type(value).__name__)
+
+    return {REPR_TAG: repr(value)}
+
+
+def decode_value(value: object) -> object:
+    """Decode a value encoded with `encode_value`.
+
+    Args:
+      value (object): Encoded value
+
+    Returns:
+      object: Decoded value
+
+    Examples:
+      >>> decode_value({'$datetime': '2019-04-02T18:30:00'})
+      datetime.datetime(2019, 4, 2, 18, 30)
+      >>> decode_value({'$relativedelta': {'hours': 2, 'minutes': 30}})
+      relativedelta(hours=+2, minutes=+30)
+      >>> str(decode_value({'$unit': [20, '$']}))
+      '20$'
+
+    """
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    if len(value) == 1:
+        (tag, data) = next(iter(value.items()))
+
+        if tag == DATETIME_TAG:
+            return isoparse(data)
+
+        if tag == RELATIVEDELTA_TAG:
+            data = dict(data)
+
+            if 'weekday' in data:
+                data['weekday'] = weekday(*data['weekday'])
+
+            return relativedelta(**data)
+
+        if tag == UNIT_TAG:
+            return UnitValue(*data)
+
+        if tag == TUPLE_TAG:
+            return tuple(decode_value(v) for v in data)
+
+        if tag == REPR_TAG:
+            return data
+
+    return {k: decode_value(v) for (k, v) in value.items()}
+
+
 class SlotValue: # pylint: disable=too-few-public-methods
     """Represents a single slot value.
 
@@ -18,6 +149,33 @@ class SlotValue: # pylint: disable=too-few-public-methods
 
         return str(self.value)
 
+    def to_dict(self) -> dict:
+        """Gets a JSON compatible representation of this slot value.
+
+        Returns:
+          dict: Representation which can be given to `from_dict`
+
+        """
+        data = {'value': encode_value(self.value)}
+
+        if self.meta:
+            data['meta'] = encode_value(self.meta)
+
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SlotValue':
+        """Instantiate a slot value from a representation returned by `to_dict`.
+
+        Args:
+          data (dict): Slot value representation
+
+        Returns:
+          SlotValue: Slot value instance
+
+        """
+        return cls(decode_value(data.get('value')), **decode_value(data.get('meta', {})))
+
 
 class SlotValues(list):
     """Represents a list of SlotValue.
@@ -1,9 +1,17 @@
 # pylint: disable=missing-module-docstring,fixme
 
+import json
+import multiprocessing
 import os
+import shutil
 import sys
 import subprocess
-from typing import List
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple
+from zipfile import ZipFile
 import importlib
 import pkg_resources
 from dateutil.relativedelta import relativedelta
@@ -13,13 +21,30 @@ from snips_nlu.resources import load_resources
 from snips_nlu.constants import ENTITIES, AUTOMATICALLY_EXTENSIBLE, RESOLVED_VALUE, \
     ENTITY_KIND, ENTITY, RES_VALUE, RES_RAW_VALUE, RES_INTENT, RES_INTENT_NAME, RES_SLOTS, \
     RES_SLOT_NAME
+from snips_nlu.dataset import validate_and_format_dataset
 from snips_nlu.entity_parser.builtin_entity_parser import is_builtin_entity
+from snips_nlu.intent_parser import ProbabilisticIntentParser
+from snips_nlu.slot_filler import SlotFiller
 import snips_nlu.default_configs as snips_confs
 from pytlas.understanding.intent import Intent
 from pytlas.understanding.training import TrainingsStore
 from pytlas.understanding.slot import SlotValue, UnitValue
-from pytlas.understanding.interpreter import Interpreter, compute_checksum
-from pytlas.ioutils import read_file, rmtree
+from pytlas.understanding.interpreter import Interpreter, compute_checksum, iter_parse_batch
+from pytlas.understanding.cache import EngineCache, DEFAULT_MAX_ENTRIES
+from pytlas.understanding.fastpath import ExactMatchIndex
+from pytlas.understanding.scopes import build_scopes, is_builtin, STATE_CANCEL
+
+# Sub directory of a cached engine where the engines of each context are persisted
+CONTEXTS_DIRNAME = 'contexts'
+
+# File of a cached engine listing the checksum of each intent it has been trained with
+MANIFEST_FILENAME = 'manifest.json'
+
+# Single file holding a whole engine when persisted in the compact format
+ENGINE_ARCHIVE_FILENAME = 'engine.zip'
+
+# Seed of engines random state so the same dataset always gives the same engine
+DEFAULT_RANDOM_STATE = 42
 
 
 def get_entity_value(data: dict) -> object:
@@ -65,40 +90,300 @@ def get_entity_value(data: dict) -> object:
     return data.get('value')
 
 
+def get_context_scopes(data: dict) -> Dict[str, List[str]]:
+    """Retrieve intents reachable from each context of a snips dataset, the same way
+    agents compute their scopes. The root context is left out.
+
+    Args:
+      data (dict): Snips dataset
+
+    Returns:
+      dict: Dictionary mapping each context to its scopes
+
+    Examples:
+      >>> get_context_scopes({'intents': {'lights_on': {}, 'lights_on/room': {}}})
+      {'lights_on': ['lights_on/room']}
+
+    """
+    intents = list(data.get('intents', {}).keys())
+    scopes = build_scopes([i for i in intents if not is_builtin(i)], STATE_CANCEL in intents)
+    del scopes[None]
+
+    return scopes
+
+
+def get_context_key(scopes: Iterable[str]) -> FrozenSet[str]:
+    """Retrieve the key of the context engine able to parse the given scopes. Builtin
+    intents are left out since agents always add `__cancel__` to their scopes, even
+    when the dataset does not define it.
+
+    Args:
+      scopes (list of str): Intents of the context
+
+    Returns:
+      frozenset: Key of the context engine
+
+    Examples:
+      >>> sorted(get_context_key(['lights_on/room', '__cancel__']))
+      ['lights_on/room']
+
+    """
+    return frozenset(s for s in scopes if not is_builtin(s))
+
+
+def get_context_dataset(data: dict, intents: List[str]) -> dict:
+    """Restrict a snips dataset to the given intents and the entities they use.
+
+    Args:
+      data (dict): Snips dataset
+      intents (list of str): Intents to keep
+
+    Returns:
+      dict: Restricted dataset
+
+    """
+    kept = {k: v for (k, v) in data.get('intents', {}).items() if k in intents}
+    used = {p['entity'] for i in kept.values() for u in i.get('utterances', [])
+            for p in u.get('data', []) if 'entity' in p}
+
+    return dict(data, intents=kept, entities={
+        k: v for (k, v) in data.get('entities', {}).items() if k in used})
+
+
+def compute_intent_checksums(data: dict) -> Dict[str, str]:
+    """Computes the checksum of each intent of a snips dataset, with the entities it
+    uses, to know which ones have changed between two datasets.
+
+    Args:
+      data (dict): Snips dataset
+
+    Returns:
+      dict: Dictionary mapping each intent to its checksum
+
+    """
+    return {i: compute_checksum(get_context_dataset(data, [i]))
+            for i in data.get('intents', {})}
+
+
+def persist_engine(engine: SnipsNLUEngine, path: str, compact: bool = False) -> None:
+    """Persists a snips engine in a directory which must not exist beforehand.
+
+    Args:
+      engine (SnipsNLUEngine): Fitted engine
+      path (str): Directory path
+      compact (bool): Writes the engine as a single archive instead of a tree of files
+
+    """
+    if not compact:
+        engine.persist(path)
+        return
+
+    os.makedirs(path)
+
+    with open(os.path.join(path, ENGINE_ARCHIVE_FILENAME), 'wb') as file:
+        file.write(engine.to_byte_array())
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def load_engine(path: str) -> SnipsNLUEngine:
+    """Loads a snips engine persisted with `persist_engine`, whatever its format. The
+    archive of a compact engine is read at once.
+
+    Args:
+      path (str): Directory path
+
+    Returns:
+      SnipsNLUEngine: Loaded engine
+
+    """
+    archive_path = os.path.join(path, ENGINE_ARCHIVE_FILENAME)
+
+    if not os.path.isfile(archive_path):
+        return SnipsNLUEngine.from_path(path)
+
+    with open(archive_path, 'rb') as file:
+        return SnipsNLUEngine.from_byte_array(file.read())
+
+
+@contextmanager
+def _engine_tree(path: str) -> Iterator[str]:
+    # Yields a directory holding the tree of files of a persisted engine, extracted from
+    # its archive in a temporary directory for compact ones
+    archive_path = os.path.join(path, ENGINE_ARCHIVE_FILENAME)
+
+    if not os.path.isfile(archive_path):
+        yield path
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        with ZipFile(archive_path) as archive:
+            roots = {name.split('/')[0] for name in archive.namelist()}
+
+            # Archives written by snips hold the engine tree in a single root directory
+            if len(roots) != 1:
+                raise ValueError('Engine archive "%s" should contain a single root directory, '\
+                    'found %d entries' % (archive_path, len(roots)))
+
+            archive.extractall(directory)
+
+        yield os.path.join(directory, roots.pop())
+
+
+def _fit_engine(lang: str, data: dict, cache_directory: str, cache_max_entries: int,
+                cache_max_size: int, fast_path: bool, context_engines: bool,
+                warm_start: bool, random_state: int, compact: bool) -> bytes:
+    # Run in a worker process by `SnipsInterpreter.fit_in_background`
+    interpreter = SnipsInterpreter(lang, cache_directory, cache_max_entries=cache_max_entries,
+                                   cache_max_size=cache_max_size, fast_path=fast_path,
+                                   context_engines=context_engines, warm_start=warm_start,
+                                   random_state=random_state, compact=compact)
+    interpreter.fit(data)
+
+    return interpreter._engine.to_byte_array() # pylint: disable=protected-access
+
+
+_batch_interpreter = None # pylint: disable=invalid-name
+
+
+def _init_batch_worker(lang: str, engine: bytes, fast_path: ExactMatchIndex,
+                       context_engines: List[Tuple[List[str], bytes]]) -> None:
+    # Run once in each worker process of `SnipsInterpreter.parse_batch` to parse
+    # messages exactly like the interpreter which started it
+    global _batch_interpreter # pylint: disable=global-statement,invalid-name
+    _batch_interpreter = SnipsInterpreter(lang, fast_path=fast_path is not None)
+    _batch_interpreter._use_engine( # pylint: disable=protected-access
+        SnipsNLUEngine.from_byte_array(engine), fast_path,
+        {get_context_key(s): SnipsNLUEngine.from_byte_array(e) for (s, e) in context_engines})
+
+
+def _parse_in_worker(msg: str, scopes: List[str]) -> List[dict]:
+    return [i.to_dict() for i in _batch_interpreter.parse(msg, scopes)]
+
+
 class SnipsInterpreter(Interpreter):
     """Wraps the snips-nlu stuff to provide valuable informations to an agent.
     """
 
-    def __init__(self,
+    def __init__(self, # pylint: disable=too-many-arguments
                  lang: str,
                  cache_directory: str = None,
-                 trainings_store: TrainingsStore = None) -> None:
+                 trainings_store: TrainingsStore = None,
+                 cache_max_entries: int = DEFAULT_MAX_ENTRIES,
+                 cache_max_size: int = None,
+                 fast_path: bool = False,
+                 context_engines: bool = False,
+                 warm_start: bool = True,
+                 random_state: int = DEFAULT_RANDOM_STATE,
+                 compact: bool = False) -> None:
         """Instantiates a new Snips interpreter.
 
         Args:
           lang (str): Language used for this interpreter (ie. en, fr, ...)
-          cache_directory (str): Path where training and trained files are placed
+          cache_directory (str): Path where trained engines are placed, one per dataset
           trainings_store (TrainingsStore): Optional trainings store used when fitting the engine
+          cache_max_entries (int): Maximum number of trained engines kept in the cache
+          cache_max_size (int): Maximum size in bytes of trained engines kept in the cache
+          fast_path (bool): Answers messages which are literally a training utterance from
+            an index instead of running the engine
+          context_engines (bool): Fits a dedicated engine for each context so parsing
+            messages in a context only scores intents reachable from it
+          warm_start (bool): Reuses slot fillers of intents which have not changed since
+            a cached engine has been trained instead of fitting them again
+          random_state (int): Seed used when fitting engines so a dataset always gives the
+            same engine, None for a random one
+          compact (bool): Persists engines as a single archive, read at once when loading
 
         """
         super(SnipsInterpreter, self).__init__(
             'snips', lang, cache_directory, trainings_store)
 
+        self.cache = EngineCache(cache_directory, cache_max_entries, cache_max_size) \
+            if cache_directory else None
         self._engine = None
-        self._slot_mappings = {}
-        self._entities = {}
+        self._use_fast_path = fast_path
+        self.fast_path: ExactMatchIndex = None
+        self.fast_path_hits = 0
+        self.fast_path_misses = 0
+        self._use_context_engines = context_engines
+        self._context_engines: Dict[FrozenSet[str], SnipsNLUEngine] = {}
+        self._warm_start = warm_start
+        self.random_state = random_state
+        self._compact = compact
+
+    @property
+    def fast_path_hit_rate(self) -> float:
+        """Returns the ratio of parsed messages answered by the fast path index.
+
+        Returns:
+          float: Hit rate between 0 and 1
+
+        """
+        total = self.fast_path_hits + self.fast_path_misses
+
+        return self.fast_path_hits / total if total else 0.0
+
+    def _use_engine(self, engine: SnipsNLUEngine, fast_path: ExactMatchIndex = None,
+                    context_engines: Dict[FrozenSet[str], SnipsNLUEngine] = None) -> None:
+        # The engine is replaced with a single assignment and everything else is read
+        # from it so parsing could go on while a new engine is being swapped in
+        self.intents = list(engine.dataset_metadata.get('slot_name_mappings', {}).keys())
+
+        if self._use_fast_path:
+            self.fast_path = fast_path or ExactMatchIndex()
+            self._logger.info('Fast path index contains "%d" utterances', len(self.fast_path))
+
+        self._context_engines = context_engines or {}
+        self._engine = engine
+        self.version += 1
 
-    def _configure(self) -> None:
-        self._slot_mappings = self._engine.dataset_metadata.get(
-            'slot_name_mappings', {})
-        self._entities = self._engine.dataset_metadata.get(ENTITIES, {})
+    def load_from_cache(self, path: str = None) -> None: # pylint: disable=arguments-differ
+        """Loads a trained engine.
 
-        self.intents = list(self._slot_mappings.keys())
+        Args:
+          path (str): Path of the engine to load, default to the most recently used
+            engine of the cache or to the cache directory itself if it holds an engine
+            persisted without checksum sub directories
+
+        """
+        if not path:
+            entries = self.cache.entries() if self.cache else []
+            path = entries[0].path if entries else self.cache_directory
+
+            if entries:
+                self.cache.touch(entries[0].checksum)
+
+        self._load_engine(path)
+
+    def _load_engine(self, path: str, fast_path: ExactMatchIndex = None,
+                     data: dict = None) -> None:
+        self._logger.info('Loading engine from "%s"', path)
+        engine = load_engine(path)
+
+        if self._use_fast_path and fast_path is None:
+            fast_path = ExactMatchIndex.load(path)
+
+        context_engines = self._get_context_engines(data, path) \
+            if self._use_context_engines else None
+
+        self._use_engine(engine, fast_path, context_engines)
 
-    def load_from_cache(self) -> None:
-        self._logger.info('Loading engine from "%s"', self.cache_directory)
-        self._engine = SnipsNLUEngine.from_path(self.cache_directory)
-        self._configure()
+    def _load_cached_engine(self, checksum: str, fast_path: ExactMatchIndex = None,
+                            data: dict = None) -> bool:
+        if not self.cache or not self.cache.has(checksum):
+            self._logger.debug('No cached engine found for checksum "%s"', checksum)
+            return False
+
+        try:
+            self._load_engine(self.cache.path(checksum), fast_path, data)
+        except Exception as err: # pylint: disable=broad-except
+            self._logger.warning('Could not load cached engine "%s": %s', checksum, err)
+            self.cache.remove(checksum)
+            return False
+
+        self.cache.touch(checksum)
+
+        return True
 
     def _check_and_install_resources_package(self) -> None:
         resource_pkg_name = f'snips_nlu_{self.lang}'
@@ -123,6 +408,166 @@ class SnipsInterpreter(Interpreter):
 
         return resource_pkg_name
 
+    def _find_warm_start(self, checksums: Dict[str, str]) -> Tuple[str, Set[str]]:
+        # Look for the cached engine sharing the most unchanged intents with the dataset
+        (path, reusable) = (None, set())
+
+        if not self.cache or not self._warm_start:
+            return (path, reusable)
+
+        for entry in self.cache.entries():
+            try:
+                with open(os.path.join(entry.path, MANIFEST_FILENAME), encoding='utf-8') as file:
+                    manifest = json.load(file)
+            except (OSError, ValueError):
+                continue
+
+            # Persisted slot fillers may not be compatible with this snips version
+            if manifest.get('version') != __version__:
+                continue
+
+            unchanged = {i for (i, c) in manifest.get('intents', {}).items()
+                         if checksums.get(i) == c}
+
+            if len(unchanged) > len(reusable):
+                (path, reusable) = (entry.path, unchanged)
+
+        return (path, reusable)
+
+    def _reuse_slot_fillers(self, engine: SnipsNLUEngine, data: dict, path: str,
+                            intents: Set[str]) -> None:
+        parser_config = next((c for c in engine.config.intent_parsers_configs
+                              if c.unit_name == ProbabilisticIntentParser.unit_name), None)
+        parser_path = os.path.join(path, ProbabilisticIntentParser.unit_name)
+
+        if parser_config is None or not os.path.isdir(parser_path):
+            return
+
+        self._logger.info('Reusing slot fillers of "%d" unchanged intents from "%s"',
+                          len(intents), path)
+
+        # Entity parsers are built ahead so reused slot fillers share the new ones
+        engine.fit_builtin_entity_parser_if_needed(data)
+        engine.fit_custom_entity_parser_if_needed(data)
+
+        shared = {
+            'builtin_entity_parser': engine.builtin_entity_parser,
+            'custom_entity_parser': engine.custom_entity_parser,
+            'resources': engine.resources,
+        }
+
+        with open(os.path.join(parser_path, 'intent_parser.json'), encoding='utf-8') as file:
+            model = json.load(file)
+
+        parser = ProbabilisticIntentParser(parser_config, random_state=engine.random_state,
+                                           **shared)
+        parser.slot_fillers = {
+            s['intent']: SlotFiller.load_from_path(
+                os.path.join(parser_path, s['slot_filler_name']),
+                parser_config.slot_filler_config.unit_name, **shared)
+            for s in model.get('slot_fillers', []) if s['intent'] in intents
+        }
+
+        # Other intent parsers are not recycled and the intent classifier is fitted
+        # again since it depends on every intents
+        engine.intent_parsers = [parser]
+
+    def _train_engine(self, data: dict, warm_start_path: str = None,
+                      reusable: Set[str] = None) -> SnipsNLUEngine:
+        config = None
+
+        try:
+            self._logger.info(
+                'Importing default configuration for language "%s"', self.lang)
+            config = getattr(snips_confs, 'CONFIG_%s' % self.lang.upper())
+        except AttributeError:
+            self._logger.warning(
+                'Could not import default configuration, it will use the generic one instead')
+
+        resource_pkg_name = self._check_and_install_resources_package()
+
+        engine = SnipsNLUEngine(config, resources=load_resources(resource_pkg_name),
+                                random_state=self.random_state)
+
+        if reusable:
+            data = validate_and_format_dataset(data)
+
+            try:
+                with _engine_tree(warm_start_path) as path:
+                    self._reuse_slot_fillers(engine, data, path, reusable)
+            except Exception as err: # pylint: disable=broad-except
+                self._logger.warning('Could not reuse slot fillers from "%s": %s',
+                                     warm_start_path, err)
+                engine = SnipsNLUEngine(config, resources=engine.resources,
+                                        random_state=self.random_state)
+
+        engine.fit(data, force_retrain=False)
+
+        return engine
+
+    def _get_context_engines(self, data: dict = None,
+                             directory: str = None) -> Dict[FrozenSet[str], SnipsNLUEngine]:
+        # Retrieve the engine of each context, keyed by the intents it could parse. They
+        # are persisted in the directory of the main engine, named after the checksum of
+        # their own dataset, and trained when missing. Without data, every engine persisted
+        # in the directory is loaded.
+        contexts_directory = os.path.join(directory, CONTEXTS_DIRNAME) if directory else None
+        engines = {}
+
+        if data is None:
+            if contexts_directory and os.path.isdir(contexts_directory):
+                for name in os.listdir(contexts_directory):
+                    if name.startswith('.'):
+                        continue
+
+                    engine = load_engine(os.path.join(contexts_directory, name))
+                    engines[get_context_key(engine.dataset_metadata.get(
+                        'slot_name_mappings', {}).keys())] = engine
+
+            return engines
+
+        for (context, intents) in get_context_scopes(data).items():
+            context_data = get_context_dataset(data, intents)
+            path = os.path.join(contexts_directory, compute_checksum(context_data)) \
+                if contexts_directory else None
+            engine = None
+
+            if path and os.path.isdir(path):
+                try:
+                    engine = load_engine(path)
+                except Exception as err: # pylint: disable=broad-except
+                    self._logger.warning('Could not load engine of context "%s": %s',
+                                         context, err)
+                    shutil.rmtree(path, ignore_errors=True)
+
+            if engine is None:
+                self._logger.info('Fitting engine of context "%s" with "%d" intents',
+                                  context, len(intents))
+                engine = self._train_engine(context_data)
+
+                if path:
+                    self._persist_context_engine(engine, path)
+
+            engines[get_context_key(intents)] = engine
+
+        return engines
+
+    def _persist_context_engine(self, engine: SnipsNLUEngine, path: str) -> None:
+        # Persisted aside and then moved in place, if another process has already
+        # persisted the same engine, its own is kept
+        tmp_path = os.path.join(os.path.dirname(path), '.%s.%d' % (
+            os.path.basename(path), os.getpid()))
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        persist_engine(engine, tmp_path, self._compact)
+
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            self._logger.debug('Context engine "%s" already persisted', path)
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
     def fit(self, data: dict) -> None:
         super().fit(data)
 
@@ -137,50 +582,107 @@ class SnipsInterpreter(Interpreter):
         self._logger.info('Fitting using "snips v%s"', __version__)
 
         checksum = compute_checksum(data)
-        cached_checksum = None
-
-        # Try to load the used checksum
-        if self.cache_directory:
-            cached_checksum_path = os.path.join(
-                self.cache_directory, 'trained.checksum')
-            cached_checksum = read_file(
-                cached_checksum_path, ignore_errors=True)
+        fast_path = ExactMatchIndex.from_dataset(data) if self._use_fast_path else None
 
-        if not cached_checksum:
-            self._logger.debug('Checksum file not found')
+        if self._load_cached_engine(checksum, fast_path, data):
+            return
 
-        if checksum == cached_checksum:
-            self.load_from_cache()
+        if self.cache:
+            # Processes sharing the cache directory wait for the one training the same
+            # dataset and then load its engine instead of training it concurrently
+            with self.cache.lock(checksum):
+                if not self._load_cached_engine(checksum, fast_path, data):
+                    self._train_and_store(data, checksum, fast_path)
         else:
-            config = None
+            self._train_and_store(data, checksum, fast_path)
 
-            try:
-                self._logger.info(
-                    'Importing default configuration for language "%s"', self.lang)
-                config = getattr(snips_confs, 'CONFIG_%s' % self.lang.upper())
-            except AttributeError:
-                self._logger.warning(
-                    'Could not import default configuration, it will use the generic one instead')
+    def _train_and_store(self, data: dict, checksum: str, fast_path: ExactMatchIndex) -> None:
+        checksums = compute_intent_checksums(data)
+        engine = self._train_engine(data, *self._find_warm_start(checksums))
+        context_engines = None
 
-            resource_pkg_name = self._check_and_install_resources_package()
+        if self.cache:  # pragma: no cover
+            def persist(path: str) -> None:
+                nonlocal context_engines
 
-            self._engine = SnipsNLUEngine(
-                config, resources=load_resources(resource_pkg_name))
-            self._engine.fit(data)
+                persist_engine(engine, path, self._compact)
 
-            if self.cache_directory:  # pragma: no cover
-                self._logger.info(
-                    'Persisting trained engine to "%s"', self.cache_directory)
+                with open(os.path.join(path, MANIFEST_FILENAME), 'w', encoding='utf-8') as file:
+                    json.dump({'version': __version__, 'intents': checksums}, file)
+
+                if fast_path is not None:
+                    fast_path.save(path)
+
+                # Context engines are trained right into the cache entry being stored
+                if self._use_context_engines:
+                    context_engines = self._get_context_engines(data, path)
 
-                # Make sure the cache directory has been cleaned out
-                rmtree(self.cache_directory, ignore_errors=True)
+            self.cache.store(checksum, persist)
+        elif self._use_context_engines:
+            context_engines = self._get_context_engines(data)
 
-                self._engine.persist(self.cache_directory)
+        self._use_engine(engine, fast_path, context_engines)
 
-                with open(cached_checksum_path, mode='w') as file:
-                    file.write(checksum)
+    def fit_in_background(self, data: dict = None, executor: Executor = None) -> Future:
+        """Fit a new engine in another process while the current one keeps parsing
+        messages, and swap it in once it's ready.
 
-            self._configure()
+        Agents using this interpreter will rebuild their state machine the next time
+        they parse a message while being asleep.
+
+        Args:
+          data (dict): Training data, default to the one registered in the trainings store
+          executor (Executor): Optional executor used to fit the engine, default to a new
+            process pool with a single worker
+
+        Returns:
+          Future: Resolved with this interpreter once the new engine is in use
+
+        """
+        if data is None:
+            data = self.get_training_data()
+
+        own_executor = executor is None
+        executor = executor or ProcessPoolExecutor(max_workers=1)
+        swapped = Future()
+
+        def on_fitted(fitted: Future) -> None:
+            try:
+                engine = SnipsNLUEngine.from_byte_array(fitted.result())
+                context_engines = None
+
+                # Context engines have been persisted by the worker when using a cache
+                if self._use_context_engines:
+                    checksum = compute_checksum(data)
+                    context_engines = self._get_context_engines(
+                        data, self.cache.path(checksum) \
+                            if self.cache and self.cache.has(checksum) else None)
+
+                self._use_engine(engine,
+                                 ExactMatchIndex.from_dataset(data) if self._use_fast_path \
+                                     else None,
+                                 context_engines)
+                self._logger.info('New engine is in use with "%d" intents', len(self.intents))
+                swapped.set_result(self)
+            except Exception as err: # pylint: disable=broad-except
+                self._logger.error('Background fit failed, keeping the current engine: %s', err)
+                swapped.set_exception(err)
+            finally:
+                if own_executor:
+                    executor.shutdown(wait=False)
+
+        self._logger.info('Fitting a new engine in the background')
+
+        executor.submit(_fit_engine, self.lang, data, self.cache_directory,
+                        self.cache.max_entries if self.cache else None,
+                        self.cache.max_size if self.cache else None,
+                        self._use_fast_path,
+                        self._use_context_engines,
+                        self._warm_start,
+                        self.random_state,
+                        self._compact).add_done_callback(on_fitted)
+
+        return swapped
 
     @property
     def is_ready(self) -> bool:
@@ -196,9 +698,27 @@ class SnipsInterpreter(Interpreter):
         if not self.is_ready:
             return []
 
+        fast_path = self.fast_path
+
+        if fast_path is not None:
+            intents = fast_path.lookup(msg, scopes)
+
+            if intents is not None:
+                self.fast_path_hits += 1
+                return intents
+
+            self.fast_path_misses += 1
+
         # TODO manage multiple intents in the same sentence
 
-        parsed = self._engine.parse(msg, intents=scopes)
+        context_engine = self._context_engines.get(get_context_key(scopes)) \
+            if scopes and self._context_engines else None
+        parsed = context_engine.parse(msg) if context_engine else None
+
+        # A builtin intent of the context engine may not have been asked for
+        if not parsed or (parsed[RES_INTENT][RES_INTENT_NAME] and \
+                parsed[RES_INTENT][RES_INTENT_NAME] not in scopes):
+            parsed = self._engine.parse(msg, intents=scopes)
 
         if not parsed[RES_INTENT][RES_INTENT_NAME]:
             return []
@@ -219,6 +739,31 @@ class SnipsInterpreter(Interpreter):
             Intent(parsed[RES_INTENT][RES_INTENT_NAME], **slots),
         ]
 
+    def parse_batch(self, messages: Iterable[str], scopes: List[str] = None,
+                    workers: int = None) -> Iterator[Tuple[str, List[Intent]]]:
+        if not workers or workers < 2 or not self.is_ready:
+            return super().parse_batch(messages, scopes)
+
+        return self._parse_batch_in_processes(messages, scopes, workers)
+
+    def _parse_batch_in_processes(self, messages: Iterable[str], scopes: List[str],
+                                  workers: int) -> Iterator[Tuple[str, List[Intent]]]:
+        # Each worker process holds its own copy of the engines and of the fast path index.
+        # A multiprocessing pool is used since executors only accept an initializer from
+        # python 3.7
+        initargs = (self.lang, self._engine.to_byte_array(), self.fast_path,
+                    [(sorted(s), e.to_byte_array()) for (s, e) in self._context_engines.items()])
+
+        with multiprocessing.Pool(workers, initializer=_init_batch_worker,
+                                  initargs=initargs) as pool:
+            def parse_many(chunk: List[str]) -> List[List[Intent]]:
+                results = pool.starmap(_parse_in_worker, zip(chunk, repeat(scopes)),
+                                       chunksize=max(1, len(chunk) // (workers * 4)))
+
+                return [[Intent.from_dict(d) for d in r] for r in results]
+
+            yield from iter_parse_batch(messages, parse_many)
+
     def parse_slot(self, intent: str, slot: str, msg: str) -> List[SlotValue]:
         if not self.is_ready:
             return []
@@ -230,7 +775,9 @@ class SnipsInterpreter(Interpreter):
         # for when it becomes relevant. For now get_slots returns less results than this
         # homemade method below.
 
-        entity_label = self._slot_mappings.get(intent, {}).get(slot)
+        engine = self._engine
+        entity_label = engine.dataset_metadata.get(
+            'slot_name_mappings', {}).get(intent, {}).get(slot)
 
         # No label, just returns the given value
         if not entity_label:
@@ -240,7 +787,7 @@ class SnipsInterpreter(Interpreter):
 
         # If it's a builtin entity, try to parse it
         if is_builtin_entity(entity_label):
-            parsed = self._engine.builtin_entity_parser.parse(
+            parsed = engine.builtin_entity_parser.parse(
                 msg, [entity_label])
 
             for slot_data in parsed:
@@ -256,11 +803,12 @@ class SnipsInterpreter(Interpreter):
                 result.append(SlotValue(get_entity_value(
                     slot_data[RES_VALUE]), **slot_data))
         else:
-            parsed = self._engine.custom_entity_parser.parse(
+            parsed = engine.custom_entity_parser.parse(
                 msg, [entity_label])
+            entities = engine.dataset_metadata.get(ENTITIES, {})
 
             # The custom parser did not found a match and it's extensible? Just returns the value
-            if not parsed and self._entities.get(entity_label, {})[AUTOMATICALLY_EXTENSIBLE]:
+            if not parsed and entities.get(entity_label, {})[AUTOMATICALLY_EXTENSIBLE]:
                 return [SlotValue(msg)]
 
             for slot_data in parsed:
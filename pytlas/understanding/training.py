@@ -1,6 +1,6 @@
 # pylint: disable=missing-module-docstring
 
-from typing import Dict, Callable
+from typing import Dict, Callable, List, Tuple
 from pytlas.pkgutils import get_caller_package_name
 from pytlas.datautils import should_load_resources
 from pytlas.store import Store
@@ -75,6 +75,69 @@ class TrainingsStore(Store):
 GLOBAL_TRAININGS = TrainingsStore()
 
 
+def _pick_value(data: dict, item: dict, index: int) -> str:
+    # Retrieve the text to use for a sentence part, choices are picked in a round robin
+    # fashion so generated utterances are deterministic
+    if item['type'] == 'entity':
+        entity = data.get('entities', {}).get(item['value'], {})
+        choices = entity.get('variants', {}).get(item.get('variant')) or entity.get('data')
+    elif item['type'] == 'synonym':
+        choices = data.get('synonyms', {}).get(item['value'], {}).get('data')
+    else:
+        return item['value']
+
+    if not choices:
+        return item['value']
+
+    choice = choices[index % len(choices)]
+
+    # Entity values may reference a synonym, in this case, use its name
+    return choice['value']
+
+
+def generate_annotated_examples(data: dict,
+                                variations: int = 1) -> List[Tuple[str, str, List[Tuple[str, str]]]]:
+    """Generate utterances from a chatl dataset by replacing entities and synonyms
+    with their values and keep track of slots values.
+
+    Args:
+      data (dict): Chatl dataset as returned by `pychatl.parse`
+      variations (int): Number of utterances to generate for each training sentence
+
+    Returns:
+      list of (str, str, list of (str, str)): Generated utterances with their intent
+      name and the name and raw value of each slot
+
+    """
+    examples = []
+
+    for (intent, intent_data) in data.get('intents', {}).items():
+        for (sentence_index, sentence) in enumerate(intent_data.get('data', [])):
+            for variation in range(variations):
+                parts = [_pick_value(data, item, sentence_index + variation)
+                         for item in sentence]
+                slots = [(item['value'], part) for (item, part) in zip(sentence, parts)
+                         if item['type'] == 'entity']
+                examples.append((''.join(parts).strip(), intent, slots))
+
+    return examples
+
+
+def generate_examples(data: dict, variations: int = 1) -> List[Tuple[str, str]]:
+    """Generate utterances from a chatl dataset by replacing entities and synonyms
+    with their values.
+
+    Args:
+      data (dict): Chatl dataset as returned by `pychatl.parse`
+      variations (int): Number of utterances to generate for each training sentence
+
+    Returns:
+      list of (str, str): Generated utterances with their intent name
+
+    """
+    return [(text, intent) for (text, intent, _) in generate_annotated_examples(data, variations)]
+
+
 def training(lang: str, store: TrainingsStore = None, package: str = None) -> None:
     """Decorator applied to a function that returns DSL data to register training data.
 
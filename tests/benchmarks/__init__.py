@@ -0,0 +1,9 @@
+"""Benchmarks for pytlas hot paths. They are not run by the test suite, run them
+with `python -m tests.benchmarks.<name>` from the repository root.
+
+`bench_hot_paths` can save its results as a JSON baseline and compare a later run
+against it to flag regressions, for example before and after a dependency upgrade:
+
+    python -m tests.benchmarks.bench_hot_paths --save baseline.json
+    python -m tests.benchmarks.bench_hot_paths --compare baseline.json --threshold 10
+"""
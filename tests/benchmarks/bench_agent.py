@@ -0,0 +1,162 @@
+"""Compares agent creation time and memory when each agent compiles its own state
+machine and when the compiled machine is shared by every agent, the turn
+overhead of the transitions and table driven state machines and the cost of
+snapshotting and restoring a pending conversation.
+
+Each creation measure runs in a fresh process so the resident set size is not
+polluted by previous runs.
+
+Usage: python -m tests.benchmarks.bench_agent [agents count]
+"""
+
+import resource
+import sys
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from pytlas.conversing import Agent
+from pytlas.conversing.agent import STATE_CANCEL
+from pytlas.handling import HandlersStore, TranslationsStore
+from pytlas.handling.hooks import HooksStore
+from pytlas.understanding import Interpreter, Intent, UnitValue
+
+INTENTS_COUNTS = [10, 100, 1000]
+DEFAULT_AGENTS_COUNT = 1000
+TURNS_COUNT = 5000
+
+
+def create_interpreter(intents_count: int) -> Interpreter:
+    """Creates a stub interpreter exposing the given number of intents, a tenth of them
+    being nested in a context.
+    """
+    interpreter = Interpreter('bench', 'en')
+    interpreter.intents = [STATE_CANCEL] + [
+        'context_%d/intent_%d' % (i % 5, i) if i % 10 == 0 else 'intent_%d' % i
+        for i in range(intents_count)]
+
+    return interpreter
+
+
+def measure(intents_count: int, agents_count: int, share_machine: bool) -> dict:
+    """Creates the given number of agents and returns the elapsed time and the resident
+    set size growth per agent.
+    """
+    interpreter = create_interpreter(intents_count)
+    stores = {
+        'handlers_store': HandlersStore(),
+        'hooks_store': HooksStore(),
+        'translations_store': TranslationsStore(),
+    }
+
+    # Create a first agent so the shared machine compilation is not accounted per agent
+    agents = [Agent(interpreter, share_machine=share_machine, **stores)]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    for _ in range(agents_count):
+        agents.append(Agent(interpreter, share_machine=share_machine, **stores))
+
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        'creation_ms': elapsed * 1000 / agents_count,
+        # ru_maxrss is expressed in kilobytes on Linux
+        'rss_kb': (rss_after - rss_before) / agents_count,
+    }
+
+
+def measure_turns(intents_count: int, turns_count: int, fast_dispatch: bool) -> float:
+    """Parses messages with a stub interpreter and returns the mean duration of a turn
+    in microseconds.
+    """
+    interpreter = create_interpreter(intents_count)
+    intent = Intent('intent_1', text='a value')
+    interpreter.parse = lambda msg, scopes: [intent]
+
+    handlers = HandlersStore({
+        'intent_1': lambda r: r.agent.done(),
+    })
+    agent = Agent(interpreter, handlers_store=handlers, hooks_store=HooksStore(),
+                  translations_store=TranslationsStore(), fast_dispatch=fast_dispatch)
+
+    start = time.perf_counter()
+
+    for _ in range(turns_count):
+        agent.parse('a message')
+
+    return (time.perf_counter() - start) * 1000000 / turns_count
+
+
+def measure_snapshots(intents_count: int, count: int) -> dict:
+    """Snapshots and restores an agent waiting for a slot value and returns the mean
+    durations in microseconds and the snapshot size in bytes.
+    """
+    interpreter = create_interpreter(intents_count)
+    interpreter.parse = lambda msg, scopes: [Intent(
+        'intent_1', date=(datetime(2019, 4, 2, 18), datetime(2019, 4, 2, 20)),
+        amount=UnitValue(20, '$'))]
+
+    handlers = HandlersStore({
+        'intent_1': lambda r: r.agent.ask('city', 'Where?'),
+    })
+    stores = {
+        'handlers_store': handlers,
+        'hooks_store': HooksStore(),
+        'translations_store': TranslationsStore(),
+    }
+    agent = Agent(interpreter, **stores)
+    agent.parse('a message')
+    other = Agent(interpreter, **stores)
+
+    start = time.perf_counter()
+
+    for _ in range(count):
+        snapshot = agent.snapshot()
+
+    snapshot_us = (time.perf_counter() - start) * 1000000 / count
+    start = time.perf_counter()
+
+    for _ in range(count):
+        other.restore(snapshot)
+
+    return {
+        'snapshot_us': snapshot_us,
+        'restore_us': (time.perf_counter() - start) * 1000000 / count,
+        'size': len(snapshot),
+    }
+
+
+def main(agents_count: int) -> None: # pylint: disable=missing-function-docstring
+    print('%8s  %-10s  %14s  %14s' % ('intents', 'machine', 'creation (ms)', 'rss/agent (kB)'))
+
+    for intents_count in INTENTS_COUNTS:
+        for share_machine in (False, True):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(
+                    measure, intents_count, agents_count, share_machine).result()
+
+            print('%8d  %-10s  %14.3f  %14.1f' % (
+                intents_count, 'shared' if share_machine else 'dedicated',
+                result['creation_ms'], result['rss_kb']))
+
+    print()
+    print('%8s  %-12s  %10s' % ('intents', 'dispatch', 'turn (us)'))
+
+    for intents_count in INTENTS_COUNTS:
+        for fast_dispatch in (False, True):
+            print('%8d  %-12s  %10.1f' % (
+                intents_count, 'table' if fast_dispatch else 'transitions',
+                measure_turns(intents_count, TURNS_COUNT, fast_dispatch)))
+
+    print()
+    print('%8s  %14s  %12s  %10s' % ('intents', 'snapshot (us)', 'restore (us)', 'size (B)'))
+
+    for intents_count in INTENTS_COUNTS:
+        result = measure_snapshots(intents_count, TURNS_COUNT)
+        print('%8d  %14.1f  %12.1f  %10d' % (
+            intents_count, result['snapshot_us'], result['restore_us'], result['size']))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_AGENTS_COUNT)
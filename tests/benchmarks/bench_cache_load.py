@@ -0,0 +1,92 @@
+"""Compares the time taken by `SnipsInterpreter.load_from_cache` to load an engine
+persisted as a tree of files and as a single archive (`compact=True`), with a warm
+page cache and with a cold one.
+
+The page cache is dropped by advising the kernel that files of the engine are not
+needed anymore, so cold measures are only available on systems supporting
+`posix_fadvise`.
+
+Usage: python -m tests.benchmarks.bench_cache_load [skills directory]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pytlas.handling.importers import import_skills
+from pytlas.understanding.cache import get_directory_size
+
+DEFAULT_SKILLS_DIRECTORY = os.path.join(os.path.dirname(__file__), '../../example/skills')
+REPEAT = 5
+
+
+def drop_page_cache(path: str) -> bool:
+    """Evicts every files of a directory from the page cache.
+
+    Returns:
+      bool: False if it's not supported on this system
+
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+
+    os.sync()
+
+    for (root, _, files) in os.walk(path):
+        for name in files:
+            fd = os.open(os.path.join(root, name), os.O_RDONLY) # pylint: disable=invalid-name
+
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+    return True
+
+
+def measure_load(path: str, cold: bool) -> float:
+    """Loads the engine persisted at the given path and returns the median load time
+    in milliseconds, None if cold measures are not supported.
+    """
+    from pytlas.understanding.snips import SnipsInterpreter # pylint: disable=import-outside-toplevel
+
+    durations = []
+
+    for _ in range(REPEAT):
+        if cold and not drop_page_cache(path):
+            return None
+
+        interpreter = SnipsInterpreter('en')
+        start = time.perf_counter()
+        interpreter.load_from_cache(path)
+        durations.append(time.perf_counter() - start)
+
+    return sorted(durations)[len(durations) // 2] * 1000
+
+
+def main(skills_directory: str) -> None: # pylint: disable=missing-function-docstring
+    from pytlas.understanding.snips import SnipsInterpreter # pylint: disable=import-outside-toplevel
+
+    import_skills(skills_directory)
+
+    print('%-8s  %6s  %12s  %10s  %10s' % ('format', 'files', 'size (kB)', 'warm (ms)',
+                                           'cold (ms)'))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for (name, compact) in (('tree', False), ('compact', True)):
+            interpreter = SnipsInterpreter('en', os.path.join(directory, name),
+                                           compact=compact)
+            interpreter.fit_from_skill_data()
+            path = interpreter.cache.entries()[0].path
+
+            files = sum(len(f) for (_, _, f) in os.walk(path))
+            warm = measure_load(path, False)
+            cold = measure_load(path, True)
+
+            print('%-8s  %6d  %12.1f  %10.1f  %10s' % (
+                name, files, get_directory_size(path) / 1024, warm,
+                '%.1f' % cold if cold is not None else 'n/a'))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SKILLS_DIRECTORY)
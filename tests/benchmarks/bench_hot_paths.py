@@ -0,0 +1,146 @@
+"""Microbenchmarks of the functions on the pytlas hot path.
+
+Results can be saved as a JSON baseline and later runs compared against it, any
+benchmark slower than the baseline by more than the threshold percentage is
+reported as a regression and the command exits with a non zero status.
+
+Usage: python -m tests.benchmarks.bench_hot_paths [--save PATH] [--compare PATH]
+  [--threshold PERCENT] [--filter TEXT]
+"""
+
+import argparse
+import logging
+import sys
+from typing import Callable, Dict
+from pytlas.conversing import Agent
+from pytlas.conversing.agent import build_scopes
+from pytlas.datautils import strip_format, find_match
+from pytlas.handling import HandlersStore, TranslationsStore
+from pytlas.handling.hooks import HooksStore
+from pytlas.settings import SettingsStore
+from pytlas.understanding import Intent, SlotValues
+from pytlas.understanding.interpreter import compute_checksum
+from tests.benchmarks.bench_agent import create_interpreter
+from tests.benchmarks.runner import run, save_baseline, load_baseline, compare, \
+    format_duration, DEFAULT_THRESHOLD
+
+INTENTS_COUNTS = [10, 100, 1000]
+
+
+def agent_benchmarks() -> Dict[str, Callable]: # pylint: disable=missing-function-docstring
+    benchmarks = {}
+    stores = {
+        'hooks_store': HooksStore(),
+        'translations_store': TranslationsStore(),
+    }
+
+    for fast_dispatch in (False, True):
+        interpreter = create_interpreter(100)
+        intent = Intent('intent_1', text='a value')
+        interpreter.parse = lambda msg, scopes, intent=intent: [intent]
+        agent = Agent(interpreter, fast_dispatch=fast_dispatch, handlers_store=HandlersStore({
+            'intent_1': lambda r: r.agent.done(),
+        }), **stores)
+
+        benchmarks['agent_parse%s' % ('_fast_dispatch' if fast_dispatch else '')] = \
+            lambda agent=agent: agent.parse('a message')
+
+    for intents_count in INTENTS_COUNTS:
+        interpreter = create_interpreter(intents_count)
+        agent = Agent(interpreter, share_machine=False, **stores)
+
+        benchmarks['agent_init_%d' % intents_count] = \
+            lambda interpreter=interpreter: Agent(interpreter, **stores)
+        benchmarks['agent_build_%d' % intents_count] = agent.build
+
+    return benchmarks
+
+
+def understanding_benchmarks() -> Dict[str, Callable]: # pylint: disable=missing-function-docstring
+    benchmarks = {}
+
+    for intents_count in INTENTS_COUNTS:
+        intents = create_interpreter(intents_count).intents
+        benchmarks['build_scopes_%d' % intents_count] = lambda intents=intents: \
+            build_scopes(intents)
+
+    dataset = {
+        'intents': {'intent_%d' % i: {'data': [[{'type': 'text', 'value': 'sentence %d' % j}]
+                                               for j in range(10)]}
+                    for i in range(100)},
+    }
+
+    benchmarks['compute_checksum'] = lambda: compute_checksum(dataset)
+    benchmarks['intent_init'] = lambda: Intent('get_forecast', date='today',
+                                               city=['Paris', 'New York'])
+    benchmarks['slot_values_init'] = lambda: SlotValues(['Paris', 'New York', 'Rouen'])
+
+    return benchmarks
+
+
+def handling_benchmarks() -> Dict[str, Callable]: # pylint: disable=missing-function-docstring
+    text = 'Turning **lights** on in the _living room_, see [details](http://localhost)'
+    choices = ['kitchen', 'living room', 'bedroom', 'bathroom', 'garage']
+    settings = SettingsStore(additional_lookup={'PYTLAS_A_FLAG': 'true'})
+    translations = TranslationsStore()
+
+    for i in range(50):
+        translations.register('en', lambda: {'hello': 'Hello', 'bye': 'Bye'}, 'skill_%d' % i)
+
+    return {
+        'strip_format': lambda: strip_format(text),
+        'find_match': lambda: find_match(choices, 'in the living room please'),
+        'settings_get': lambda: settings.get('a_setting', 'default'),
+        'settings_getbool': lambda: settings.getbool('a_flag'),
+        'translations_all': lambda: translations.all('en'),
+    }
+
+
+def get_benchmarks() -> Dict[str, Callable]:
+    """Retrieve every available benchmarks.
+    """
+    benchmarks = {}
+    benchmarks.update(agent_benchmarks())
+    benchmarks.update(understanding_benchmarks())
+    benchmarks.update(handling_benchmarks())
+
+    return benchmarks
+
+
+def main(argv=None) -> int: # pylint: disable=missing-function-docstring
+    parser = argparse.ArgumentParser(description='Run pytlas hot paths benchmarks')
+    parser.add_argument('--save', help='Save results as a baseline to the given path')
+    parser.add_argument('--compare', help='Compare results with the given baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Slowdown percentage considered as a regression')
+    parser.add_argument('--filter', default='', help='Only run benchmarks containing this text')
+    args = parser.parse_args(argv)
+
+    # Logs are not what we want to measure
+    logging.disable(logging.CRITICAL)
+
+    benchmarks = {k: v for (k, v) in get_benchmarks().items() if args.filter in k}
+    results = run(benchmarks)
+
+    if args.save:
+        save_baseline(args.save, results)
+
+    if not args.compare:
+        for (name, duration) in results.items():
+            print('%-30s %12s' % (name, format_duration(duration)))
+
+        return 0
+
+    comparisons = compare(load_baseline(args.compare), results, args.threshold)
+
+    for comparison in comparisons:
+        print('%-30s %12s %12s %+9.2f%% %s' % (
+            comparison['name'], format_duration(comparison['baseline']),
+            format_duration(comparison['current']), comparison['change'],
+            'REGRESSION' if comparison['regression'] else ''))
+
+    return 1 if any(c['regression'] for c in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
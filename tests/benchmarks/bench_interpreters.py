@@ -0,0 +1,88 @@
+"""Compares the fit time, memory used and parse latency of the `PatternInterpreter`
+and the `SnipsInterpreter` on the training data of the example skills. Messages
+parsed are generated from this training data.
+
+Each interpreter is measured in a fresh process so allocations of one does not
+account for the other.
+
+Usage: python -m tests.benchmarks.bench_interpreters [skills directory]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pytlas.handling.importers import import_skills
+from pytlas.understanding import Interpreter
+from pytlas.understanding.pattern import PatternInterpreter
+from pytlas.understanding.training import generate_examples
+
+DEFAULT_SKILLS_DIRECTORY = os.path.join(os.path.dirname(__file__), '../../example/skills')
+REPEAT = 5
+
+
+def create_interpreter(name: str) -> Interpreter: # pylint: disable=missing-function-docstring
+    if name == 'pattern':
+        return PatternInterpreter('en')
+
+    from pytlas.understanding.snips import SnipsInterpreter # pylint: disable=import-outside-toplevel
+
+    return SnipsInterpreter('en')
+
+
+def measure(name: str, skills_directory: str) -> dict:
+    """Fits the interpreter with the skills training data and returns the fit time,
+    the memory allocated by the interpreter and parse latencies in microseconds.
+    """
+    import_skills(skills_directory)
+
+    interpreter = create_interpreter(name)
+    data = interpreter.get_training_data()
+    messages = [text for (text, _) in generate_examples(interpreter.get_skill_data())]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    interpreter.fit(data)
+    fit_time = time.perf_counter() - start
+    (memory, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations = []
+
+    for _ in range(REPEAT):
+        for msg in messages:
+            start = time.perf_counter()
+            interpreter.parse(msg)
+            durations.append(time.perf_counter() - start)
+
+    durations.sort()
+
+    return {
+        'fit_ms': fit_time * 1000,
+        'memory_kb': memory / 1024,
+        'p50_us': durations[len(durations) // 2] * 1000000,
+        'p99_us': durations[int(len(durations) * 0.99)] * 1000000,
+        'matched': sum(1 for msg in messages if interpreter.parse(msg)) / len(messages),
+    }
+
+
+def main(skills_directory: str) -> None: # pylint: disable=missing-function-docstring
+    print('%-10s  %10s  %12s  %10s  %10s  %8s' % (
+        'interpreter', 'fit (ms)', 'memory (kB)', 'p50 (us)', 'p99 (us)', 'matched'))
+
+    for name in ('pattern', 'snips'):
+        try:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(measure, name, skills_directory).result()
+        except Exception as err: # pylint: disable=broad-except
+            print('%-10s  could not be measured: %s' % (name, err))
+            continue
+
+        print('%-10s  %10.1f  %12.1f  %10.1f  %10.1f  %7.0f%%' % (
+            name, result['fit_ms'], result['memory_kb'], result['p50_us'], result['p99_us'],
+            result['matched'] * 100))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SKILLS_DIRECTORY)
@@ -0,0 +1,69 @@
+"""Measures the parse throughput of a `PoolInterpreter` with a growing number of
+workers, each worker running a CPU bound stub interpreter, when parse calls come
+from as many threads as there are workers.
+
+Usage: python -m tests.benchmarks.bench_pool [max workers count]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pytlas.understanding import Interpreter, Intent
+from pytlas.understanding.pool import PoolInterpreter
+
+CALLS_COUNT = 400
+WORK_ITERATIONS = 20000
+
+
+class BusyInterpreter(Interpreter):
+    """Stub interpreter which burns CPU for each parse call like a real engine would.
+    """
+
+    def __init__(self, lang: str, cache_directory: str) -> None:
+        super().__init__('busy', lang, cache_directory)
+
+    def load_from_cache(self) -> None:
+        self.intents = ['busy']
+
+    def parse(self, msg, scopes=None):
+        total = 0
+
+        for i in range(WORK_ITERATIONS):
+            total += i * i
+
+        return [Intent('busy', text=msg)]
+
+
+def measure(workers_count: int) -> float: # pylint: disable=missing-function-docstring
+    interpreter = PoolInterpreter('en', workers=workers_count, factory=BusyInterpreter)
+    interpreter.load_from_cache()
+
+    try:
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers_count) as executor:
+            list(executor.map(interpreter.parse, ['message'] * CALLS_COUNT))
+
+        return CALLS_COUNT / (time.perf_counter() - start)
+    finally:
+        interpreter.close()
+
+
+def main(max_workers_count: int) -> None: # pylint: disable=missing-function-docstring
+    print('Parse throughput (%d calls, %d CPU cores)' % (CALLS_COUNT, os.cpu_count()))
+
+    inline = BusyInterpreter('en', None)
+    start = time.perf_counter()
+
+    for _ in range(CALLS_COUNT):
+        inline.parse('message')
+
+    print('  %-12s %10.1f calls/s' % ('in process', CALLS_COUNT / (time.perf_counter() - start)))
+
+    for workers_count in range(1, max_workers_count + 1):
+        print('  %-12s %10.1f calls/s' % ('%d worker(s)' % workers_count, measure(workers_count)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count())
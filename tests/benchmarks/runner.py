@@ -0,0 +1,130 @@
+"""Tiny benchmark runner which measures functions, stores results as JSON baselines
+and compares new results against them to spot regressions.
+"""
+
+import json
+import platform
+import timeit
+from typing import Callable, Dict, List
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 10.0
+
+
+def measure(func: Callable, repeat: int = DEFAULT_REPEAT) -> float:
+    """Measures the time taken by one call of the given function.
+
+    The number of calls per run is determined automatically so a run lasts at least
+    0.2 seconds, and the best run is kept since slower ones are mostly caused by other
+    processes.
+
+    Args:
+      func (callable): Function to measure
+      repeat (int): Number of runs
+
+    Returns:
+      float: Duration of one call in seconds
+
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(benchmarks: Dict[str, Callable], repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """Runs every given benchmarks.
+
+    Args:
+      benchmarks (dict): Benchmark names and the function to measure
+      repeat (int): Number of runs for each benchmark
+
+    Returns:
+      dict: Benchmark names and the duration of one call in seconds
+
+    """
+    return {name: measure(func, repeat) for (name, func) in benchmarks.items()}
+
+
+def save_baseline(path: str, results: Dict[str, float]) -> None:
+    """Saves results to a JSON baseline file.
+
+    Args:
+      path (str): Path of the baseline file
+      results (dict): Results as returned by `run`
+
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({
+            'python': platform.python_version(),
+            'results': results,
+        }, file, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    """Loads results from a JSON baseline file.
+
+    Args:
+      path (str): Path of the baseline file
+
+    Returns:
+      dict: Results stored in the baseline
+
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['results']
+
+
+def compare(baseline: Dict[str, float],
+            results: Dict[str, float],
+            threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """Compares results against a baseline.
+
+    Args:
+      baseline (dict): Baseline results
+      results (dict): New results
+      threshold (float): Percentage of slowdown above which a benchmark is considered
+        as a regression
+
+    Returns:
+      list of dict: Comparison of each benchmark available in both results with its
+      `name`, `baseline` and `current` durations, the `change` in percent and a
+      `regression` flag
+
+    """
+    comparisons = []
+
+    for name in sorted(set(baseline) & set(results)):
+        change = (results[name] - baseline[name]) * 100 / baseline[name]
+        comparisons.append({
+            'name': name,
+            'baseline': baseline[name],
+            'current': results[name],
+            'change': round(change, 2),
+            'regression': change > threshold,
+        })
+
+    return comparisons
+
+
+def format_duration(duration: float) -> str:
+    """Formats a duration with an appropriate unit.
+
+    Args:
+      duration (float): Duration in seconds
+
+    Returns:
+      str: Formatted duration
+
+    Examples:
+      >>> format_duration(0.0000123)
+      '12.30 us'
+      >>> format_duration(0.0123)
+      '12.30 ms'
+
+    """
+    for (unit, factor) in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if duration * factor >= 1:
+            return '%.2f %s' % (duration * factor, unit)
+
+    return '%.2f ns' % (duration * 1e9)
@@ -0,0 +1,26 @@
+import os
+import tempfile
+from sure import expect
+from tests.benchmarks.runner import compare, save_baseline, load_baseline, measure
+
+
+class TestRunner:
+
+    def test_it_should_measure_the_duration_of_a_call(self):
+        expect(measure(lambda: None, repeat=1)).to.be.greater_than(0)
+
+    def test_it_should_save_and_load_baselines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(path, {'a': 0.5})
+
+            expect(load_baseline(path)).to.equal({'a': 0.5})
+
+    def test_it_should_flag_regressions_above_the_threshold(self):
+        comparisons = compare({'a': 1.0, 'b': 2.0, 'c': 1.0}, {'a': 1.05, 'b': 2.5, 'd': 1}, 10)
+
+        expect(comparisons).to.have.length_of(2)
+        expect(comparisons[0]).to.equal({
+            'name': 'a', 'baseline': 1.0, 'current': 1.05, 'change': 5.0, 'regression': False})
+        expect(comparisons[1]).to.equal({
+            'name': 'b', 'baseline': 2.0, 'current': 2.5, 'change': 25.0, 'regression': True})
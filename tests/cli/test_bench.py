@@ -0,0 +1,87 @@
+import os
+import tempfile
+from unittest.mock import MagicMock
+from sure import expect
+from pytlas.cli.bench import load_utterances, run_bench, format_report
+from pytlas.conversing.agent import STATE_FALLBACK
+from pytlas.handling import HandlersStore
+from pytlas.understanding import Interpreter, Intent
+
+
+def on_greet(r):
+    r.agent.answer('Hello!')
+
+    return r.agent.done()
+
+
+class TestLoadUtterances:
+
+    def setup(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def teardown(self):
+        self.directory.cleanup()
+
+    def write(self, filename, content):
+        path = os.path.join(self.directory.name, filename)
+
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+        return path
+
+    def test_it_should_load_a_text_corpus(self):
+        path = self.write('corpus.txt', """# Greetings
+hello
+
+how are you?
+""")
+
+        expect(load_utterances(path)).to.equal(['hello', 'how are you?'])
+
+    def test_it_should_load_a_jsonl_corpus(self):
+        path = self.write('corpus.jsonl', """"hello"
+{"text": "how are you?", "intent": "greet"}
+""")
+
+        expect(load_utterances(path)).to.equal(['hello', 'how are you?'])
+
+
+class TestRunBench:
+
+    def setup(self):
+        self.interpreter = Interpreter('test', 'en')
+        self.interpreter.intents = ['greet']
+        self.interpreter.parse = MagicMock(
+            side_effect=lambda msg, scopes: [Intent('greet')] if msg == 'hello' else [])
+
+    def test_it_should_report_latencies_and_throughput(self):
+        report = run_bench(self.interpreter, ['hello', 'hello', 'what?', 'hello'], 2,
+                           HandlersStore({'greet': on_greet}))
+
+        expect(report['agents']).to.equal(2)
+        expect(report['turns']).to.equal(4)
+        expect(report['throughput']).to.be.greater_than(0)
+        expect(report['latency']['count']).to.equal(4)
+        expect(report['intents']['greet']['count']).to.equal(3)
+        expect(report['intents'][STATE_FALLBACK]['count']).to.equal(1)
+        expect(report['fallback_rate']).to.equal(0.25)
+        expect(report['peak_rss_kb']).to.be.greater_than(0)
+        expect(report['stages']).to.have.key('parse')
+        expect(report['stages']).to.have.key('handler')
+
+        text = format_report(report)
+
+        expect(text).to.contain('Throughput')
+        expect(text).to.contain('greet')
+
+    def test_it_should_report_the_fast_path_hit_rate_if_any(self):
+        expect(run_bench(self.interpreter, ['hello'])).to_not.have.key('fast_path_hit_rate')
+
+        self.interpreter.fast_path = {}
+        self.interpreter.fast_path_hit_rate = 0.5
+
+        report = run_bench(self.interpreter, ['hello'])
+
+        expect(report['fast_path_hit_rate']).to.equal(0.5)
+        expect(format_report(report)).to.contain('Fast path hit rate: 50.0%')
@@ -0,0 +1,151 @@
+from pychatl import parse
+from sure import expect
+from pytlas.cli.evaluate import split_folds, compute_report, run_evaluation, \
+    format_evaluation, Prediction, NO_INTENT
+from pytlas.understanding import Interpreter, Intent
+
+DATA = parse("""
+%[lights_on]
+  turn on the lights in @[room]
+  switch on the @[room] lights
+  lights on in @[room] please
+
+%[lights_off]
+  turn off the lights in @[room]
+  switch off the @[room] lights
+  lights off in @[room] please
+
+%[greet]
+  hello
+
+@[room]
+  kitchen
+  bedroom
+""")
+
+
+class WordsInterpreter(Interpreter):
+    """Interpreter which picks the intent sharing the most words with the message and
+    extracts known entity values.
+    """
+
+    def __init__(self, lang, cache_directory):
+        super().__init__('words', lang, cache_directory)
+        self.words = {}
+        self.values = {}
+
+    def convert_training_data(self, data):
+        return data
+
+    def fit(self, data):
+        self.intents = list(data['intents'].keys())
+
+        for (name, intent) in data['intents'].items():
+            self.words[name] = set(w for sentence in intent['data'] for item in sentence
+                                   if item['type'] == 'text' for w in item['value'].split())
+
+        for (name, entity) in data['entities'].items():
+            for value in entity['data']:
+                self.values[value['value']] = name
+
+    def parse(self, msg, scopes=None):
+        words = set(msg.split())
+        scores = [(len(words & w), name) for (name, w) in self.words.items()]
+        (score, name) = max(scores)
+
+        if not score:
+            return []
+
+        return [Intent(name, **{
+            self.values[w]: w for w in msg.split() if w in self.values})]
+
+
+def create_words_interpreter(lang, cache_directory):
+    return WordsInterpreter(lang, cache_directory)
+
+
+class TestSplitFolds:
+
+    def test_it_should_split_sentences_of_each_intent_between_folds(self):
+        folds = split_folds(DATA, 3)
+
+        expect(folds).to.have.length_of(3)
+
+        for (fold, (train, examples)) in enumerate(folds):
+            expect(train['intents']['lights_on']['data']).to.have.length_of(2)
+            expect(train['entities']).to.equal(DATA['entities'])
+            expect([e[1] for e in examples]).to.equal(
+                ['lights_on', 'lights_off'] + (['greet'] if fold == 0 else []))
+
+        expect(folds[0][0]['intents']).to_not.contain('greet')
+        expect(folds[1][0]['intents']).to.contain('greet')
+
+    def test_it_should_annotate_examples_with_slots(self):
+        (_, examples) = split_folds(DATA, 3)[1]
+
+        expect(examples[0]).to.equal(('switch on the kitchen lights', 'lights_on',
+                                      [('room', 'kitchen')]))
+
+    def test_it_should_need_at_least_two_folds(self):
+        expect(lambda: split_folds(DATA, 1)).to.throw(ValueError)
+
+
+class TestComputeReport:
+
+    def test_it_should_compute_intent_and_slots_metrics(self):
+        report = compute_report([1.0, 3.0], [
+            Prediction('a', 'on', 'on', [('room', 'kitchen')], [('room', 'kitchen')], 0.1),
+            Prediction('b', 'on', 'off', [('room', 'bedroom')], [('room', 'kitchen')], 0.2),
+            Prediction('c', 'off', NO_INTENT, [('room', 'kitchen')], [], 0.3),
+            Prediction('d', 'off', 'off', [], [('date', 'today')], 0.4),
+        ])
+
+        expect(report['folds']).to.equal(2)
+        expect(report['utterances']).to.equal(4)
+        expect(report['intent_accuracy']).to.equal(0.5)
+        expect(report['confusion']).to.equal({
+            'on': {'on': 1, 'off': 1},
+            'off': {NO_INTENT: 1, 'off': 1},
+        })
+        expect(report['slots']['room']).to.equal({
+            'precision': 0.5,
+            'recall': 1 / 3,
+            'f1': 0.4,
+            'support': 3,
+        })
+        expect(report['slots']['date']).to.equal({
+            'precision': 0.0, 'recall': 0.0, 'f1': 0.0, 'support': 0,
+        })
+        expect(report['latency']['on']).to.equal({'count': 2, 'p50': 0.1, 'p95': 0.2, 'p99': 0.2})
+        expect(report['fit_time']).to.equal({'mean': 2.0, 'max': 3.0})
+
+    def test_it_should_handle_no_predictions(self):
+        report = compute_report([], [])
+
+        expect(report['intent_accuracy']).to.equal(0.0)
+        expect(report['fit_time']).to.equal({'mean': 0.0, 'max': 0.0})
+
+
+class TestRunEvaluation:
+
+    def test_it_should_evaluate_each_fold_in_the_current_process(self):
+        report = run_evaluation(DATA, 'en', 3, 1, create_words_interpreter)
+
+        expect(report['folds']).to.equal(3)
+        expect(report['utterances']).to.equal(7)
+        expect(report['confusion']['greet']).to.equal({NO_INTENT: 1})
+        expect(report['confusion']['lights_on']['lights_on']).to.equal(3)
+        expect(report['slots']['room']['f1']).to.equal(1.0)
+        expect(report['latency']).to.contain('lights_off')
+
+        text = format_evaluation(report)
+
+        expect(text).to.contain('Evaluated 7 utterances with 3 folds')
+        expect(text).to.contain('greet')
+
+    def test_it_should_evaluate_folds_in_several_processes(self):
+        report = run_evaluation(DATA, 'en', 3, 2, create_words_interpreter)
+
+        expect(report['utterances']).to.equal(7)
+        expect(report['intent_accuracy']).to.equal(
+            run_evaluation(DATA, 'en', 3, 1, create_words_interpreter)['intent_accuracy'])
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from pychatl import parse
+from sure import expect
+from pytlas.cli.train import get_language_directory, run_training, format_training
+from pytlas.understanding.pattern import PatternInterpreter, DATA_FILENAME
+
+DATASETS = {
+    'en': parse("""
+%[lights_on]
+  turn on the lights
+
+%[greet]
+  hello
+"""),
+    'fr': parse("""
+%[lights_on]
+  allume les lumières
+"""),
+}
+
+
+class TestRunTraining:
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self.directory)
+
+    def test_it_should_retrieve_the_language_directory(self):
+        expect(get_language_directory('cache', 'fr')).to.equal(os.path.join('cache', 'fr'))
+        expect(get_language_directory(None, 'fr')).to.be.none
+
+    def test_it_should_fit_each_language_in_its_own_directory(self):
+        results = run_training(DATASETS, self.directory, 1, PatternInterpreter)
+
+        expect([r['language'] for r in results]).to.equal(['en', 'fr'])
+        expect([r['intents'] for r in results]).to.equal([2, 1])
+
+        for result in results:
+            expect(result['fit_time']).to.be.greater_than_or_equal_to(0)
+            expect(os.path.isfile(os.path.join(
+                self.directory, result['language'], DATA_FILENAME))).to.be.true
+
+    def test_it_should_fit_languages_in_parallel(self):
+        results = run_training(DATASETS, self.directory, 2, PatternInterpreter)
+
+        expect([r['language'] for r in results]).to.equal(['en', 'fr'])
+        expect([r['intents'] for r in results]).to.equal([2, 1])
+
+        interpreter = PatternInterpreter('fr', os.path.join(self.directory, 'fr'))
+        interpreter.load_from_cache()
+
+        expect(interpreter.parse('allume les lumières')[0].name).to.equal('lights_on')
+
+    def test_it_should_format_results(self):
+        formatted = format_training([
+            {'language': 'en', 'intents': 2, 'fit_time': 1.5, 'peak_rss_kb': 2048},
+            {'language': 'fr', 'intents': 1, 'fit_time': 3.25, 'peak_rss_kb': None},
+        ])
+
+        expect(formatted).to.contain('en')
+        expect(formatted).to.contain('1.50')
+        expect(formatted).to.contain('2048')
+        expect(formatted).to.contain('Trained 2 languages in 3.25s')
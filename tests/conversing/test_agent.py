@@ -113,11 +113,19 @@ def on_raise_exception(r):
     raise Exception('An error occured!')
 
 
+class Unserializable:
+
+    def __repr__(self):
+        return '<connection>'
+
+
 class TestAgent:
     """For those tests, the interpreter.parse is always mocked because there is no interpreter
     such as snips. It only tests transitions and state management.
     """
 
+    agent_options = {}
+
     def setup(self):
         self.on_answer = MagicMock()
         self.on_ask = MagicMock()
@@ -143,7 +151,7 @@ class TestAgent:
         self.interpreter.intents = list(
             self.handlers._data.keys()) + ['intent_without_handler']
         self.agent = Agent(self.interpreter, model=self,
-                           handlers_store=self.handlers, **self.meta)
+                           handlers_store=self.handlers, **self.agent_options, **self.meta)
 
     def test_it_should_provide_settings(self):
         expect(self.agent.settings.config).to.equal(CONFIG.config)
@@ -159,8 +167,8 @@ class TestAgent:
                ).to.equal('agent value')
 
     def test_it_should_have_a_unique_id(self):
-        agt1 = Agent(self.interpreter)
-        agt2 = Agent(self.interpreter)
+        agt1 = Agent(self.interpreter, **self.agent_options)
+        agt2 = Agent(self.interpreter, **self.agent_options)
 
         expect(agt1.id).to_not.be.none
         expect(agt1.id).to.be.a(str)
@@ -170,9 +178,21 @@ class TestAgent:
         expect(agt1.id).to_not.equal(agt2.id)
 
     def test_it_should_expose_the_current_used_language(self):
-        a = Agent(self.interpreter)
+        a = Agent(self.interpreter, **self.agent_options)
         expect(a.lang).to.equal(self.interpreter.lang)
 
+    def test_it_should_follow_the_language_routed_by_the_interpreter(self):
+        fr_interpreter = Interpreter('test', 'fr')
+        fr_interpreter.parse = MagicMock(return_value=[Intent('greet')])
+        self.interpreter.route = MagicMock(return_value=fr_interpreter)
+
+        self.agent.parse('bonjour', lang='fr_FR')
+
+        self.interpreter.route.assert_called_once_with('bonjour', 'fr_FR')
+        fr_interpreter.parse.assert_called_once_with('bonjour', self.agent._current_scopes)
+        expect(self.agent.lang).to.equal('fr')
+        expect(last_request.lang).to.equal('fr')
+
     def test_it_should_trigger_agent_created_hook_upon_creation(self):
         h = HooksStore()
         self.on_agent_created = MagicMock()
@@ -180,27 +200,31 @@ class TestAgent:
 
         h.register(ON_AGENT_CREATED, self.on_agent_created)
 
-        agt = Agent(self.interpreter, hooks_store=h)
+        agt = Agent(self.interpreter, hooks_store=h, **self.agent_options)
 
         self.on_agent_created.assert_called_once_with(agt)
 
     def test_it_should_use_provided_translations_store(self):
         s = TranslationsStore()
-        s.register('en', lambda: {
+        load_translations = MagicMock(__name__='load_translations', return_value={
             'hi': 'Hello',
             'bye': 'See ya!',
-        }, 'test_agent')
-
-        a = Agent(self.interpreter, translations_store=s)
-        expect(a._translations).to.equal({
-            'test_agent': {
-                'hi': 'Hello',
-                'bye': 'See ya!',
-            },
         })
+        s.register('en', load_translations, 'tests')
+
+        a = Agent(self.interpreter, translations_store=s, **self.agent_options)
+
+        expect(a._translations).to.be(s)
+        load_translations.assert_not_called()
+
+        r = a._create_request(Intent('greet'), on_greet)
+
+        expect(r._('hi')).to.equal('Hello')
+        expect(r._('bye')).to.equal('See ya!')
+        load_translations.assert_called_once()
 
     def test_it_we_should_be_able_to_determine_if_kwargs_are_set(self):
-        agent = Agent(self.interpreter)
+        agent = Agent(self.interpreter, **self.agent_options)
         expect(agent._is_valid({ 'data': 'here' }, ['text', 'cards'])).to.be.false
         expect(agent._is_valid({ 'text': 'here' }, ['text', 'cards'])).to.be.false
         expect(agent._is_valid({ 'text': 'here', 'cards': [] }, ['text', 'cards'])).to.be.true
@@ -441,3 +465,113 @@ class TestAgent:
         self.agent.build()
 
         expect(self.agent._machine.states).to.contain('something_else')
+        self.on_done.assert_called_once_with(False)
+
+    def test_it_should_rebuild_when_the_interpreter_engine_changes_while_asleep(self):
+        self.handlers._data['something_else'] = on_greet
+        self.interpreter.intents.append('something_else')
+        self.interpreter.version += 1
+        self.interpreter.parse = MagicMock(return_value=[Intent('something_else')])
+
+        self.agent.parse('something else')
+
+        expect(self.agent._machine.states).to.contain('something_else')
+        self.on_answer.assert_called_once_with('Hello you!', None, raw_text='Hello you!')
+        expect(self.on_done.call_count).to.equal(1)
+
+    def test_it_should_parse_with_the_new_scopes_after_a_rebuild(self):
+        self.interpreter.intents.append('something_else')
+        self.interpreter.version += 1
+        self.interpreter.parse = MagicMock(return_value=[])
+
+        self.agent.parse('something else')
+
+        expect(self.interpreter.parse.call_args[0][1]).to.contain('something_else')
+
+    def test_it_should_wait_for_the_conversation_to_end_to_rebuild(self):
+        self.interpreter.parse = MagicMock(return_value=[Intent('get_forecast')])
+        self.agent.parse('what is the weather like?')
+
+        expect(self.agent.state).to.equal(STATE_ASK)
+
+        self.interpreter.intents.append('something_else')
+        self.interpreter.version += 1
+        self.interpreter.parse = MagicMock(return_value=[])
+        self.agent.parse('today')
+
+        expect(self.agent.state).to.equal(STATE_ASK)
+        expect(self.agent._machine.states).to_not.contain('something_else')
+
+        self.agent.parse('Paris')
+
+        expect(self.agent.state).to.equal(STATE_ASLEEP)
+        self.agent.parse('something else')
+
+        expect(self.agent._machine.states).to.contain('something_else')
+
+    def test_it_should_share_the_state_machine_between_agents_with_the_same_intents(self):
+        other = Agent(self.interpreter, handlers_store=self.handlers, **self.agent_options)
+
+        expect(other._machine).to.be(self.agent._machine)
+        expect(other._available_scopes).to.be(self.agent._available_scopes)
+
+        self.interpreter.parse = MagicMock(return_value=[Intent('block')])
+        self.agent.parse('block the agent')
+
+        expect(self.agent.state).to.equal('block')
+        expect(other.state).to.equal(STATE_ASLEEP)
+
+    def test_it_should_compile_a_dedicated_state_machine_when_asked_to(self):
+        other = Agent(self.interpreter, share_machine=False, **self.agent_options)
+
+        expect(other._machine).to_not.be(self.agent._machine)
+        expect(list(other._machine.states)).to.equal(list(self.agent._machine.states))
+        expect(other.state).to.equal(STATE_ASLEEP)
+
+    def test_it_should_resume_a_conversation_from_a_snapshot(self):
+        self.interpreter.parse = MagicMock(
+            return_value=[Intent('get_forecast', date='tomorrow'), Intent('greet')])
+
+        self.agent.parse('will it be sunny tomorrow and say hello')
+
+        expect(self.agent.state).to.equal(STATE_ASK)
+
+        request_id = last_request.id
+        snapshot = self.agent.snapshot()
+
+        expect(snapshot).to.be.a(bytes)
+
+        other = Agent(self.interpreter, model=self,
+                      handlers_store=self.handlers, **self.agent_options)
+        other.restore(snapshot)
+
+        expect(other.state).to.equal(STATE_ASK)
+        expect(other.meta['AGENT_KEY']).to.equal('an agent value')
+        expect(other._request.id).to.equal(request_id)
+
+        self.interpreter.parse = MagicMock(return_value=[])
+
+        other.parse('rouen')
+
+        expect(self.on_answer.call_args_list[0][0][0]).to.equal('Looking in rouen for tomorrow')
+        self.on_answer.assert_called_with('Hello you!', None, raw_text='Hello you!')
+        expect(other.state).to.equal(STATE_ASLEEP)
+
+    def test_it_should_snapshot_meta_values_without_json_representation(self):
+        self.agent.meta['connection'] = Unserializable()
+
+        other = Agent(self.interpreter, model=self,
+                      handlers_store=self.handlers, **self.agent_options)
+        other.restore(self.agent.snapshot())
+
+        expect(other.meta['connection']).to.equal('<connection>')
+
+    def test_it_should_raise_when_restoring_an_unsupported_snapshot(self):
+        expect(lambda: self.agent.restore(b'{"v":0,"state":"asleep"}')).to.throw(ValueError)
+
+
+class TestAgentWithFastDispatch(TestAgent):
+    """Runs the same tests with the table driven state machine.
+    """
+
+    agent_options = {'fast_dispatch': True}
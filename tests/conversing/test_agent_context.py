@@ -39,6 +39,8 @@ def on_open_context(r):
 
 class TestAgentContext:
 
+    agent_options = {}
+
     def setup(self):
         self.on_context = MagicMock()
 
@@ -55,7 +57,7 @@ class TestAgentContext:
         self.interpreter.intents = [i for i in self.handlers._data.keys(
         ) if STATE_FALLBACK not in i] + [STATE_CANCEL]
         self.agent = Agent(
-            self.interpreter, handlers_store=self.handlers, model=self)
+            self.interpreter, handlers_store=self.handlers, model=self, **self.agent_options)
 
     def test_it_should_parse_scopes_correctly(self):
         intents = ['an intent', 'an intent/a sub intent',
@@ -227,3 +229,10 @@ class TestAgentContext:
         expect(self.agent.is_in_open_context_context(None)).to.be.false
         self.agent.context('open_context')
         expect(self.agent.is_in_open_context_context(None)).to.be.true
+
+
+class TestAgentContextWithFastDispatch(TestAgentContext):
+    """Runs the same tests with the table driven state machine.
+    """
+
+    agent_options = {'fast_dispatch': True}
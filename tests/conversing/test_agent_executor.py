@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from sure import expect
+from pytlas.conversing import Agent
+from pytlas.conversing.agent import STATE_ASLEEP, STATE_CANCEL
+from pytlas.understanding import Interpreter, Intent
+from pytlas.handling import HandlersStore
+
+release_handler = threading.Event()
+handler_threads = []
+
+
+def wait_until(predicate, timeout=2):
+    limit = time.monotonic() + timeout
+
+    while not predicate() and time.monotonic() < limit:
+        time.sleep(0.005)
+
+    return predicate()
+
+
+def on_slow(r):
+    handler_threads.append(threading.current_thread())
+    release_handler.wait(2)
+    r.agent.answer('Too late!')
+
+    return r.agent.done()
+
+
+def on_raise_exception(r):
+    raise Exception('An error occured!')
+
+
+def on_cancel(r):
+    r.agent.answer('Cancelled')
+
+    return r.agent.done()
+
+
+class TestAgentWithHandlersExecutor:
+
+    def setup(self):
+        release_handler.clear()
+        handler_threads.clear()
+
+        self.on_answer = MagicMock()
+        self.on_done = MagicMock()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.interpreter = Interpreter('test', 'en')
+        self.interpreter.intents = ['slow', 'raise_exception', STATE_CANCEL]
+        self.agent = Agent(self.interpreter, model=self, handlers_executor=self.executor,
+                           handlers_store=HandlersStore({
+                               'slow': on_slow,
+                               'raise_exception': on_raise_exception,
+                               STATE_CANCEL: on_cancel,
+                           }))
+
+    def teardown(self):
+        release_handler.set()
+        self.executor.shutdown(wait=True)
+
+    def parse(self, msg, intent):
+        self.interpreter.parse = MagicMock(return_value=[Intent(intent)])
+        self.agent.parse(msg)
+
+    def test_it_should_run_handlers_in_the_executor_without_blocking(self):
+        self.parse('be slow', 'slow')
+
+        expect(self.agent.state).to.equal('slow')
+        expect(wait_until(lambda: handler_threads)).to.be.true
+        expect(handler_threads[0]).to_not.be(threading.current_thread())
+
+        release_handler.set()
+
+        expect(wait_until(lambda: self.agent.state == STATE_ASLEEP)).to.be.true
+        self.on_answer.assert_called_once_with('Too late!', None, raw_text='Too late!')
+
+    def test_it_should_end_the_conversation_when_a_handler_times_out(self):
+        self.agent.settings.set('handler_timeout', 0.05, section='tests')
+        self.parse('be slow', 'slow')
+
+        expect(wait_until(lambda: self.agent.state == STATE_ASLEEP)).to.be.true
+        self.on_done.assert_called_once_with(False)
+
+        release_handler.set()
+        self.executor.shutdown(wait=True)
+
+        self.on_answer.assert_not_called()
+        self.on_done.assert_called_once_with(False)
+
+    def test_it_should_use_the_global_timeout_if_the_skill_does_not_define_one(self):
+        self.agent.settings.set('handler_timeout', 0.05)
+        self.parse('be slow', 'slow')
+
+        expect(wait_until(lambda: self.agent.state == STATE_ASLEEP)).to.be.true
+
+    def test_it_should_stay_responsive_to_cancel_while_a_handler_runs(self):
+        self.parse('be slow', 'slow')
+        self.parse('cancel', STATE_CANCEL)
+
+        expect(wait_until(lambda: self.agent.state == STATE_ASLEEP)).to.be.true
+        self.on_answer.assert_called_once_with('Cancelled', None, raw_text='Cancelled')
+
+        release_handler.set()
+        self.executor.shutdown(wait=True)
+
+        self.on_answer.assert_called_once_with('Cancelled', None, raw_text='Cancelled')
+        expect(self.on_done.call_count).to.equal(1)
+
+    def test_it_should_go_back_to_the_asleep_state_if_a_handler_raises(self):
+        self.parse('raise', 'raise_exception')
+
+        expect(wait_until(lambda: self.agent.state == STATE_ASLEEP)).to.be.true
+        self.on_done.assert_called_once_with(False)
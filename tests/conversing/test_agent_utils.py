@@ -1,5 +1,9 @@
+from unittest.mock import MagicMock
 from sure import expect
-from pytlas.conversing.agent import STATE_PREFIX, STATE_SUFFIX, is_builtin
+from transitions import MachineError
+from pytlas.conversing.agent import STATE_PREFIX, STATE_SUFFIX, STATE_ASLEEP, STATE_ASK, \
+    STATE_FALLBACK, STATE_CANCEL, is_builtin, compile_machine, compile_table_machine, \
+    get_shared_machine, TableMachine
 
 
 class TestIsBuiltIn:
@@ -18,3 +22,88 @@ class TestIsBuiltIn:
 
     def test_it_is_not_builtin_if_its_empty(self):
         expect(is_builtin('')).to.be.false
+
+
+class TestCompileMachine:
+
+    def test_it_should_contain_builtin_and_intents_states(self):
+        machine, scopes = compile_machine(('greet', 'list/add', STATE_CANCEL))
+
+        expect(list(machine.states.keys())).to.equal(
+            [STATE_ASLEEP, STATE_ASK, STATE_FALLBACK, STATE_CANCEL, 'greet', 'list/add'])
+        expect(scopes[None]).to.equal([STATE_CANCEL, 'greet'])
+        expect(scopes['list']).to.equal([STATE_CANCEL, 'list/add'])
+
+    def test_it_should_not_be_bound_to_any_model(self):
+        machine, _ = compile_machine(('greet',))
+
+        expect(machine.models).to.be.empty
+
+    def test_it_should_be_cached_by_intents(self):
+        machine, scopes = get_shared_machine(('greet', 'bye'))
+        same_machine, same_scopes = get_shared_machine(('greet', 'bye'))
+        other_machine, _ = get_shared_machine(('greet',))
+
+        expect(same_machine).to.be(machine)
+        expect(same_scopes).to.be(scopes)
+        expect(other_machine).to_not.be(machine)
+
+
+class TestTableMachine:
+
+    def setup(self):
+        self.intents = ('greet', 'list/add', 'list/remove', STATE_CANCEL)
+        self.machine, self.scopes = compile_table_machine(self.intents)
+
+    def test_it_should_contain_the_same_states_and_scopes_as_the_transitions_one(self):
+        machine, scopes = compile_machine(self.intents)
+
+        expect(list(self.machine.states)).to.equal(list(machine.states))
+        expect(self.scopes.keys()).to.equal(scopes.keys())
+
+        for ctx in scopes:
+            expect(self.scopes[ctx]).to.equal(scopes[ctx])
+
+    def test_it_should_contain_the_same_transitions_as_the_transitions_one(self):
+        machine, _ = compile_machine(self.intents)
+
+        expect(self.machine.transitions.keys()).to.equal(machine.events.keys())
+
+        for (trigger, event) in machine.events.items():
+            expect(self.machine.transitions[trigger].keys()).to.equal(event.transitions.keys())
+
+    def test_it_should_be_cached_by_intents(self):
+        machine, _ = get_shared_machine(self.intents, True)
+
+        expect(machine).to.be.a(TableMachine)
+        expect(get_shared_machine(self.intents, True)[0]).to.be(machine)
+        expect(get_shared_machine(self.intents)[0]).to_not.be(machine)
+
+    def test_it_should_raise_when_setting_an_unknown_state(self):
+        model = MagicMock()
+
+        expect(lambda: self.machine.set_state('unknown', model)).to.throw(ValueError)
+
+    def test_it_should_raise_when_triggering_an_unknown_event(self):
+        model = MagicMock(state=STATE_ASLEEP)
+
+        expect(lambda: self.machine.trigger(model, 'unknown')).to.throw(AttributeError)
+
+    def test_it_should_raise_when_triggering_from_an_invalid_state(self):
+        model = MagicMock(state=STATE_ASLEEP)
+
+        expect(lambda: self.machine.trigger(model, STATE_ASK)).to.throw(MachineError)
+
+    def test_it_should_not_transition_if_not_in_the_right_context(self):
+        model = MagicMock(state=STATE_ASLEEP, current_context=None)
+
+        expect(self.machine.trigger(model, 'list/add')).to.be.false
+        expect(model.state).to.equal(STATE_ASLEEP)
+        model._on_intent.assert_not_called()
+
+    def test_it_should_call_the_transition_callback_with_given_kwargs(self):
+        model = MagicMock(state=STATE_ASLEEP, current_context='list')
+
+        expect(self.machine.trigger(model, 'list/add', intent='an intent')).to.be.true
+        expect(model.state).to.equal('list/add')
+        expect(model._on_intent.call_args[0][0].kwargs).to.equal({'intent': 'an intent'})
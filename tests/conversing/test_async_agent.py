@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+from sure import expect
+from pytlas.conversing import AsyncAgent
+from pytlas.conversing.agent import STATE_ASK, STATE_ASLEEP
+from pytlas.understanding import Interpreter, Intent
+from pytlas.handling import HandlersStore
+
+
+async def on_async_greet(r):
+    await asyncio.sleep(0)
+    r.agent.answer('Hello from a coroutine!')
+
+    return r.agent.done()
+
+
+def on_sync_greet(r):
+    r.agent.answer('Hello!')
+
+    return r.agent.done()
+
+
+async def on_book(r):
+    if not r.intent.slot('city'):
+        return r.agent.ask('city', 'Where?')
+
+    await asyncio.sleep(0)
+    r.agent.answer('Booking a trip to %s' % r.intent.slot('city').first().value)
+
+    return r.agent.done()
+
+
+async def on_raise_exception(r):
+    raise Exception('An error occured!')
+
+
+class AsyncModel:
+
+    def __init__(self):
+        self.answers = []
+        self.done = MagicMock()
+
+    async def on_answer(self, text, cards, **meta):
+        await asyncio.sleep(0)
+        self.answers.append(text)
+
+    async def on_done(self, require_input):
+        self.done(require_input)
+
+
+class TestAsyncAgent:
+
+    def setup(self):
+        self.loop = asyncio.new_event_loop()
+        self.model = AsyncModel()
+        self.handlers = HandlersStore({
+            'async_greet': on_async_greet,
+            'sync_greet': on_sync_greet,
+            'book': on_book,
+            'raise_exception': on_raise_exception,
+        })
+        self.interpreter = Interpreter('test', 'en')
+        self.interpreter.intents = list(self.handlers._data.keys())
+        self.agent = AsyncAgent(self.interpreter, model=self.model, loop=self.loop,
+                                handlers_store=self.handlers)
+
+    def teardown(self):
+        self.loop.close()
+
+    def parse(self, msg, intent):
+        self.interpreter.parse = MagicMock(return_value=[Intent(intent)] if intent else [])
+        self.loop.run_until_complete(self.agent.parse(msg))
+
+    def test_it_should_await_coroutine_handlers_and_model_callbacks(self):
+        self.parse('hello', 'async_greet')
+
+        expect(self.model.answers).to.equal(['Hello from a coroutine!'])
+        self.model.done.assert_called_once_with(False)
+        expect(self.agent.state).to.equal(STATE_ASLEEP)
+
+    def test_it_should_call_sync_handlers(self):
+        self.parse('hello', 'sync_greet')
+
+        expect(self.model.answers).to.equal(['Hello!'])
+        expect(self.agent.state).to.equal(STATE_ASLEEP)
+
+    def test_it_should_run_the_interpreter_in_the_executor(self):
+        threads = []
+
+        def parse(msg, scopes):
+            threads.append(threading.current_thread())
+            return [Intent('sync_greet')]
+
+        self.interpreter.parse = parse
+        self.loop.run_until_complete(self.agent.parse('hello'))
+
+        expect(threads).to.have.length_of(1)
+        expect(threads[0]).to_not.be(threading.current_thread())
+
+    def test_it_should_rebuild_before_parsing_when_the_interpreter_changes(self):
+        self.handlers._data['new_greet'] = on_sync_greet
+        self.interpreter.intents.append('new_greet')
+        self.interpreter.version += 1
+        self.parse('hello', 'new_greet')
+
+        expect(self.interpreter.parse.call_args[0][1]).to.contain('new_greet')
+        expect(self.model.answers).to.equal(['Hello!'])
+
+    def test_it_should_handle_ask_states(self):
+        self.parse('book a trip', 'book')
+
+        expect(self.agent.state).to.equal(STATE_ASK)
+        self.model.done.assert_called_once_with(True)
+
+        self.parse('london', None)
+
+        expect(self.model.answers).to.equal(['Booking a trip to london'])
+        expect(self.agent.state).to.equal(STATE_ASLEEP)
+
+    def test_it_should_go_back_to_the_asleep_state_if_a_coroutine_handler_raises(self):
+        self.parse('raise', 'raise_exception')
+
+        expect(self.agent.state).to.equal(STATE_ASLEEP)
+        self.model.done.assert_called_once_with(False)
+
+    def test_it_should_process_turns_one_at_a_time(self):
+        self.interpreter.parse = MagicMock(return_value=[Intent('async_greet')])
+
+        async def parse_concurrently():
+            await asyncio.gather(self.agent.parse('hello'), self.agent.parse('hello again'))
+
+        self.loop.run_until_complete(parse_concurrently())
+
+        expect(self.model.answers).to.equal(['Hello from a coroutine!'] * 2)
+        expect(self.model.done.call_count).to.equal(2)
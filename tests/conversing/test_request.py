@@ -2,6 +2,7 @@ from datetime import datetime
 from sure import expect
 from pytlas.conversing import Agent
 from pytlas.conversing.request import Request, AgentProxy
+from pytlas.handling import TranslationsStore
 from pytlas.understanding import Interpreter
 
 
@@ -34,6 +35,17 @@ class TestRequest:
         expect(r._('a text')).to.equal('un texte')
         expect(r._('not found')).to.equal('not found')
 
+    def test_it_should_retrieve_translations_from_the_store_when_needed(self):
+        s = TranslationsStore()
+        s.register('fr', lambda: {
+            'a text': 'un texte',
+        }, 'amodule')
+
+        r = Request(self.agent, None, package='amodule', translations_store=s)
+
+        expect(r._('a text')).to.equal('un texte')
+        expect(r._('not found')).to.equal('not found')
+
     def test_it_should_be_able_to_format_a_date_according_to_the_language(self):
         r = Request(self.agent, None)
         d = datetime(2018, 9, 25, 8, 30)
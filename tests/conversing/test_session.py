@@ -0,0 +1,191 @@
+import os
+import tempfile
+import threading
+from unittest.mock import MagicMock
+from sure import expect
+from pytlas.conversing import Agent, SessionPool, MemoryBackend, SqliteBackend
+from pytlas.conversing.agent import STATE_ASK, STATE_ASLEEP
+from pytlas.understanding import Interpreter, Intent
+from pytlas.handling import HandlersStore
+
+
+def on_book(r):
+    if not r.intent.slot('city'):
+        return r.agent.ask('city', 'Where?', choices=['Paris', 'London'])
+
+    r.agent.answer('Booking a trip to %s' % r.intent.slot('city').first().value)
+
+    return r.agent.done()
+
+
+def on_list(r):
+    r.agent.context('list')
+
+    return r.agent.done()
+
+
+def on_block(r):
+    pass
+
+
+class TestSessionPool:
+
+    def setup(self):
+        self.on_answer = MagicMock()
+        self.on_ask = MagicMock()
+        self.interpreter = Interpreter('test', 'en')
+        self.interpreter.intents = ['book', 'list', 'list/add', 'block']
+        self.handlers = HandlersStore({
+            'book': on_book,
+            'list': on_list,
+            'block': on_block,
+        })
+        self.backend = MemoryBackend()
+        self.pool = SessionPool(self.create_agent, self.backend, max_agents=2)
+
+    def create_agent(self, session_id):
+        return Agent(self.interpreter, model=self, handlers_store=self.handlers,
+                     session=session_id)
+
+    def test_it_should_create_an_agent_per_session(self):
+        first = self.pool.get_or_create('one')
+        second = self.pool.get_or_create('two')
+
+        expect(first).to_not.be(second)
+        expect(self.pool.get_or_create('one')).to.be(first)
+        expect(first.meta['session']).to.equal('one')
+        expect(self.pool).to.have.length_of(2)
+
+    def test_it_should_evict_the_least_recently_used_agent(self):
+        self.pool.get_or_create('one')
+        self.pool.get_or_create('two')
+        self.pool.get_or_create('one')
+        self.pool.get_or_create('three')
+
+        expect(self.pool).to.have.length_of(2)
+        expect('one' in self.pool).to.be.true
+        expect('two' in self.pool).to.be.false
+        expect(self.backend.load('two')).to_not.be.none
+
+    def test_it_should_not_evict_busy_agents(self):
+        self.interpreter.parse = MagicMock(return_value=[Intent('block')])
+        self.pool.get_or_create('one').parse('block')
+        self.pool.get_or_create('two')
+        self.pool.get_or_create('three')
+
+        expect('one' in self.pool).to.be.true
+        expect('two' in self.pool).to.be.false
+
+    def test_it_should_not_evict_leased_agents_used_by_another_thread(self):
+        (leased, done) = (threading.Event(), threading.Event())
+        used = []
+
+        def use_session():
+            with self.pool.lease('one') as agent:
+                leased.set()
+                done.wait(5)
+                used.append(agent)
+
+        thread = threading.Thread(target=use_session)
+        thread.start()
+
+        expect(leased.wait(5)).to.be.true
+
+        self.pool.get_or_create('two')
+        self.pool.get_or_create('three')
+
+        expect(self.pool.evict('one')).to.be.false
+        expect('one' in self.pool).to.be.true
+        expect('two' in self.pool).to.be.false
+
+        done.set()
+        thread.join(5)
+
+        expect(self.pool.get_or_create('one')).to.be(used[0])
+        expect(self.pool.evict('one')).to.be.true
+
+    def test_it_should_keep_agents_leased_until_every_lease_is_released(self):
+        self.pool.get_or_create('one', lease=True)
+        self.pool.get_or_create('one', lease=True)
+        self.pool.release('one')
+
+        expect(self.pool.evict('one')).to.be.false
+
+        self.pool.release('one')
+
+        expect(self.pool.evict('one')).to.be.true
+
+    def test_it_should_restore_an_evicted_conversation(self):
+        self.interpreter.parse = MagicMock(return_value=[Intent('book')])
+        agent = self.pool.get_or_create('one')
+        agent.meta['AGENT_KEY'] = 'value'
+        agent.parse('book a trip')
+
+        expect(agent.state).to.equal(STATE_ASK)
+        expect(self.pool.evict('one')).to.be.true
+        expect('one' in self.pool).to.be.false
+
+        restored = self.pool.get_or_create('one')
+
+        expect(restored).to_not.be(agent)
+        expect(restored.state).to.equal(STATE_ASK)
+        expect(restored.meta['AGENT_KEY']).to.equal('value')
+        expect(restored.settings.get('key', section='agent')).to.equal('value')
+        expect(self.backend.load('one')).to.be.none
+
+        restored.parse('london')
+
+        self.on_answer.assert_called_once_with(
+            'Booking a trip to London', None, raw_text='Booking a trip to London')
+        expect(restored.state).to.equal(STATE_ASLEEP)
+
+    def test_it_should_restore_the_context_without_notifying_the_model(self):
+        self.on_context = MagicMock()
+        self.interpreter.parse = MagicMock(return_value=[Intent('list')])
+        self.pool.get_or_create('one').parse('open my list')
+        self.pool.evict('one')
+        self.on_context.reset_mock()
+
+        restored = self.pool.get_or_create('one')
+
+        expect(restored.current_context).to.equal('list')
+        expect(restored._current_scopes).to.contain('list/add')
+        # Only the root context switch made when creating the agent should be notified
+        self.on_context.assert_called_once_with(None)
+
+    def test_it_should_evict_agents_idle_for_too_long(self):
+        self.pool.idle_timeout = 0
+        self.pool.get_or_create('one')
+
+        expect(self.pool.evict_idle()).to.equal(['one'])
+        expect(self.pool).to.be.empty
+
+    def test_it_should_remove_a_session(self):
+        self.pool.get_or_create('one')
+        self.pool.evict('one')
+        self.pool.remove('one')
+
+        expect(self.backend.load('one')).to.be.none
+
+
+class TestSqliteBackend:
+
+    def setup(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.backend = SqliteBackend(os.path.join(self.directory.name, 'sessions.db'))
+
+    def teardown(self):
+        self.backend.close()
+        self.directory.cleanup()
+
+    def test_it_should_save_load_and_delete_data(self):
+        expect(self.backend.load('one')).to.be.none
+
+        self.backend.save('one', b'some data')
+        self.backend.save('one', b'other data')
+
+        expect(self.backend.load('one')).to.equal(b'other data')
+
+        self.backend.delete('one')
+
+        expect(self.backend.load('one')).to.be.none
@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock
+from sure import expect
+from pytlas.conversing import Agent, StatsTracer, Span
+from pytlas.conversing.agent import STATE_ASLEEP
+from pytlas.conversing.tracing import Tracer, STAGE_PARSE, STAGE_PARSE_SLOT, STAGE_FIND_MATCH, \
+    STAGE_TRANSITION, STAGE_HANDLER, STAGE_STRIP_FORMAT
+from pytlas.understanding import Interpreter, Intent, SlotValue
+from pytlas.handling import HandlersStore
+
+
+def on_lights_on(r):
+    room = r.intent.slot('room')
+
+    if not room:
+        return r.agent.ask('room', 'Which **ones**?', choices=['kitchen', 'bedroom'])
+
+    r.agent.answer('Turning lights on in **%s**' % room.first().value)
+
+    return r.agent.done()
+
+
+class ListTracer(Tracer):
+
+    def __init__(self):
+        self.spans = []
+
+    def record(self, span):
+        self.spans.append(span)
+
+
+class TestStatsTracer:
+
+    def test_it_should_report_percentiles_per_stage(self):
+        tracer = StatsTracer()
+
+        for i in range(1, 101):
+            tracer.record(Span(STAGE_PARSE, i, None, None, None))
+
+        tracer.record(Span(STAGE_HANDLER, 1, None, None, None))
+
+        report = tracer.report()
+
+        expect(report[STAGE_PARSE]).to.equal({'count': 100, 'p50': 50, 'p95': 95, 'p99': 99})
+        expect(report[STAGE_HANDLER]).to.equal({'count': 1, 'p50': 1, 'p95': 1, 'p99': 1})
+
+    def test_it_should_keep_a_bounded_number_of_samples(self):
+        tracer = StatsTracer(max_samples=10)
+
+        for i in range(100):
+            tracer.record(Span(STAGE_PARSE, i, None, None, None))
+
+        report = tracer.report()
+
+        expect(report[STAGE_PARSE]['count']).to.equal(10)
+        expect(report[STAGE_PARSE]['p50']).to.equal(94)
+
+    def test_it_should_be_resettable(self):
+        tracer = StatsTracer()
+        tracer.record(Span(STAGE_PARSE, 1, None, None, None))
+        tracer.reset()
+
+        expect(tracer.report()).to.be.empty
+
+
+class TestAgentTracing:
+
+    def setup(self):
+        self.on_answer = MagicMock()
+        self.on_ask = MagicMock()
+        self.tracer = ListTracer()
+        self.interpreter = Interpreter('test', 'en')
+        self.interpreter.intents = ['lights_on']
+        self.interpreter.parse_slot = MagicMock(return_value=[SlotValue('kitchen')])
+        self.agent = Agent(self.interpreter, model=self, tracer=self.tracer,
+                           handlers_store=HandlersStore({'lights_on': on_lights_on}))
+
+    def test_it_should_emit_spans_for_each_stage_of_a_turn(self):
+        self.interpreter.parse = MagicMock(return_value=[Intent('lights_on')])
+        self.agent.parse('turn the lights on')
+        self.interpreter.parse = MagicMock(return_value=[])
+        self.agent.parse('in the kitchen')
+
+        expect(self.agent.state).to.equal(STATE_ASLEEP)
+
+        names = set(s.name for s in self.tracer.spans)
+
+        expect(names).to.equal(set([STAGE_PARSE, STAGE_PARSE_SLOT, STAGE_FIND_MATCH,
+                                    STAGE_TRANSITION, STAGE_HANDLER, STAGE_STRIP_FORMAT]))
+
+        for span in self.tracer.spans:
+            expect(span.duration).to.be.greater_than_or_equal_to(0)
+
+    def test_it_should_attach_the_request_to_spans(self):
+        self.interpreter.parse = MagicMock(return_value=[Intent('lights_on')])
+        self.agent.parse('turn the lights on')
+
+        request_id = self.agent._request.id
+        handler_span = next(s for s in self.tracer.spans if s.name == STAGE_HANDLER)
+
+        expect(handler_span.request_id).to.equal(request_id)
+        expect(handler_span.intent).to.equal('lights_on')
+        expect(handler_span.skill).to.equal('tests')
+
+        self.tracer.spans.clear()
+        self.interpreter.parse = MagicMock(return_value=[])
+        self.agent.parse('in the kitchen')
+
+        parse_slot_span = next(s for s in self.tracer.spans if s.name == STAGE_PARSE_SLOT)
+
+        expect(parse_slot_span.request_id).to.equal(request_id)
+        expect(parse_slot_span.intent).to.equal('lights_on')
+
+    def test_it_should_not_emit_anything_without_a_tracer(self):
+        self.agent.tracer = None
+        self.interpreter.parse = MagicMock(return_value=[Intent('lights_on')])
+        self.agent.parse('turn the lights on')
+
+        expect(self.tracer.spans).to.be.empty
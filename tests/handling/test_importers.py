@@ -19,3 +19,9 @@ class TestImporters:
 
                 expect(train_mock.call_count).to.equal(2)
                 expect(intent_mock.call_count).to.equal(2)
+
+    def test_it_should_invalidate_cached_translations_when_reloading_a_module(self):
+        with patch('pytlas.handling.importers.GLOBAL_TRANSLATIONS') as translations_mock:
+            import_or_reload('os')
+
+            translations_mock.invalidate.assert_called_once_with('os')
@@ -1,3 +1,4 @@
+from unittest.mock import MagicMock
 from sure import expect
 from pytlas.handling.localization import translations, TranslationsStore, GLOBAL_TRANSLATIONS
 
@@ -92,3 +93,43 @@ class TestLocalization:
         })
 
         expect(s.get('mymodule', 'it')).to.be.empty
+
+    def test_it_should_evaluate_translations_only_once_per_package_and_language(self):
+        s = TranslationsStore()
+        load_translations = MagicMock(__name__='load_translations', return_value={
+            'hi': 'bonjour',
+        })
+        s.register('fr', load_translations, 'amodule')
+
+        expect(s.get('amodule', 'fr')).to.be(s.get('amodule', 'fr'))
+        expect(s.all('fr')['amodule']).to.be(s.get('amodule', 'fr'))
+        load_translations.assert_called_once()
+
+    def test_it_should_provide_read_only_translations(self):
+        s = TranslationsStore()
+        s.register('fr', lambda: {
+            'hi': 'bonjour',
+        }, 'amodule')
+
+        def update():
+            s.get('amodule', 'fr')['hi'] = 'salut'
+
+        expect(update).to.throw(TypeError)
+
+    def test_it_should_evaluate_translations_again_when_invalidated(self):
+        s = TranslationsStore()
+        load_translations = MagicMock(__name__='load_translations', return_value={
+            'hi': 'bonjour',
+        })
+        s.register('fr', load_translations, 'amodule')
+        s.get('amodule', 'fr')
+        s.invalidate('amodule')
+        s.get('amodule', 'fr')
+
+        expect(load_translations.call_count).to.equal(2)
+
+        s.register('fr', lambda: {
+            'hi': 'salut',
+        }, 'amodule')
+
+        expect(s.get('amodule', 'fr')).to.equal({'hi': 'salut'})
@@ -0,0 +1,190 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from sure import expect
+from pytlas.understanding.cache import EngineCache, format_size, parse_size
+
+
+def persist_engine(size):
+    def persist(path):
+        os.makedirs(path)
+
+        with open(os.path.join(path, 'engine.bin'), 'wb') as file:
+            file.write(b'0' * size)
+
+    return persist
+
+
+def hold_lock(directory, locked, released):
+    with EngineCache(directory).lock('engine'):
+        locked.set()
+        time.sleep(0.2)
+        released.value = time.time()
+
+
+class TestEngineCache:
+
+    def setup(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = EngineCache(self.directory.name, max_entries=None)
+
+    def teardown(self):
+        self.directory.cleanup()
+
+    def store(self, checksum, size=10, last_used=None):
+        path = self.cache.store(checksum, persist_engine(size))
+
+        if last_used is not None:
+            os.utime(os.path.join(path, 'trained.checksum'), (last_used, last_used))
+
+        return path
+
+    def test_it_should_keep_several_engines_side_by_side(self):
+        first = self.store('first')
+        second = self.store('second')
+
+        expect(first).to.equal(os.path.join(self.directory.name, 'first'))
+        expect(os.path.isfile(os.path.join(first, 'engine.bin'))).to.be.true
+        expect(os.path.isfile(os.path.join(second, 'engine.bin'))).to.be.true
+        expect(self.cache.has('first')).to.be.true
+        expect(self.cache.has('second')).to.be.true
+        expect(self.cache.has('third')).to.be.false
+
+    def test_it_should_list_entries_most_recently_used_first(self):
+        self.store('old', 10, 1000)
+        self.store('new', 20, 3000)
+        self.store('middle', 30, 2000)
+
+        entries = self.cache.entries()
+
+        expect([e.checksum for e in entries]).to.equal(['new', 'middle', 'old'])
+        expect([e.size for e in entries]).to.equal([20 + 3, 30 + 6, 10 + 3])
+
+    def test_it_should_ignore_unrelated_files_and_temporary_directories(self):
+        self.store('engine')
+        os.makedirs(os.path.join(self.directory.name, '.engine.42'))
+        os.makedirs(os.path.join(self.directory.name, 'something'))
+
+        with open(os.path.join(self.directory.name, 'trained.checksum'), 'w') as file:
+            file.write('legacy')
+
+        expect([e.checksum for e in self.cache.entries()]).to.equal(['engine'])
+
+    def test_it_should_update_the_last_usage_when_touched(self):
+        self.store('old', last_used=1000)
+        self.store('new', last_used=2000)
+
+        self.cache.touch('old')
+
+        expect([e.checksum for e in self.cache.entries()]).to.equal(['old', 'new'])
+
+    def test_it_should_evict_least_recently_used_engines_when_storing(self):
+        self.cache.max_entries = 2
+        self.store('first', last_used=1000)
+        self.store('second', last_used=2000)
+        self.store('third')
+
+        expect(self.cache.has('first')).to.be.false
+        expect(self.cache.has('second')).to.be.true
+        expect(self.cache.has('third')).to.be.true
+
+    def test_it_should_evict_engines_until_the_size_limit_is_respected(self):
+        self.store('first', 100, 1000)
+        self.store('second', 100, 2000)
+        self.store('third', 100, 3000)
+
+        evicted = self.cache.prune(max_size=150)
+
+        expect([e.checksum for e in evicted]).to.equal(['first', 'second'])
+        expect([e.checksum for e in self.cache.entries()]).to.equal(['third'])
+
+    def test_it_should_never_evict_the_engine_being_kept(self):
+        self.store('first', 100, 1000)
+        self.store('second', 100, 2000)
+
+        evicted = self.cache.prune(max_entries=0, keep='first')
+
+        expect([e.checksum for e in evicted]).to.equal(['second'])
+        expect(self.cache.has('first')).to.be.true
+
+    def test_it_should_keep_lock_files_of_evicted_engines(self):
+        for (checksum, last_used) in (('first', 1000), ('second', 2000)):
+            with self.cache.lock(checksum):
+                self.store(checksum, 10, last_used)
+
+        self.cache.prune(max_entries=1)
+
+        expect(sorted(os.listdir(self.directory.name))).to.equal(
+            ['.first.lock', '.second.lock', 'second'])
+
+        self.cache.clear()
+
+        expect(self.cache.entries()).to.be.empty
+        expect(sorted(os.listdir(self.directory.name))).to.equal(['.first.lock', '.second.lock'])
+
+    def test_it_should_replace_an_existing_engine(self):
+        self.store('engine', 10)
+        self.store('engine', 20)
+
+        expect(self.cache.entries()[0].size).to.equal(20 + 6)
+
+    def test_it_should_keep_the_existing_engine_if_persisting_fails(self):
+        self.store('engine', 10)
+
+        def persist(path):
+            os.makedirs(path)
+            raise OSError('Disk full')
+
+        expect(lambda: self.cache.store('engine', persist)).to.throw(OSError)
+        expect(self.cache.has('engine')).to.be.true
+        expect(self.cache.entries()[0].size).to.equal(10 + 6)
+
+        self.store('engine', 20)
+
+        expect(sorted(os.listdir(self.directory.name))).to.equal(['engine'])
+
+    def test_it_should_clear_every_engines(self):
+        self.store('first')
+        self.store('second')
+
+        expect(self.cache.clear()).to.have.length_of(2)
+        expect(self.cache.entries()).to.be.empty
+
+    def test_it_should_returns_no_entries_when_the_directory_does_not_exist(self):
+        cache = EngineCache(os.path.join(self.directory.name, 'nope'))
+
+        expect(cache.entries()).to.be.empty
+        expect(cache.has('engine')).to.be.false
+
+
+    def test_it_should_make_other_processes_wait_for_the_lock(self):
+        (locked, released) = (multiprocessing.Event(), multiprocessing.Value('d', 0))
+        process = multiprocessing.Process(target=hold_lock, args=(
+            self.directory.name, locked, released))
+        process.start()
+
+        try:
+            expect(locked.wait(5)).to.be.true
+
+            with self.cache.lock('engine'):
+                expect(released.value).to.be.greater_than(0)
+                expect(time.time()).to.be.greater_than_or_equal_to(released.value)
+        finally:
+            process.join()
+
+        expect(self.cache.entries()).to.be.empty
+
+
+class TestSizes:
+
+    def test_it_should_format_sizes(self):
+        expect(format_size(512)).to.equal('512 B')
+        expect(format_size(1536)).to.equal('1.5 kB')
+        expect(format_size(3 * 1024 ** 3)).to.equal('3.0 GB')
+
+    def test_it_should_parse_sizes(self):
+        expect(parse_size('500')).to.equal(500)
+        expect(parse_size('2k')).to.equal(2048)
+        expect(parse_size('1G')).to.equal(1024 ** 3)
+        expect(parse_size('10 MB')).to.equal(10 * 1024 ** 2)
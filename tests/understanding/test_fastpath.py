@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import tempfile
+from sure import expect
+from pytlas.understanding.fastpath import ExactMatchIndex, MAX_EXPANSIONS
+
+with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as f:
+    DATASET = json.load(f)
+
+
+class TestExactMatchIndex:
+
+    def setup(self):
+        self.index = ExactMatchIndex.from_dataset(DATASET)
+
+    def test_it_should_index_utterances_with_closed_entities_values(self):
+        # Each utterance of lights_on/off is indexed with every room value and synonym
+        expect(len(self.index)).to.equal(11 * 5)
+        expect(self.index.entries).to.contain('turn on the lights in cellar')
+
+    def test_it_should_not_index_utterances_with_extensible_or_builtin_entities(self):
+        expect(self.index.entries).to_not.contain('will it rain in paris tomorrow')
+
+    def test_it_should_returns_the_matched_intent_with_its_slots(self):
+        intents = self.index.lookup("Turn the Cellar's lights on, would you?")
+
+        expect(intents).to.have.length_of(1)
+        expect(intents[0].name).to.equal('lights_on')
+
+        room = intents[0].slot('room').first()
+
+        expect(room.value).to.equal('basement')
+        expect(room.meta).to.equal({
+            'range': {'start': 9, 'end': 15},
+            'rawValue': 'Cellar',
+            'value': {'kind': 'Custom', 'value': 'basement'},
+            'entity': 'room',
+            'slotName': 'room',
+        })
+
+    def test_it_should_returns_new_intents_each_time(self):
+        expect(self.index.lookup('enlight me in kitchen')).to_not.be(
+            self.index.lookup('enlight me in kitchen'))
+
+    def test_it_should_returns_none_when_not_indexed(self):
+        expect(self.index.lookup('enlight me in the garage')).to.be.none
+        expect(self.index.lookup('')).to.be.none
+
+    def test_it_should_honour_scopes(self):
+        expect(self.index.lookup('enlight me in kitchen', ['lights_off'])).to.be.none
+        expect(self.index.lookup('enlight me in kitchen', ['lights_on'])).to_not.be.none
+
+    def test_it_should_returns_none_when_ambiguous(self):
+        index = ExactMatchIndex.from_dataset({'intents': {
+            'stop': {'utterances': [{'data': [{'text': 'stop'}]}]},
+            'cancel': {'utterances': [{'data': [{'text': 'Stop!'}]}]},
+        }})
+
+        expect(index.lookup('stop')).to.be.none
+        expect(index.lookup('stop', ['cancel'])[0].name).to.equal('cancel')
+
+    def test_it_should_skip_utterances_with_too_many_combinations(self):
+        values = [{'value': 'value %d' % i, 'synonyms': []} for i in range(MAX_EXPANSIONS)]
+        index = ExactMatchIndex.from_dataset({
+            'intents': {'pick': {'utterances': [{'data': [
+                {'text': 'pick '},
+                {'text': 'value 1', 'entity': 'value', 'slot_name': 'first'},
+                {'text': ' and '},
+                {'text': 'value 2', 'entity': 'value', 'slot_name': 'second'},
+            ]}, {'data': [
+                {'text': 'pick '},
+                {'text': 'value 1', 'entity': 'value', 'slot_name': 'first'},
+            ]}]}},
+            'entities': {'value': {'data': values, 'automatically_extensible': False}},
+        })
+
+        expect(len(index)).to.equal(MAX_EXPANSIONS)
+
+    def test_it_should_be_saved_and_loaded(self):
+        directory = tempfile.mkdtemp()
+
+        try:
+            expect(len(ExactMatchIndex.load(directory))).to.equal(0)
+
+            self.index.save(directory)
+            loaded = ExactMatchIndex.load(directory)
+
+            expect(loaded.entries).to.equal(self.index.entries)
+            expect(loaded.lookup('enlight me in kitchen')[0].name).to.equal('lights_on')
+        finally:
+            shutil.rmtree(directory)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from sure import expect
 from pytlas.understanding import Intent, SlotValues
 
@@ -32,3 +33,39 @@ class TestIntent:
         expect(city).to.have.length_of(2)
         expect(city.first().value).to.equal('Paris')
         expect(city.last().value).to.equal('New York')
+
+    def test_it_should_be_converted_to_and_from_a_dict(self):
+        intent = Intent('get_forecast', date=datetime(2019, 4, 2, 18, 30),
+                        city=['Paris', 'New York'])
+        intent.meta['lang'] = 'en'
+
+        data = intent.to_dict()
+
+        expect(data).to.equal({
+            'name': 'get_forecast',
+            'slots': {
+                'date': [{'value': {'$datetime': '2019-04-02T18:30:00'}}],
+                'city': [{'value': 'Paris'}, {'value': 'New York'}],
+            },
+            'meta': {'lang': 'en'},
+        })
+
+        restored = Intent.from_dict(data)
+
+        expect(restored.name).to.equal('get_forecast')
+        expect(restored.meta).to.equal({'lang': 'en'})
+        expect(restored.slot('date').first().value).to.equal(datetime(2019, 4, 2, 18, 30))
+        expect([v.value for v in restored.slot('city')]).to.equal(['Paris', 'New York'])
+
+    def test_it_should_be_copied(self):
+        intent = Intent('get_forecast', city=['Paris', 'New York'])
+        intent.meta['lang'] = 'en'
+
+        copy = intent.copy()
+        copy.meta['user'] = 'john'
+        copy.update_slots(city='London')
+
+        expect(copy.name).to.equal('get_forecast')
+        expect(copy.meta).to.equal({'lang': 'en', 'user': 'john'})
+        expect(intent.meta).to.equal({'lang': 'en'})
+        expect([v.value for v in intent.slot('city')]).to.equal(['Paris', 'New York'])
@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 from sure import expect
-from pytlas.understanding import Interpreter, TrainingsStore
+from pytlas.understanding import Interpreter, Intent, TrainingsStore
+from pytlas.understanding.interpreter import iter_parse_batch
 
 
 class TestInterpreter:
@@ -145,3 +146,46 @@ parsing will fail here
 
         interpreter.fit_from_skill_data()
         interpreter.fit.assert_not_called()
+
+
+class TestParseBatch:
+
+    def setup(self):
+        self.interpreter = Interpreter('test', 'en')
+        self.interpreter.parse = MagicMock(side_effect=lambda msg, scopes: [Intent(msg)])
+
+    def test_it_should_parse_messages_in_order(self):
+        results = list(self.interpreter.parse_batch(['one', 'two', 'three'], ['scope']))
+
+        expect([m for (m, _) in results]).to.equal(['one', 'two', 'three'])
+        expect([i[0].name for (_, i) in results]).to.equal(['one', 'two', 'three'])
+        self.interpreter.parse.assert_any_call('one', ['scope'])
+
+    def test_it_should_parse_identical_messages_only_once(self):
+        results = list(self.interpreter.parse_batch(['one', 'two', 'one', 'one']))
+
+        expect(results).to.have.length_of(4)
+        expect(results[2][1]).to.be(results[0][1])
+        expect(self.interpreter.parse.call_count).to.equal(2)
+
+    def test_it_should_stream_results(self):
+        def messages():
+            yield 'one'
+            yield 'two'
+            raise Exception('Should not be read')
+
+        results = iter_parse_batch(messages(), lambda chunk: [[Intent(m)] for m in chunk],
+                                   chunk_size=1)
+
+        expect(next(results)[0]).to.equal('one')
+        expect(next(results)[0]).to.equal('two')
+
+    def test_it_should_dedupe_messages_between_chunks(self):
+        parse_many = MagicMock(side_effect=lambda chunk: [[Intent(m)] for m in chunk])
+
+        results = list(iter_parse_batch(['one', 'two', 'one', 'three', 'two'], parse_many,
+                                        chunk_size=2))
+
+        expect([m for (m, _) in results]).to.equal(['one', 'two', 'one', 'three', 'two'])
+        expect([c[0][0] for c in parse_many.call_args_list]).to.equal(
+            [['one', 'two'], ['three']])
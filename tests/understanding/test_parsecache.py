@@ -0,0 +1,156 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+from dateutil.relativedelta import relativedelta
+from sure import expect
+from pytlas.understanding import Interpreter, Intent
+from pytlas.understanding.parsecache import CachedInterpreter
+from pytlas.understanding.router import RouterInterpreter
+from pytlas.understanding.training import TrainingsStore
+
+
+class TestCachedInterpreter:
+
+    def setup(self):
+        self.now = 0
+        self.interpreter = Interpreter('test', 'en')
+        self.interpreter.intents = ['lights_off', 'set_alarm']
+        self.interpreter.parse = MagicMock(side_effect=self.parse)
+        self.cached = CachedInterpreter(self.interpreter, max_size=2, time_relative_ttl=60,
+                                        clock=lambda: self.now)
+
+    def parse(self, msg, scopes=None):
+        if 'timer' in msg:
+            return [Intent('set_alarm', duration=relativedelta(minutes=5))]
+
+        if 'alarm' in msg:
+            return [Intent('set_alarm', date=datetime(2019, 4, 2, 18, 30))]
+
+        if 'lights' in msg:
+            return [Intent('lights_off', room='kitchen')]
+
+        return []
+
+    def test_it_should_expose_the_wrapped_interpreter_attributes(self):
+        expect(self.cached.intents).to.equal(['lights_off', 'set_alarm'])
+        expect(self.cached.lang).to.equal('en')
+        expect(self.cached.version).to.equal(0)
+
+        self.interpreter.fast_path_hit_rate = 0.5
+
+        expect(self.cached.fast_path_hit_rate).to.equal(0.5)
+
+    def test_it_should_parse_each_normalized_message_once(self):
+        self.cached.parse('Turn the lights off')
+        second = self.cached.parse('turn  the lights OFF ')
+
+        expect(self.interpreter.parse.call_count).to.equal(1)
+        expect(second[0].name).to.equal('lights_off')
+        expect(second[0].slot('room').first().value).to.equal('kitchen')
+        expect(self.cached.hits).to.equal(1)
+        expect(self.cached.misses).to.equal(1)
+        expect(self.cached.hit_rate).to.equal(0.5)
+        expect(self.cached.size).to.equal(1)
+
+    def test_it_should_returns_copies_of_cached_intents(self):
+        first = self.cached.parse('turn the lights off')
+        first[0].meta['user'] = 'john'
+
+        second = self.cached.parse('turn the lights off')
+        second[0].meta['user'] = 'jane'
+
+        expect(self.cached.parse('turn the lights off')[0].meta).to.be.empty
+        expect(second[0]).to_not.be(first[0])
+
+    def test_it_should_cache_empty_results(self):
+        expect(self.cached.parse('blah')).to.be.empty
+        expect(self.cached.parse('blah')).to.be.empty
+        expect(self.interpreter.parse.call_count).to.equal(1)
+
+    def test_it_should_key_results_by_scopes(self):
+        self.cached.parse('turn the lights off', ['lights_off'])
+        self.cached.parse('turn the lights off', ['lights_off', 'set_alarm'])
+        self.cached.parse('turn the lights off', ['set_alarm', 'lights_off'])
+        self.cached.parse('turn the lights off')
+
+        expect(self.interpreter.parse.call_count).to.equal(3)
+
+    def test_it_should_evict_least_recently_used_results(self):
+        self.cached.parse('one')
+        self.cached.parse('two')
+        self.cached.parse('one')
+        self.cached.parse('three')
+        self.cached.parse('one')
+        self.cached.parse('two')
+
+        expect(self.interpreter.parse.call_count).to.equal(4)
+        expect(self.cached.size).to.equal(2)
+
+    def test_it_should_expire_time_relative_results(self):
+        self.cached.parse('set an alarm tomorrow')
+        self.now = 59
+        self.cached.parse('set an alarm tomorrow')
+
+        expect(self.interpreter.parse.call_count).to.equal(1)
+
+        self.now = 60
+        self.cached.parse('set an alarm tomorrow')
+
+        expect(self.interpreter.parse.call_count).to.equal(2)
+
+    def test_it_should_not_cache_time_relative_results_without_ttl(self):
+        cached = CachedInterpreter(self.interpreter)
+
+        cached.parse('set an alarm tomorrow')
+        cached.parse('set an alarm tomorrow')
+
+        expect(self.interpreter.parse.call_count).to.equal(2)
+        expect(cached.size).to.equal(0)
+
+    def test_it_should_cache_durations_which_do_not_depend_on_the_current_time(self):
+        cached = CachedInterpreter(self.interpreter)
+
+        cached.parse('set a timer for 5 minutes')
+        cached.parse('set a timer for 5 minutes')
+
+        expect(self.interpreter.parse.call_count).to.equal(1)
+
+    def test_it_should_keep_routing_messages_of_a_wrapped_router(self):
+        trainings = TrainingsStore({
+            'greet': {'en': lambda: '%[greet]\n  hello there',
+                      'fr': lambda: '%[greet]\n  salut à toi'},
+        })
+
+        def create(lang, cache_directory):
+            interpreter = Interpreter('test', lang)
+            interpreter.parse = MagicMock(return_value=[Intent('greet', lang=lang)])
+            return interpreter
+
+        cached = CachedInterpreter(RouterInterpreter(['en', 'fr'], trainings_store=trainings,
+                                                     factory=create, loader=lambda i: None))
+
+        routed = cached.route('salut à toi')
+
+        expect(routed.lang).to.equal('fr')
+        expect(routed.parse('salut à toi')[0].slot('lang').first().value).to.equal('fr')
+        expect(cached.route('hello there').parse('hello there')[0].slot(
+            'lang').first().value).to.equal('en')
+        expect(routed.parse('salut à toi')[0].slot('lang').first().value).to.equal('fr')
+        expect(cached.hits).to.equal(1)
+        expect(cached.misses).to.equal(2)
+
+    def test_it_should_be_invalidated_when_the_interpreter_changes(self):
+        self.cached.parse('turn the lights off')
+        self.interpreter.version += 1
+        self.cached.parse('turn the lights off')
+
+        expect(self.interpreter.parse.call_count).to.equal(2)
+
+    def test_it_should_forward_fit_and_parse_slot_calls(self):
+        self.interpreter.fit = MagicMock()
+        self.interpreter.parse_slot = MagicMock(return_value=[])
+
+        self.cached.fit({'intents': {}})
+        self.cached.parse_slot('lights_off', 'room', 'kitchen')
+
+        self.interpreter.fit.assert_called_once_with({'intents': {}})
+        self.interpreter.parse_slot.assert_called_once_with('lights_off', 'room', 'kitchen')
@@ -0,0 +1,159 @@
+import shutil
+import tempfile
+from sure import expect
+from pytlas.understanding import TrainingsStore
+from pytlas.understanding.pattern import PatternInterpreter
+
+TRAINING = """
+%[lights_on]
+  turn the @[room]'s lights on would you
+  turn ~[on?] lights in the @[room]
+  lights on in @[room] please
+
+%[lights_off]
+  turn off the lights in the @[room]
+  lights off in @[room] please
+
+%[get_forecast]
+  will it rain in @[city] @[date]
+  what's the weather like in @[city]
+
+%[greet]
+  hello
+  hi there
+
+~[on]
+  on
+
+~[basement]
+  cellar
+
+@[room](extensible=false)
+  living room
+  kitchen
+  ~[basement]
+
+@[city]
+  paris
+  new york
+
+@[date](type=datetime)
+  tomorrow
+"""
+
+
+class TestPatternInterpreter:
+
+    def setup(self):
+        self.interpreter = PatternInterpreter('en', trainings_store=TrainingsStore({
+            'pattern_module': {'en': lambda: TRAINING},
+        }))
+        self.interpreter.fit_from_skill_data()
+
+    def test_it_should_expose_intents(self):
+        expect(self.interpreter.intents).to.equal(
+            ['get_forecast', 'greet', 'lights_off', 'lights_on'])
+        expect(self.interpreter.version).to.equal(1)
+
+    def test_it_should_parse_messages_matching_a_sentence(self):
+        intents = self.interpreter.parse('Hello!')
+
+        expect(intents).to.have.length_of(1)
+        expect(intents[0].name).to.equal('greet')
+        expect(intents[0].slots).to.be.empty
+
+    def test_it_should_extract_known_entity_values(self):
+        intents = self.interpreter.parse("Turn the living room's lights on would you")
+
+        expect(intents[0].name).to.equal('lights_on')
+
+        room = intents[0].slot('room').first()
+
+        expect(room.value).to.equal('living room')
+        expect(room.meta).to.equal({
+            'value': {'kind': 'Custom', 'value': 'living room'},
+            'rawValue': 'living room',
+            'entity': 'room',
+            'slotName': 'room',
+            'range': {'start': 9, 'end': 20},
+        })
+
+    def test_it_should_resolve_entity_synonyms(self):
+        intents = self.interpreter.parse('lights off in cellar please')
+
+        expect(intents[0].name).to.equal('lights_off')
+        expect(intents[0].slot('room').first().value).to.equal('basement')
+        expect(intents[0].slot('room').first().meta['rawValue']).to.equal('cellar')
+
+    def test_it_should_handle_optional_synonyms(self):
+        expect(self.interpreter.parse('turn on lights in the kitchen')[0].name).to.equal(
+            'lights_on')
+        expect(self.interpreter.parse('turn lights in the kitchen')[0].name).to.equal(
+            'lights_on')
+
+    def test_it_should_not_match_unknown_values_of_closed_entities(self):
+        expect(self.interpreter.parse('lights off in garage please')).to.be.empty
+
+    def test_it_should_match_any_words_for_extensible_and_builtin_entities(self):
+        intents = self.interpreter.parse('will it rain in paris next monday')
+
+        expect(intents[0].name).to.equal('get_forecast')
+        expect(intents[0].slot('city').first().value).to.equal('paris')
+        expect(intents[0].slot('date').first().value).to.equal('next monday')
+        expect(intents[0].slot('date').first().meta['entity']).to.equal('datetime')
+
+        # Known values are preferred
+        intents = self.interpreter.parse('will it rain in Los Angeles tomorrow')
+
+        expect(intents[0].slot('city').first().value).to.equal('Los Angeles')
+        expect(intents[0].slot('date').first().value).to.equal('tomorrow')
+
+    def test_it_should_not_match_templates_made_only_of_slots(self):
+        interpreter = PatternInterpreter('en')
+        interpreter.fit({'intents': {'anything': {'data': [[
+            {'type': 'entity', 'value': 'city', 'variant': None}]]}},
+                         'entities': {'city': {'props': {}, 'data': []}}})
+
+        expect(interpreter.parse('whatever')).to.be.empty
+
+    def test_it_should_returns_nothing_when_no_sentence_match(self):
+        expect(self.interpreter.parse('what time is it?')).to.be.empty
+        expect(self.interpreter.parse('')).to.be.empty
+        expect(PatternInterpreter('en').parse('hello')).to.be.empty
+
+    def test_it_should_restrict_parsed_intents_to_the_given_scopes(self):
+        expect(self.interpreter.parse('hello', ['lights_on'])).to.be.empty
+        expect(self.interpreter.parse('hello', ['lights_on', 'greet'])[0].name).to.equal(
+            'greet')
+
+    def test_it_should_parse_slot_values_of_closed_entities(self):
+        values = self.interpreter.parse_slot('lights_on', 'room', 'the kitchen and the cellar')
+
+        expect([v.value for v in values]).to.equal(['kitchen', 'basement'])
+        expect(self.interpreter.parse_slot('lights_on', 'room', 'the garage')).to.be.empty
+
+    def test_it_should_returns_the_message_for_extensible_or_unknown_slots(self):
+        values = self.interpreter.parse_slot('get_forecast', 'city', 'Los Angeles')
+
+        expect(values).to.have.length_of(1)
+        expect(values[0].value).to.equal('Los Angeles')
+        expect(values[0].meta).to.be.empty
+
+        expect(self.interpreter.parse_slot('get_forecast', 'city', 'in paris')[0].value).to.equal(
+            'paris')
+        expect(self.interpreter.parse_slot('greet', 'name', 'Bob')[0].value).to.equal('Bob')
+
+    def test_it_should_load_from_the_cache_directory(self):
+        directory = tempfile.mkdtemp()
+
+        try:
+            interpreter = PatternInterpreter('en', directory, self.interpreter._trainings)
+            interpreter.fit_from_skill_data()
+
+            cached = PatternInterpreter('en', directory)
+            cached.load_from_cache()
+
+            expect(cached.intents).to.equal(interpreter.intents)
+            expect(cached.parse('hi there')[0].name).to.equal('greet')
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from sure import expect
+from pytlas.understanding import Interpreter, Intent, SlotValue
+from pytlas.understanding.pool import PoolInterpreter, WorkerError
+
+
+class EchoInterpreter(Interpreter):
+    """Interpreter used by workers which returns its process id in parsed intents.
+    """
+
+    def __init__(self, lang, cache_directory):
+        super().__init__('echo', lang, cache_directory)
+
+    def load_from_cache(self):
+        self.intents = ['echo', 'crash']
+
+    def fit(self, data):
+        self.intents = data['intents']
+
+    def parse(self, msg, scopes=None):
+        if msg == 'crash':
+            os._exit(1)
+
+        if msg == 'raise':
+            raise Exception('Could not parse')
+
+        if msg == 'slow':
+            time.sleep(0.5)
+
+        return [Intent('echo', text=msg, pid=str(os.getpid()), scopes=scopes or [])]
+
+    def parse_slot(self, intent, slot, msg):
+        return [SlotValue(msg, intent=intent, slot=slot)]
+
+
+def create_echo_interpreter(lang, cache_directory):
+    return EchoInterpreter(lang, cache_directory)
+
+
+def create_failing_interpreter(lang, cache_directory):
+    raise Exception('Could not create the interpreter')
+
+
+class TestPoolInterpreter:
+
+    def setup(self):
+        self.interpreter = PoolInterpreter('en', workers=2, factory=create_echo_interpreter)
+        self.interpreter.load_from_cache()
+
+    def teardown(self):
+        self.interpreter.close()
+
+    def test_it_should_expose_workers_intents(self):
+        expect(self.interpreter.intents).to.equal(['echo', 'crash'])
+        expect(self.interpreter.version).to.equal(1)
+
+    def test_it_should_fit_workers_with_the_given_data(self):
+        self.interpreter.fit({'intents': ['one', 'two']})
+
+        expect(self.interpreter.intents).to.equal(['one', 'two'])
+        expect(self.interpreter.version).to.equal(2)
+
+    def test_it_should_forward_parse_calls_to_workers(self):
+        intents = self.interpreter.parse('hello', ['echo'])
+
+        expect(intents).to.have.length_of(1)
+        expect(intents[0].name).to.equal('echo')
+        expect(intents[0].slot('text').first().value).to.equal('hello')
+        expect(intents[0].slot('scopes').first().value).to.equal('echo')
+        expect(intents[0].slot('pid').first().value).to_not.equal(str(os.getpid()))
+
+    def test_it_should_forward_parse_slot_calls_to_workers(self):
+        values = self.interpreter.parse_slot('echo', 'text', 'hello')
+
+        expect(values).to.have.length_of(1)
+        expect(values[0].value).to.equal('hello')
+        expect(values[0].meta).to.equal({'intent': 'echo', 'slot': 'text'})
+
+    def test_it_should_balance_concurrent_requests_between_workers(self):
+        barrier = threading.Barrier(2)
+        pids = set()
+
+        def parse():
+            barrier.wait()
+
+            for _ in range(20):
+                pids.add(self.interpreter.parse('hello')[0].slot('pid').first().value)
+
+        threads = [threading.Thread(target=parse) for _ in range(2)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        expect(pids).to.have.length_of(2)
+
+    def test_it_should_restart_a_crashed_worker(self):
+        expect(self.interpreter.parse('crash')).to.be.empty
+
+        for _ in range(4):
+            expect(self.interpreter.parse('hello')).to.have.length_of(1)
+
+        expect(self.interpreter._workers).to.have.length_of(2)
+        expect(all(w.process.is_alive() for w in self.interpreter._workers)).to.be.true
+
+    def test_it_should_keep_answering_requests_when_fitted_again(self):
+        interpreter = PoolInterpreter('en', workers=1, factory=create_echo_interpreter)
+        interpreter.load_from_cache()
+        previous = interpreter._workers[0]
+        results = {}
+
+        def parse(msg):
+            results[msg] = interpreter.parse(msg)
+
+        threads = [threading.Thread(target=parse, args=(msg,)) for msg in ('slow', 'hello')]
+
+        try:
+            for thread in threads:
+                thread.start()
+                time.sleep(0.1)
+
+            # The previous worker is busy parsing and the other request is waiting for it
+            interpreter.fit({'intents': ['one', 'two']})
+
+            for thread in threads:
+                thread.join()
+
+            current = interpreter._workers[0]
+
+            expect(current).to_not.be(previous)
+            expect(results['slow'][0].slot('pid').first().value).to.equal(
+                str(previous.process.pid))
+            expect(results['hello'][0].slot('pid').first().value).to.equal(
+                str(current.process.pid))
+            expect(previous.process.is_alive()).to.be.false
+            expect(interpreter._idle.qsize()).to.equal(1)
+            expect(interpreter.parse('hello')).to.have.length_of(1)
+        finally:
+            interpreter.close()
+
+        expect(current.process.is_alive()).to.be.false
+        expect(interpreter.parse('hello')).to.be.empty
+
+    def test_it_should_parse_batches_with_every_workers(self):
+        results = list(self.interpreter.parse_batch(['hello %d' % i for i in range(50)]))
+
+        expect([m for (m, _) in results]).to.equal(['hello %d' % i for i in range(50)])
+        expect([i[0].slot('text').first().value for (_, i) in results]).to.equal(
+            ['hello %d' % i for i in range(50)])
+
+    def test_it_should_returns_nothing_when_a_worker_raises(self):
+        expect(self.interpreter.parse('raise')).to.be.empty
+        expect(self.interpreter.parse('hello')).to.have.length_of(1)
+
+    def test_it_should_returns_nothing_when_not_started(self):
+        interpreter = PoolInterpreter('en', factory=create_echo_interpreter)
+
+        expect(interpreter.parse('hello')).to.be.empty
+        expect(interpreter.parse_slot('echo', 'text', 'hello')).to.be.empty
+
+    def test_it_should_raise_if_workers_could_not_start(self):
+        interpreter = PoolInterpreter('en', workers=1, factory=create_failing_interpreter)
+
+        expect(interpreter.load_from_cache).to.throw(WorkerError)
@@ -0,0 +1,158 @@
+from unittest.mock import MagicMock
+from sure import expect
+from pytlas.understanding import Interpreter, TrainingsStore
+from pytlas.understanding.pattern import PatternInterpreter
+from pytlas.understanding.router import RouterInterpreter
+from pytlas.understanding.slot import SlotValue
+
+EN_TRAINING = """
+%[greet]
+  hello there
+  good morning
+
+%[lights_on]
+  turn the lights on in the @[room]
+
+@[room]
+  kitchen
+"""
+
+FR_TRAINING = """
+%[greet]
+  bonjour
+  salut toi
+
+%[lights_on]
+  allume les lumières de la @[room]
+
+@[room]
+  cuisine
+"""
+
+
+class TestRouterInterpreter:
+
+    def setup(self):
+        self.store = TrainingsStore({
+            'router_module': {'en': lambda: EN_TRAINING, 'fr': lambda: FR_TRAINING},
+        })
+        self.factory = MagicMock(side_effect=lambda lang, cache_directory: PatternInterpreter(
+            lang, cache_directory, self.store))
+        self.router = RouterInterpreter(['en', 'fr'], trainings_store=self.store,
+                                        factory=self.factory, sizeof=lambda i: 10)
+
+    def test_it_should_load_languages_on_first_use(self):
+        expect(self.router.lang).to.equal('en')
+        expect(self.router.loaded_languages).to.be.empty
+
+        interpreter = self.router.route('bonjour', 'fr')
+
+        expect(interpreter.lang).to.equal('fr')
+        expect(self.router.route('salut', 'fr')).to.be(interpreter)
+        expect(self.router.loaded_languages).to.equal(['fr'])
+        expect(self.router.loads).to.equal(1)
+        self.factory.assert_called_once_with('fr', None)
+
+    def test_it_should_give_each_language_its_own_cache_directory(self):
+        router = RouterInterpreter(['en'], 'cache', factory=self.factory,
+                                   loader=MagicMock(), sizeof=lambda i: 0)
+        router.load_from_cache()
+
+        self.factory.assert_called_once_with('en', 'cache/en')
+
+    def test_it_should_use_the_given_language_when_supported(self):
+        expect(self.router.route('hello there', 'fr_FR').lang).to.equal('fr')
+        expect(self.router.route('hello there', 'es').lang).to.equal('en')
+
+    def test_it_should_detect_the_language_of_messages(self):
+        expect(self.router.route('allume la cuisine').lang).to.equal('fr')
+        expect(self.router.route('turn on the kitchen').lang).to.equal('en')
+        expect(self.router.route('something unknown').lang).to.equal('en')
+
+    def test_it_should_parse_messages_with_the_routed_interpreter(self):
+        intents = self.router.parse('allume les lumières de la cuisine')
+
+        expect(intents[0].name).to.equal('lights_on')
+        expect(intents[0].slot('room').first().value).to.equal('cuisine')
+        expect(self.router.parse_slot('lights_on', 'room', 'la cuisine')[0].value).to.equal(
+            'cuisine')
+
+    def test_it_should_evict_least_recently_used_languages_over_the_memory_budget(self):
+        router = RouterInterpreter(['en', 'fr', 'de'], factory=self.factory,
+                                   loader=MagicMock(), memory_budget=25, sizeof=lambda i: 10)
+
+        router.get('en')
+        router.get('fr')
+        router.get('en')
+        router.get('de')
+
+        expect(router.loaded_languages).to.equal(['en', 'de'])
+        expect(router.size).to.equal(20)
+        expect(router.evictions).to.equal(1)
+
+        router.get('fr')
+
+        expect(router.loaded_languages).to.equal(['de', 'fr'])
+        expect(router.loads).to.equal(4)
+
+    def test_it_should_merge_intents_of_loaded_languages(self):
+        def factory(lang, cache_directory):
+            interpreter = Interpreter('test', lang)
+            interpreter.intents = {'en': ['greet'], 'fr': ['greet', 'lights_on']}[lang]
+            return interpreter
+
+        router = RouterInterpreter(['en', 'fr'], factory=factory, loader=MagicMock(),
+                                   memory_budget=0, sizeof=lambda i: 10)
+
+        router.get('en')
+
+        expect(router.intents).to.equal(['greet'])
+        expect(router.version).to.equal(1)
+
+        router.get('fr')
+
+        expect(router.intents).to.equal(['greet', 'lights_on'])
+        expect(router.version).to.equal(2)
+
+        router.get('en')
+
+        expect(router.intents).to.equal(['greet', 'lights_on'])
+        expect(router.version).to.equal(2)
+
+    def test_it_should_raise_for_unsupported_languages(self):
+        expect(lambda: self.router.get('es')).to.throw(ValueError)
+
+    def test_it_should_parse_slots_in_the_language_of_the_requesting_intent(self):
+        self.router.parse('hello there')
+        self.router.parse('allume les lumières de la cuisine')
+
+        for lang in ('en', 'fr'):
+            self.router.get(lang).parse_slot = MagicMock(return_value=[SlotValue(lang)])
+
+        # "kitchen" alone would be detected as english
+        expect(self.router.parse_slot('lights_on', 'room', 'kitchen')[0].value).to.equal('fr')
+        expect(self.router.parse_slot('greet', 'name', 'cuisine')[0].value).to.equal('en')
+        self.router.get('fr').parse_slot.assert_called_once_with('lights_on', 'room', 'kitchen')
+
+        router = RouterInterpreter(['en', 'fr'], trainings_store=self.store,
+                                   factory=self.factory, sizeof=lambda i: 10)
+        router.get('fr')
+
+        # Not parsed yet, the loaded language knowing the intent is used
+        expect(router.parse_slot('lights_on', 'room', 'kitchen')[0].value).to.equal(
+            'kitchen')
+        expect(router.loaded_languages).to.equal(['fr'])
+
+    def test_it_should_bump_its_version_when_a_language_is_fitted_again(self):
+        interpreter = self.router.get('en')
+        version = self.router.version
+
+        interpreter.fit_from_skill_data()
+        self.router.get('en')
+
+        expect(self.router.version).to.equal(version + 1)
+
+        self.router.fit_from_skill_data()
+
+        expect(self.router.version).to.equal(version + 2)
+        expect(self.router.intents).to.equal(['greet', 'lights_on'])
@@ -0,0 +1,161 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from sure import expect
+from pytlas.understanding import TrainingsStore
+from pytlas.understanding.pattern import PatternInterpreter
+from pytlas.understanding.sharded import ShardedInterpreter, build_router_data
+
+LIGHTS_TRAINING = """
+%[lights_on]
+  turn the lights on
+  turn the lights on in the @[room]
+
+%[lights_off]
+  turn the lights off
+  turn the lights off in the @[room]
+
+@[room](extensible=false)
+  kitchen
+  bedroom
+"""
+
+WEATHER_TRAINING = """
+%[get_forecast]
+  what's the weather like
+  will it rain in @[city]
+
+@[city]
+  paris
+"""
+
+HEATING_TRAINING = """
+%[heating_on]
+  warm up the @[room]
+  ~[warm] the @[room]
+
+~[warm]
+  heat
+
+@[room]
+  ~[living room]
+
+~[living room]
+  living
+  lounge
+"""
+
+
+class TestShardedInterpreter:
+
+    def setup(self):
+        self.store = TrainingsStore({
+            'lights': {'en': lambda: LIGHTS_TRAINING},
+            'weather': {'en': lambda: WEATHER_TRAINING},
+            'empty': {'en': lambda: None},
+        })
+        self.interpreter = ShardedInterpreter('en', trainings_store=self.store,
+                                              factory=PatternInterpreter)
+        self.interpreter.fit_from_skill_data()
+
+    def test_it_should_fit_an_interpreter_for_each_skill(self):
+        expect(self.interpreter.shards).to.have.key('lights')
+        expect(self.interpreter.shards).to.have.key('weather')
+        expect(self.interpreter.shards).to_not.have.key('empty')
+        expect(self.interpreter.shards['weather'].intents).to.equal(['get_forecast'])
+        expect(self.interpreter.intents).to.equal(['get_forecast', 'lights_off', 'lights_on'])
+        expect(self.interpreter.version).to.equal(1)
+
+    def test_it_should_build_the_router_dataset(self):
+        data = build_router_data(self.interpreter.get_training_data(), 1)
+
+        expect(data['intents']).to.have.length_of(2)
+        expect(data['intents']['weather']['data']).to.equal([
+            [{'type': 'text', 'value': "what's the weather like"}],
+            [{'type': 'text', 'value': 'will it rain in paris'}],
+        ])
+
+    def test_it_should_parse_messages_with_the_routed_skill(self):
+        intents = self.interpreter.parse('turn the lights off in the kitchen')
+
+        expect(intents[0].name).to.equal('lights_off')
+        expect(intents[0].slot('room').first().value).to.equal('kitchen')
+        expect(self.interpreter.parse("What's the weather like?")[0].name).to.equal(
+            'get_forecast')
+        expect(self.interpreter.parse('hello')).to.be.empty
+
+    def test_it_should_only_parse_with_skills_owning_scoped_intents(self):
+        intents = self.interpreter.parse('will it rain in london', ['get_forecast'])
+
+        expect(intents[0].name).to.equal('get_forecast')
+        expect(intents[0].slot('city').first().value).to.equal('london')
+        expect(self.interpreter.parse('turn the lights on', ['lights_off'])).to.be.empty
+        expect(self.interpreter.parse('turn the lights on', ['unknown'])).to.be.empty
+
+    def test_it_should_parse_slots_with_the_skill_owning_the_intent(self):
+        values = self.interpreter.parse_slot('lights_on', 'room', 'the bedroom')
+
+        expect([v.value for v in values]).to.equal(['bedroom'])
+        expect(self.interpreter.parse_slot('unknown', 'room', 'garage')[0].value).to.equal(
+            'garage')
+
+    def test_it_should_fit_skills_in_several_processes_in_their_own_directory(self):
+        directory = tempfile.mkdtemp()
+
+        try:
+            interpreter = ShardedInterpreter('en', directory, self.store,
+                                             factory=PatternInterpreter, workers=2)
+            interpreter.fit_from_skill_data()
+
+            expect(sorted(os.listdir(os.path.join(directory, 'shards')))).to.equal(
+                ['lights', 'weather'])
+            expect(os.path.isdir(os.path.join(directory, 'router'))).to.be.true
+            expect(interpreter.parse('turn the lights on')[0].name).to.equal('lights_on')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_it_should_share_entities_definitions_between_skills(self):
+        store = TrainingsStore({
+            'lights': {'en': lambda: LIGHTS_TRAINING},
+            'heating': {'en': lambda: HEATING_TRAINING},
+        })
+        interpreter = ShardedInterpreter('en', trainings_store=store,
+                                         factory=PatternInterpreter)
+        data = interpreter.get_training_data()
+
+        expect(data['heating']['entities']).to.have.key('room')
+        expect(data['heating']['entities']['room']['data']).to.have.length_of(3)
+        expect(data['lights']['entities']['room']).to.equal(
+            data['heating']['entities']['room'])
+        expect(data['lights']['synonyms']).to.have.key('living room')
+        expect(data['lights']['synonyms']).to_not.have.key('warm')
+        expect(data['heating']['synonyms']).to.have.key('warm')
+        expect(interpreter.get_training_data(['heating'])).to.equal(
+            {'heating': data['heating']})
+
+        interpreter.fit(data)
+
+        expect(interpreter.parse_slot('heating_on', 'room', 'the kitchen')[0].value).to.equal(
+            'kitchen')
+        expect(interpreter.parse_slot('lights_on', 'room', 'the lounge')[0].value).to.equal(
+            'living room')
+
+    def test_it_should_warn_when_several_skills_define_the_same_intent(self):
+        store = TrainingsStore({
+            'lights': {'en': lambda: LIGHTS_TRAINING},
+            'other_lights': {'en': lambda: '%[lights_on]\n  switch the lights on\n'},
+        })
+        interpreter = ShardedInterpreter('en', trainings_store=store,
+                                         factory=PatternInterpreter)
+
+        with patch.object(interpreter._logger, 'warning') as warning_mock:
+            interpreter.fit_from_skill_data()
+
+            warning_mock.assert_called_once_with(
+                'Intent "%s" is defined by "%s" and "%s", only the first one will parse it',
+                'lights_on', 'lights', 'other_lights')
+
+        expect(interpreter._model.owners['lights_on']).to.equal('lights')
+        expect(interpreter.parse('turn the lights on', ['lights_on'])[0].name).to.equal(
+            'lights_on')
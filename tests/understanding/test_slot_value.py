@@ -1,5 +1,9 @@
+import json
+from datetime import datetime
+from dateutil.relativedelta import relativedelta, FR
 from sure import expect
 from pytlas.understanding import SlotValue, UnitValue
+from pytlas.understanding.slot import encode_value, decode_value
 
 
 class TestSlotValue:
@@ -18,6 +22,18 @@ class TestSlotValue:
         expect(v.meta['type']).to.equal('room')
         expect(v.meta['another']).to.equal('meta')
 
+    def test_it_should_be_converted_to_and_from_a_dict(self):
+        v = SlotValue(UnitValue(20, '$'), type='amount')
+
+        data = v.to_dict()
+
+        expect(data).to.equal({'value': {'$unit': [20, '$']}, 'meta': {'type': 'amount'}})
+
+        restored = SlotValue.from_dict(data)
+
+        expect(restored.value).to.equal(UnitValue(20, '$'))
+        expect(restored.meta).to.equal({'type': 'amount'})
+
 
 class TestUnitValue:
 
@@ -125,3 +141,49 @@ class TestUnitValue:
         expect(v <= other).to.be.false
         expect(v > other).to.be.false
         expect(v >= other).to.be.false
+
+
+class UnsupportedValue:
+
+    def __repr__(self):
+        return '<unsupported>'
+
+
+class TestEncodeValue:
+
+    def test_it_should_round_trip_interpreter_values(self):
+        values = [
+            None,
+            'kitchen',
+            42,
+            4.2,
+            True,
+            datetime(2019, 4, 2, 18, 30),
+            (datetime(2019, 4, 2, 18, 30), datetime(2019, 4, 2, 20)),
+            relativedelta(days=1, hours=-2, weekday=FR(+2)),
+            UnitValue(20.4, '$'),
+            ['a', {'nested': datetime(2019, 4, 2)}],
+        ]
+
+        for value in values:
+            restored = decode_value(json.loads(json.dumps(encode_value(value))))
+
+            expect(restored).to.equal(value)
+
+    def test_it_should_keep_absolute_relativedelta_fields_set_to_zero(self):
+        values = [
+            relativedelta(hour=0, minute=0),
+            relativedelta(days=1, hour=0, minute=0, second=0, microsecond=0),
+            relativedelta(month=1, day=1, weekday=FR(0)),
+        ]
+
+        for value in values:
+            restored = decode_value(json.loads(json.dumps(encode_value(value))))
+
+            expect(restored).to.equal(value)
+
+    def test_it_should_encode_unsupported_values_as_their_representation(self):
+        value = {'source': UnsupportedValue()}
+
+        expect(decode_value(json.loads(json.dumps(encode_value(value))))).to.equal(
+            {'source': '<unsupported>'})
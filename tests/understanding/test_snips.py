@@ -1,14 +1,27 @@
 import datetime
+import json
+import multiprocessing
 import os
+import shutil
 import sys
-from unittest.mock import patch
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from zipfile import ZipFile
 from sure import expect
 from dateutil.parser import parse as dateParse
 from dateutil.relativedelta import relativedelta
 from pytlas.understanding import Intent, SlotValues, UnitValue
+from pytlas.understanding.interpreter import compute_checksum
+from pytlas.understanding.fastpath import ExactMatchIndex
+from pytlas.understanding.pool import PoolInterpreter
+from pytlas.understanding.scopes import build_scopes
 
 try:
-    from pytlas.understanding.snips import SnipsInterpreter, get_entity_value
+    from pytlas.understanding.snips import SnipsInterpreter, get_entity_value, \
+        get_context_scopes, get_context_dataset, compute_intent_checksums, _engine_tree, \
+        get_context_key
 
     # Train the interpreter once to speed up tests
     fitted_interpreter = SnipsInterpreter('en')
@@ -23,6 +36,20 @@ try:
     # there is no particular cases
     interpreters = [fitted_interpreter, cached_interpreter]
 
+    def fit_in_process(directory, data, barrier, trainings):
+        train_and_store = SnipsInterpreter._train_and_store
+
+        def count(self, *args):
+            with trainings.get_lock():
+                trainings.value += 1
+
+            train_and_store(self, *args)
+
+        with patch.object(SnipsInterpreter, '_train_and_store', count):
+            interpreter = SnipsInterpreter('en', directory)
+            barrier.wait()
+            interpreter.fit(data)
+
     class TestSnipsInterpreter:
 
         def test_it_should_not_try_to_install_language_resources_if_already_installed(self):
@@ -53,6 +80,329 @@ try:
             expect(i.parse('a message')).to.be.empty
             expect(i.parse_slot('get_forecast', 'date', 'tomorrow')).to.be.empty
 
+        def test_it_should_load_a_cached_engine_trained_with_the_same_data(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            with tempfile.TemporaryDirectory() as directory:
+                i = SnipsInterpreter('en', directory)
+                checksum = compute_checksum(data)
+                path = i.cache.path(checksum)
+
+                shutil.copytree(cached_interpreter.cache_directory, path)
+
+                with open(os.path.join(path, 'trained.checksum'), 'w') as file:
+                    file.write(checksum)
+
+                with patch('pytlas.understanding.snips.SnipsNLUEngine.fit') as fit_mock:
+                    i.fit(data)
+
+                    fit_mock.assert_not_called()
+                    expect(i.is_ready).to.be.true
+                    expect(i.intents).to.have.length_of(3)
+
+        def test_it_should_load_the_most_recently_used_engine_of_the_cache(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            with tempfile.TemporaryDirectory() as directory:
+                SnipsInterpreter('en', directory).fit(data)
+
+                i = SnipsInterpreter('en', directory)
+                i.load_from_cache()
+
+                expect(i.is_ready).to.be.true
+                expect(i.intents).to.have.length_of(3)
+                expect(i.parse('will it rain in paris')[0].name).to.equal('get_forecast')
+
+        def test_it_should_load_a_cached_engine_in_pool_workers(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            with tempfile.TemporaryDirectory() as directory:
+                SnipsInterpreter('en', directory).fit(data)
+
+                pool = PoolInterpreter('en', directory, workers=2)
+
+                try:
+                    pool.load_from_cache()
+
+                    expect(pool.intents).to.have.length_of(3)
+                    expect(pool.parse('will it rain in paris')[0].name).to.equal(
+                        'get_forecast')
+                finally:
+                    pool.close()
+
+        def test_it_should_load_the_engine_trained_by_another_process_while_waiting(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            with tempfile.TemporaryDirectory() as directory:
+                i = SnipsInterpreter('en', directory)
+                checksum = compute_checksum(data)
+
+                @contextmanager
+                def lock(locked_checksum):
+                    # Another process stores the engine while this one is waiting
+                    expect(locked_checksum).to.equal(checksum)
+                    i.cache.store(checksum, lambda path: shutil.copytree(
+                        cached_interpreter.cache_directory, path))
+                    yield
+
+                with patch.object(i.cache, 'lock', side_effect=lock):
+                    with patch('pytlas.understanding.snips.SnipsNLUEngine.fit') as fit_mock:
+                        i.fit(data)
+
+                        fit_mock.assert_not_called()
+                        expect(i.is_ready).to.be.true
+
+        def test_it_should_train_only_once_when_processes_share_the_cache(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            (barrier, trainings) = (multiprocessing.Barrier(2), multiprocessing.Value('i', 0))
+
+            with tempfile.TemporaryDirectory() as directory:
+                processes = [multiprocessing.Process(target=fit_in_process, args=(
+                    directory, data, barrier, trainings)) for _ in range(2)]
+
+                for process in processes:
+                    process.start()
+
+                for process in processes:
+                    process.join()
+
+                expect([p.exitcode for p in processes]).to.equal([0, 0])
+                expect(trainings.value).to.equal(1)
+                expect(SnipsInterpreter('en', directory).cache.entries()).to.have.length_of(1)
+
+        def test_it_should_always_fit_the_same_engine_given_the_same_data(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            first = SnipsInterpreter('en')
+            first.fit(data)
+            second = SnipsInterpreter('en')
+            second.fit(data)
+
+            for msg in ['will it rain in paris', 'turn on the lights', 'hello there']:
+                expect(second._engine.parse(msg)).to.equal(first._engine.parse(msg))
+
+        def test_it_should_persist_compact_engines_as_a_single_archive(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            with tempfile.TemporaryDirectory() as directory:
+                SnipsInterpreter('en', directory, compact=True).fit(data)
+
+                i = SnipsInterpreter('en', directory)
+                path = i.cache.path(compute_checksum(data))
+
+                expect(sorted(os.listdir(path))).to.equal(
+                    ['engine.zip', 'manifest.json', 'trained.checksum'])
+
+                with patch('pytlas.understanding.snips.SnipsNLUEngine.fit') as fit_mock:
+                    i.fit(data)
+
+                    fit_mock.assert_not_called()
+                    expect(i.parse('will it rain in paris')[0].name).to.equal('get_forecast')
+
+        def test_it_should_refuse_engine_archives_without_a_single_root(self):
+            with tempfile.TemporaryDirectory() as directory:
+                with ZipFile(os.path.join(directory, 'engine.zip'), 'w') as archive:
+                    archive.writestr('nlu_engine/nlu_engine.json', '{}')
+                    archive.writestr('other/nlu_engine.json', '{}')
+
+                def extract():
+                    with _engine_tree(directory):
+                        pass
+
+                expect(extract).to.throw(ValueError)
+
+        def test_it_should_reuse_slot_fillers_of_unchanged_intents(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            directory = tempfile.mkdtemp()
+
+            try:
+                SnipsInterpreter('en', directory).fit(data)
+
+                data['intents']['get_forecast']['utterances'].append(
+                    {'data': [{'text': 'is it going to rain'}]})
+                checksums = compute_intent_checksums(data)
+
+                i = SnipsInterpreter('en', directory)
+                (path, reusable) = i._find_warm_start(checksums)
+
+                expect(path).to.equal(i.cache.entries()[0].path)
+                expect(reusable).to.equal(set(checksums.keys()) - {'get_forecast'})
+                expect(SnipsInterpreter('en', directory, warm_start=False)._find_warm_start(
+                    checksums)).to.equal((None, set()))
+
+                i.fit(data)
+
+                expect(i.parse('will it rain in paris tomorrow')[0].name).to.equal(
+                    'get_forecast')
+                expect(i.cache.entries()).to.have.length_of(2)
+            finally:
+                shutil.rmtree(directory)
+
+        def test_it_should_swap_the_engine_once_fitted_in_the_background(self):
+            i = SnipsInterpreter('en')
+            engine = MagicMock(fitted=True, dataset_metadata={
+                'slot_name_mappings': {'lights_on': {'room': 'room'}},
+            })
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                with patch('pytlas.understanding.snips._fit_engine',
+                           return_value=b'engine') as fit_mock:
+                    with patch('pytlas.understanding.snips.SnipsNLUEngine.from_byte_array',
+                               return_value=engine):
+                        future = i.fit_in_background({'language': 'en'}, executor)
+
+                        expect(future.result(timeout=5)).to.be(i)
+
+            fit_mock.assert_called_once_with('en', {'language': 'en'}, None, None, None, False,
+                                             False, True, 42, False)
+            expect(i.is_ready).to.be.true
+            expect(i.intents).to.equal(['lights_on'])
+            expect(i.version).to.equal(1)
+
+        def test_it_should_keep_the_current_engine_if_the_background_fit_fails(self):
+            i = SnipsInterpreter('en')
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                with patch('pytlas.understanding.snips._fit_engine',
+                           side_effect=Exception('Fit failed')):
+                    future = i.fit_in_background({'language': 'en'}, executor)
+
+                    expect(str(future.exception(timeout=5))).to.equal('Fit failed')
+
+            expect(i.is_ready).to.be.false
+            expect(i.version).to.equal(0)
+
+        def test_it_should_answer_training_utterances_from_the_fast_path(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            i = SnipsInterpreter('en', fast_path=True)
+            i._use_engine(fitted_interpreter._engine, ExactMatchIndex.from_dataset(data))
+
+            intents = i.parse('Enlight me in cellar!')
+
+            expect(intents[0].name).to.equal('lights_on')
+            expect(intents[0].slot('room').first().value).to.equal('basement')
+            expect(i.parse('will it rain in paris tomorrow')[0].name).to.equal('get_forecast')
+            expect(i.fast_path_hits).to.equal(1)
+            expect(i.fast_path_misses).to.equal(1)
+            expect(i.fast_path_hit_rate).to.equal(0.5)
+            expect(fitted_interpreter.fast_path).to.be.none
+
+        def test_it_should_parse_scoped_messages_with_the_engine_of_the_context(self):
+            engine = MagicMock(fitted=True, dataset_metadata={
+                'slot_name_mappings': {'lights_on': {}, 'lights_on/room': {'room': 'room'}},
+            })
+            engine.parse.return_value = {'intent': {'intentName': None}, 'slots': []}
+            context_engine = MagicMock()
+            context_engine.parse.return_value = {
+                'intent': {'intentName': 'lights_on/room'}, 'slots': []}
+
+            i = SnipsInterpreter('en', context_engines=True)
+            i._use_engine(engine, context_engines={
+                get_context_key(['__cancel__', 'lights_on/room']): context_engine,
+            })
+
+            intents = i.parse('in the kitchen', ['lights_on/room', '__cancel__'])
+
+            expect(intents[0].name).to.equal('lights_on/room')
+            context_engine.parse.assert_called_once_with('in the kitchen')
+            engine.parse.assert_not_called()
+
+            expect(i.parse('hello', ['__cancel__', 'lights_on'])).to.be.empty
+            engine.parse.assert_called_once_with('hello', intents=['__cancel__', 'lights_on'])
+
+            # Builtin intents of the context engine which were not asked for are ignored
+            context_engine.parse.return_value = {
+                'intent': {'intentName': '__cancel__'}, 'slots': []}
+
+            expect(i.parse('stop', ['lights_on/room'])).to.be.empty
+            engine.parse.assert_called_with('stop', intents=['lights_on/room'])
+
+        def test_it_should_fit_an_engine_for_each_context(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            data['intents']['lights_on/room'] = {'utterances': [
+                {'data': [{'text': 'in the '}, {'text': 'kitchen', 'entity': 'room',
+                                                 'slot_name': 'room'}]},
+                {'data': [{'text': 'the '}, {'text': 'bedroom', 'entity': 'room',
+                                              'slot_name': 'room'}, {'text': ' please'}]},
+            ]}
+
+            i = SnipsInterpreter('en', context_engines=True)
+            i.fit(data)
+
+            expect(i._context_engines).to.have.key(frozenset(['lights_on/room']))
+
+            intents = i.parse('in the kitchen', ['lights_on/room'])
+
+            expect(intents[0].name).to.equal('lights_on/room')
+            expect(intents[0].slot('room').first().value).to.equal('kitchen')
+
+            # The dataset has no __cancel__ intent but agents always add it to their scopes
+            scopes = build_scopes(i.intents)['lights_on']
+
+            expect(scopes).to.contain('__cancel__')
+
+            with patch.object(i._engine, 'parse', side_effect=AssertionError) as parse_mock:
+                intents = i.parse('the bedroom please', scopes)
+
+                parse_mock.assert_not_called()
+                expect(intents[0].name).to.equal('lights_on/room')
+
+        def test_it_should_parse_batches_in_several_processes(self):
+            messages = ['turn the lights on in the kitchen', 'lights off', 'blah blah blah']
+            expected = [[i.name for i in fitted_interpreter.parse(m)] for m in messages]
+
+            results = list(fitted_interpreter.parse_batch(messages * 2, workers=2))
+
+            expect([m for (m, _) in results]).to.equal(messages * 2)
+            expect([[i.name for i in r] for (_, r) in results]).to.equal(expected * 2)
+
+        def test_it_should_parse_scoped_batches_in_a_pool_of_two_processes(self):
+            messages = ['turn the lights on in the kitchen', 'will it rain in paris']
+            scopes = ['lights_on', 'get_forecast']
+            expected = [[i.to_dict() for i in fitted_interpreter.parse(m, scopes)]
+                        for m in messages]
+
+            results = list(fitted_interpreter.parse_batch(iter(messages), scopes, workers=2))
+
+            expect([[i.to_dict() for i in r] for (_, r) in results]).to.equal(expected)
+
+        def test_it_should_parse_batches_with_the_fast_path_and_context_engines(self):
+            with open(os.path.join(os.path.dirname(__file__), '../__training.json')) as file:
+                data = json.load(file)
+
+            data['intents']['lights_on/room'] = {'utterances': [
+                {'data': [{'text': 'in the '}, {'text': 'kitchen', 'entity': 'room',
+                                                 'slot_name': 'room'}]},
+                {'data': [{'text': 'the '}, {'text': 'bedroom', 'entity': 'room',
+                                              'slot_name': 'room'}, {'text': ' please'}]},
+            ]}
+
+            i = SnipsInterpreter('en', fast_path=True, context_engines=True)
+            i.fit(data)
+
+            for (messages, scopes) in ((['Enlight me in cellar!'], None),
+                                       (['in the kitchen', 'the bedroom please'],
+                                        ['lights_on/room'])):
+                expected = [[r.to_dict() for r in i.parse(m, scopes)] for m in messages]
+                results = list(i.parse_batch(messages, scopes, workers=2))
+
+                expect([[r.to_dict() for r in intents]
+                        for (_, intents) in results]).to.equal(expected)
+
         def it_should_contains_intents_defined_in_the_dataset(self, interpreter):
             expect(interpreter.is_ready).to.be.true
             expect(interpreter.intents).to.have.length_of(3)
@@ -215,6 +565,50 @@ try:
             for interpreter in interpreters:
                 yield self.it_should_parse_unknown_slot_correctly, interpreter
 
+    class TestSnipsContextDataset:
+
+        def test_it_should_retrieve_scopes_of_each_context(self):
+            expect(get_context_scopes({'intents': {
+                '__cancel__': {}, 'lights_on': {}, 'lights_on/room': {},
+            }})).to.equal({'lights_on': ['__cancel__', 'lights_on/room']})
+
+        def test_it_should_compute_checksums_of_each_intent_with_its_entities(self):
+            room = {'text': 'kitchen', 'entity': 'room', 'slot_name': 'room'}
+            data = {
+                'language': 'en',
+                'intents': {
+                    'greet': {'utterances': [{'data': [{'text': 'hello'}]}]},
+                    'lights_on': {'utterances': [{'data': [{'text': 'lights in '}, room]}]},
+                },
+                'entities': {'room': {'data': [{'value': 'kitchen', 'synonyms': []}]}},
+            }
+            checksums = compute_intent_checksums(data)
+
+            data['entities']['room']['data'].append({'value': 'bedroom', 'synonyms': []})
+            changed = compute_intent_checksums(data)
+
+            expect(changed['greet']).to.equal(checksums['greet'])
+            expect(changed['lights_on']).to_not.equal(checksums['lights_on'])
+
+        def test_it_should_restrict_the_dataset_to_the_given_intents(self):
+            room = {'text': 'kitchen', 'entity': 'room', 'slot_name': 'room'}
+            data = {
+                'language': 'en',
+                'intents': {
+                    'lights_on': {'utterances': [{'data': [{'text': 'lights on'}]}]},
+                    'lights_on/room': {'utterances': [{'data': [{'text': 'in '}, room]}]},
+                },
+                'entities': {'room': {'data': []}, 'city': {'data': []}},
+            }
+
+            expect(get_context_dataset(data, ['lights_on/room'])).to.equal({
+                'language': 'en',
+                'intents': {
+                    'lights_on/room': {'utterances': [{'data': [{'text': 'in '}, room]}]},
+                },
+                'entities': {'room': {'data': []}},
+            })
+
     class TestSnipsGetEntityValue:
         """Tests returns of the NLU concerning slots. See https://github.com/snipsco/snips-nlu-ontology#results-examples
         """
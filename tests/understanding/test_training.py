@@ -1,5 +1,7 @@
 from sure import expect
-from pytlas.understanding.training import GLOBAL_TRAININGS, TrainingsStore, training
+from pychatl import parse
+from pytlas.understanding.training import GLOBAL_TRAININGS, TrainingsStore, training, \
+    generate_examples
 
 
 class TestTraining:
@@ -121,3 +123,48 @@ class TestTraining:
   what's the weather like
 """)
         expect(s.get('mymodule', 'it')).to.be.none
+
+
+class TestGenerateExamples:
+
+    def test_it_should_generate_utterances_from_a_chatl_dataset(self):
+        data = parse("""
+%[get_forecast]
+  ~[greet] will it rain in @[city]
+  forecast for @[city#from]
+
+~[greet]
+  hi
+  hello
+
+@[city]
+  ~[new york]
+  paris
+
+@[city#from]
+  rouen
+
+~[new york]
+  nyc
+
+@[date](type=snips/datetime)
+""")
+
+        expect(generate_examples(data, 2)).to.equal([
+            ('hi will it rain in new york', 'get_forecast'),
+            ('hello will it rain in paris', 'get_forecast'),
+            ('forecast for rouen', 'get_forecast'),
+            ('forecast for rouen', 'get_forecast'),
+        ])
+
+    def test_it_should_use_the_entity_name_when_no_value_is_available(self):
+        data = parse("""
+%[get_forecast]
+  will it rain @[date]
+
+@[date](type=snips/datetime)
+""")
+
+        expect(generate_examples(data)).to.equal([
+            ('will it rain date', 'get_forecast'),
+        ])